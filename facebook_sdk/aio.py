@@ -0,0 +1,801 @@
+""" asyncio counterparts of FacebookClient, OAuth2Client and Facebook.
+
+The HTTP transport is provided by aiohttp, install it with ``pip install facebook-py-sdk[aio]``.
+This module requires Python 3.6 or newer.
+"""
+import asyncio
+from collections import namedtuple
+
+import six
+from typing import (  # noqa: F401
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Text,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from facebook_sdk.authentication import (  # noqa: F401
+    AccessToken,
+    BaseOAuth2Client,
+)
+from facebook_sdk.cache import (
+    IF_NONE_MATCH_HEADER,
+    is_idempotent_read,
+    request_key,
+)
+from facebook_sdk.client import BaseFacebookClient
+from facebook_sdk.coalescing import bind_response
+from facebook_sdk.constants import (
+    DEFAULT_BATCH_MAX_WORKERS,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    METHOD_DELETE,
+    METHOD_GET,
+    METHOD_POST,
+)
+from facebook_sdk.exceptions import (  # noqa: F401
+    FacebookResumableUploadException,
+    FacebookSDKException,
+)
+from facebook_sdk.facebook import BaseFacebook
+from facebook_sdk.facebook_file import FacebookFile
+from facebook_sdk.query import (  # noqa: F401
+    FieldSet,
+    GraphQuery,
+    with_fields,
+)
+from facebook_sdk.request import (
+    MAX_REQUEST_BY_BATCH,
+    FacebookBatchRequest,
+)
+from facebook_sdk.response import FacebookBatchResponse
+from facebook_sdk.upload import (
+    DEFAULT_MAX_TRANSFER_TRIES,
+    BaseFacebookResumableUploader,
+)
+from facebook_sdk.utils import smart_text
+
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+if TYPE_CHECKING:
+    from facebook_sdk.cache import ResponseCache  # noqa: F401
+    from facebook_sdk.json_codec import JSONCodec  # noqa: F401
+    from facebook_sdk.request import FacebookRequest  # noqa: F401
+    from facebook_sdk.response import FacebookResponse  # noqa: F401
+    from facebook_sdk.retry import RetryPolicy  # noqa: F401
+    from facebook_sdk.throttling import RateLimiter  # noqa: F401
+    from facebook_sdk.upload import FacebookTransferChunk  # noqa: F401
+
+
+RawResponse = namedtuple('RawResponse', ['status_code', 'headers', 'content'])
+
+
+def _query_params(params):  # type: (Dict) -> List[Tuple[Text, Text]]
+    """ The params as aiohttp expects them, encoded like requests does: lists are repeated and None is left out."""
+    query = []  # type: List[Tuple[Text, Text]]
+    for key, values in params.items():
+        if isinstance(values, (six.string_types, six.binary_type)) or not hasattr(values, '__iter__'):
+            values = [values]
+        query.extend((key, smart_text(value)) for value in values if value is not None)
+
+    return query
+
+
+async def aiter_pages(response, client, max_pages=None, prefetch=False):
+    # type: (FacebookResponse, AsyncFacebookClient, Optional[int], bool) -> AsyncIterator[FacebookResponse]
+    """ Yield the response and then every following page, lazily.
+
+    :param response: the first page
+    :param client: the AsyncFacebookClient used to request the next pages
+    :param max_pages: the maximum number of pages to yield, including the first one
+    :param prefetch: request the next page while the current one is being processed
+    """
+    page = response
+    count = 0
+
+    while True:
+        count += 1
+        next_request = None
+        if page.json_body.get('data') and (max_pages is None or count < max_pages):
+            next_request = page.next_page_request()
+
+        future = None
+        if prefetch and next_request:
+            future = asyncio.ensure_future(client.send_request(next_request))
+
+        try:
+            yield page
+        except BaseException:
+            if future:
+                future.cancel()
+            raise
+
+        if next_request is None:
+            return
+
+        page = await (future or client.send_request(next_request))
+
+
+async def aiter_items(response, client, max_pages=None, max_items=None, prefetch=False):
+    # type: (FacebookResponse, AsyncFacebookClient, Optional[int], Optional[int], bool) -> AsyncIterator[Dict]
+    """ Yield the items of the `data` list of the response and of every following page, lazily.
+
+    :param response: the first page
+    :param client: the AsyncFacebookClient used to request the next pages
+    :param max_pages: the maximum number of pages to walk, including the first one
+    :param max_items: the maximum number of items to yield
+    :param prefetch: request the next page while the items of the current one are being processed
+    """
+    count = 0
+
+    async for page in aiter_pages(response, client=client, max_pages=max_pages, prefetch=prefetch):
+        for item in page.json_body.get('data', []):
+            count += 1
+            yield item
+
+            if max_items is not None and count >= max_items:
+                return
+
+
+class AsyncRequestCoalescer(object):
+    """ Collapse concurrent identical GET requests of an event loop into a single call."""
+
+    def __init__(self):  # type: () -> None
+        self._calls = {}  # type: Dict[Text, asyncio.Future]
+
+    def is_coalescable(self, request):  # type: (FacebookRequest) -> bool
+        return is_idempotent_read(request)
+
+    async def execute(self, request, send):
+        # type: (FacebookRequest, Callable[[FacebookRequest], Awaitable[FacebookResponse]]) -> FacebookResponse
+        key = request_key(request)
+
+        future = self._calls.get(key)
+        if future is not None:
+            return bind_response(await asyncio.shield(future), request)
+
+        future = self._calls[key] = asyncio.get_event_loop().create_future()
+        try:
+            response = await send(request)
+        except asyncio.CancelledError:
+            # The callers waiting for the leader would otherwise wait forever.
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve the exception so it is not reported as never retrieved when nobody else waited.
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            del self._calls[key]
+
+
+class AsyncFacebookClient(BaseFacebookClient):
+
+    def __init__(
+        self,
+        request_timeout=None,  # type: Optional[int]
+        pool_connections=None,  # type: Optional[int]
+        pool_maxsize=None,  # type: Optional[int]
+        keep_alive=True,  # type: bool
+        session=None,  # type: Optional[aiohttp.ClientSession]
+        rate_limiter=None,  # type: Optional[RateLimiter]
+        retry_policy=None,  # type: Optional[RetryPolicy]
+        cache=None,  # type: Optional[ResponseCache]
+        coalesce_requests=False,  # type: bool
+        json_codec=None,  # type: Optional[Union[Text, JSONCodec]]
+        keep_response_body=True,  # type: bool
+    ):
+        # type: (...) -> None
+        """
+        :param request_timeout: the default timeout in seconds for every request
+        :param pool_connections: the number of hosts to keep connections to
+        :param pool_maxsize: the maximum number of connections to keep per host
+        :param keep_alive: whether to keep the connections open between requests
+        :param session: an aiohttp.ClientSession to use instead of building one
+        :param rate_limiter: a RateLimiter pacing the requests from the Graph usage headers
+        :param retry_policy: a RetryPolicy applied to the requests and to the failed entries of the batches
+        :param cache: a ResponseCache for the GET requests
+        :param coalesce_requests: send a single request for concurrent identical GET requests
+        :param json_codec: the JSONCodec, or its name, encoding the batches and decoding the responses
+        :param keep_response_body: keep the raw body of the responses once parsed, only their json_body otherwise
+        """
+        super(AsyncFacebookClient, self).__init__(
+            request_timeout=request_timeout,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            json_codec=json_codec,
+            keep_response_body=keep_response_body,
+        )
+        self.coalescer = AsyncRequestCoalescer() if coalesce_requests else None
+        self.pool_connections = pool_connections or DEFAULT_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or DEFAULT_POOL_MAXSIZE
+        self.keep_alive = keep_alive
+        self.session = session
+
+    def _build_session(self):  # type: () -> aiohttp.ClientSession
+        """ Build the aiohttp session, it must be done from a running event loop."""
+        if aiohttp is None:
+            raise FacebookSDKException('aiohttp is required to use the AsyncFacebookClient.')
+
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_connections * self.pool_maxsize,
+            limit_per_host=self.pool_maxsize,
+            force_close=not self.keep_alive,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    async def close(self):  # type: () -> None
+        """ Release the pooled connections."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def send_request(self, request):
+        # type: (FacebookRequest) -> FacebookResponse
+        if self.coalescer and self.coalescer.is_coalescable(request):
+            return await self.coalescer.execute(request, self._send_request_with_cache)
+
+        return await self._send_request_with_cache(request)
+
+    async def _send_request_with_cache(self, request):
+        # type: (FacebookRequest) -> FacebookResponse
+        if not (self.cache and self.cache.is_cacheable(request)):
+            return await self._send_request_with_retries(request)
+
+        response, entry = self.cache.lookup(request, json_codec=self.json_codec)
+        if response:
+            return response
+
+        try:
+            response = await self._send_request_with_retries(request)
+        finally:
+            request.headers.pop(IF_NONE_MATCH_HEADER, None)
+
+        return self.cache.save(request, response, entry)
+
+    async def _send_request_with_retries(self, request):
+        # type: (FacebookRequest) -> FacebookResponse
+        if not self.retry_policy:
+            return await self._send_request(request)
+
+        if self.retry_policy.budget:
+            self.retry_policy.budget.record_request()
+
+        attempt = 1
+        while True:
+            try:
+                return await self._send_request(request)
+            except Exception as e:
+                if not self.retry_policy.should_retry(e, attempt, request):
+                    raise
+                await asyncio.sleep(self.retry_policy.backoff(attempt, e))
+                attempt += 1
+
+    async def _send_request(self, request):
+        # type: (FacebookRequest) -> FacebookResponse
+        request_params = self._prepareRequest(request)
+
+        if self.rate_limiter:
+            wait = self.rate_limiter.reserve(request)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        res = await self.send(
+            **request_params
+        )
+
+        return self._build_response(request=request, res=res)
+
+    async def send(
+        self,
+        data,  # type: Optional[Union[Dict, Text]]
+        headers,  # type: Dict
+        method,  # type: Text
+        params,  # type: Dict
+        url,  # type: Text
+        files,  # type: List[Tuple[Text, Tuple[Text, FacebookFile, Text]]]
+        timeout,  # type: int
+    ):
+        # type: (...) -> RawResponse
+        if self.session is None:
+            self.session = self._build_session()
+
+        body = data  # type: Any
+        if files:
+            body = aiohttp.FormData()
+            for key, value in cast(Dict, data or {}).items():
+                body.add_field(key, str(value))
+            for name, (file_name, _file, mime_type) in files:
+                # aiohttp streams a whole file, a part of a file is bounded and read at once.
+                content = _file.read() if _file.is_partial else _file.open()
+                body.add_field(name, content, filename=file_name, content_type=mime_type)
+
+        async with self.session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=_query_params(params),
+            data=body,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as res:
+            content = await res.read()
+
+        return RawResponse(status_code=res.status, headers=res.headers, content=content)
+
+    async def send_batch_request(self, batch_request, chunked=False, max_workers=None):
+        # type: (FacebookBatchRequest, bool, Optional[int]) -> FacebookBatchResponse
+        if chunked and len(batch_request.requests) > MAX_REQUEST_BY_BATCH:
+            return await self._send_chunked_batch_request(
+                batch_request=batch_request,
+                max_workers=max_workers or DEFAULT_BATCH_MAX_WORKERS,
+            )
+
+        response = await self._send_batch_request(batch_request)
+
+        if self.retry_policy:
+            await self._retry_batch_entries(response)
+
+        return response
+
+    async def _send_batch_request(self, batch_request):
+        # type: (FacebookBatchRequest) -> FacebookBatchResponse
+        batch_request.validate_batch_request_count()
+        batch_request.prepare_batch_request(json_codec=self.json_codec)
+        batch_response = await self.send_request(request=batch_request)
+
+        return self._build_batch_response(batch_request, batch_response)
+
+    async def _retry_batch_entries(self, batch_response):
+        # type: (FacebookBatchResponse) -> None
+        attempt = 1
+
+        while True:
+            indexes = self._retryable_batch_indexes(batch_response, attempt)
+            if not indexes:
+                return
+
+            await asyncio.sleep(self._batch_entries_backoff(batch_response, indexes, attempt))
+            batch_response.update(await self._send_batch_request(batch_response.request.subset(indexes)))
+            attempt += 1
+
+    async def resend_failed_batch_entries(self, batch_response, exception_classes=None, max_workers=None):
+        # type: (FacebookBatchResponse, Optional[Tuple[type, ...]], Optional[int]) -> FacebookBatchResponse
+        failed_batch_request = batch_response.failed_batch_request(exception_classes)
+        if failed_batch_request:
+            batch_response.update(
+                await self.send_batch_request(failed_batch_request, chunked=True, max_workers=max_workers),
+            )
+
+        return batch_response
+
+    async def _send_chunked_batch_request(self, batch_request, max_workers):
+        # type: (FacebookBatchRequest, int) -> FacebookBatchResponse
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def send_chunk(chunk):  # type: (FacebookBatchRequest) -> FacebookBatchResponse
+            async with semaphore:
+                try:
+                    return await self.send_batch_request(chunk)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # The failure of a chunk must not lose the responses of the other ones.
+                    return FacebookBatchResponse.failed(chunk, e)
+
+        batch_responses = await asyncio.gather(*[send_chunk(chunk) for chunk in batch_request.split()])
+
+        return FacebookBatchResponse.merge(
+            batch_request=batch_request,
+            batch_responses=batch_responses,
+        )
+
+
+class AsyncOAuth2Client(BaseOAuth2Client[AsyncFacebookClient]):
+
+    async def debug_token(self, access_token):
+        # type: (Union[Text, AccessToken]) -> Dict
+        metadata = self._cached_token_metadata(access_token)
+        if metadata is not None:
+            return {'data': metadata}
+
+        response = await self.client.send_request(self._debug_token_request(access_token))
+        self._cache_token_metadata(access_token, response.json_body)
+
+        return response.json_body
+
+    async def debug_tokens(self, access_tokens, max_workers=None):
+        # type: (Iterable[Union[Text, AccessToken]], Optional[int]) -> Dict[Text, Dict]
+        metadata, missing = self._split_cached_token_metadata(access_tokens)
+        if missing:
+            batch_response = await self.client.send_batch_request(
+                self._debug_tokens_batch_request(missing),
+                chunked=True,
+                max_workers=max_workers,
+            )
+            self._collect_token_metadata(missing, batch_response, metadata)
+
+        return metadata
+
+    async def get_access_token_from_code(self, code, redirect_uri=''):
+        # type: (Text, Text) -> AccessToken
+        params = {
+            'code': code,
+            'redirect_uri': redirect_uri
+        }
+
+        return await self._request_an_access_token(params=params)
+
+    async def get_long_lived_access_token(self, access_token):
+        # type: (Union[Text, AccessToken]) -> AccessToken
+        params = {
+            'grant_type': 'fb_exchange_token',
+            'fb_exchange_token': str(access_token),
+        }
+
+        return await self._request_an_access_token(params=params)
+
+    async def get_code_from_long_lived_access_token(self, access_token, redirect_uri):
+        # type: (Union[Text, AccessToken], Text) -> Text
+        params = {
+            'redirect_uri': redirect_uri,
+        }
+
+        response = await self._send_request_with_client_params(
+            '/oauth/client_code',
+            params=params,
+            access_token=access_token,
+        )
+
+        return self._code_from_response(response)
+
+    async def _send_request_with_client_params(self, endpoint, params, access_token=None):
+        # type: (Text, Dict, Optional[Union[Text, AccessToken]]) -> FacebookResponse
+        return await self.client.send_request(self._client_params_request(endpoint, params, access_token))
+
+    async def _request_an_access_token(self, params):
+        # type: (Dict) -> AccessToken
+        response = await self._send_request_with_client_params(
+            endpoint='/oauth/access_token',
+            params=params,
+        )
+
+        return self._access_token_from_response(response)
+
+
+class AsyncFacebookResumableUploader(BaseFacebookResumableUploader[AsyncFacebookClient]):
+    """ A FacebookResumableUploader whose phases must be awaited."""
+
+    resumable_exceptions = (FacebookResumableUploadException, asyncio.TimeoutError) + (
+        (aiohttp.ClientError,) if aiohttp is not None else ()
+    )  # type: Tuple[Type[BaseException], ...]
+
+    async def upload(
+        self,
+        endpoint,  # type: Text
+        file,  # type: FacebookFile
+        metadata=None,  # type: Optional[Dict]
+        max_transfer_tries=DEFAULT_MAX_TRANSFER_TRIES,  # type: int
+        chunk=None,  # type: Optional[FacebookTransferChunk]
+    ):
+        # type: (...) -> Dict[Text, Any]
+        chunk = chunk or await self.start(endpoint, file)
+        tries = max_transfer_tries
+        while not chunk.is_last_chunk:
+            try:
+                chunk = await self.transfer(endpoint, chunk, allow_to_throw=True)
+                tries = max_transfer_tries
+            except self.resumable_exceptions as e:
+                if tries < 1:
+                    raise
+                tries -= 1
+                await asyncio.sleep(self._transfer_backoff(max_transfer_tries - tries, e))
+                chunk = self._resumed_chunk(chunk, e)
+
+        return {
+            'video_id': chunk.video_id,
+            'success': await self.finish(endpoint, chunk.upload_session_id, metadata),
+        }
+
+    async def start(self, endpoint, file):
+        # type: (Text, FacebookFile) -> FacebookTransferChunk
+        response = await self.client.send_request(self._start_request(endpoint, file))
+
+        return self._chunk_from_response(file, response)
+
+    async def transfer(self, endpoint, chunk, allow_to_throw=False):
+        # type: (Text, FacebookTransferChunk, bool) -> FacebookTransferChunk
+        try:
+            response = await self.client.send_request(self._transfer_request(endpoint, chunk))
+        except self.resumable_exceptions as e:
+            if allow_to_throw:
+                raise
+            return self._resumed_chunk(chunk, e)
+
+        return self._chunk_from_response(chunk.file, response, chunk)
+
+    async def finish(self, endpoint, upload_session_id, metadata=None):
+        # type: (Text, Text, Optional[Dict]) -> bool
+        response = await self.client.send_request(self._finish_request(endpoint, upload_session_id, metadata))
+
+        return bool(response.json_body.get('success'))
+
+
+class AsyncFacebook(BaseFacebook[AsyncFacebookClient]):
+    """ A Facebook whose requests must be awaited."""
+
+    def _build_client(self, config):
+        # type: (Dict[Text, Any]) -> AsyncFacebookClient
+        return AsyncFacebookClient(
+            request_timeout=config.get('default_request_timeout'),
+            pool_connections=config.get('http_pool_connections'),
+            pool_maxsize=config.get('http_pool_maxsize'),
+            keep_alive=config.get('http_keep_alive', True),
+            rate_limiter=config.get('rate_limiter'),
+            retry_policy=config.get('retry_policy'),
+            cache=config.get('cache'),
+            coalesce_requests=config.get('coalesce_requests', False),
+            json_codec=config.get('json_codec'),
+            keep_response_body=config.get('keep_response_body', True),
+        )
+
+    def _build_oauth_client(self):
+        # type: () -> AsyncOAuth2Client
+        return AsyncOAuth2Client(
+            app=self.app,
+            client=self.client,
+            graph_version=self.default_graph_version,
+        )
+
+    def _build_dispatcher(self, config):
+        # type: (Dict[Text, Any]) -> Any
+        raise FacebookSDKException('auto_batch is not supported by AsyncFacebook, use send_batch_request.')
+
+    def _build_uploader(self, access_token=None, graph_version=None):
+        # type: (Optional[Text], Optional[Text]) -> AsyncFacebookResumableUploader
+        return AsyncFacebookResumableUploader(
+            app=self.app,
+            client=self.client,
+            access_token=access_token or getattr(self, 'default_access_token', None),
+            graph_version=graph_version or self.default_graph_version,
+        )
+
+    async def close(self):  # type: () -> None
+        await self.client.close()
+
+    async def upload_video(
+        self,
+        target,  # type: Text
+        path,  # type: Text
+        metadata=None,  # type: Optional[Dict]
+        access_token=None,  # type: Optional[Text]
+        max_transfer_tries=DEFAULT_MAX_TRANSFER_TRIES,  # type: int
+        graph_version=None,  # type: Optional[Text]
+    ):
+        # type: (...) -> Dict[Text, Any]
+        uploader = self._build_uploader(access_token=access_token, graph_version=graph_version)
+
+        return await uploader.upload(
+            endpoint='/{target}/videos'.format(target=target),
+            file=FacebookFile(path=path),
+            metadata=metadata,
+            max_transfer_tries=max_transfer_tries,
+        )
+
+    async def send_request(
+        self,
+        method,  # type: Text
+        endpoint,  # type: Text
+        access_token=None,  # type: Optional[Text]
+        params=None,  # type: Optional[Dict]
+        headers=None,  # type: Optional[Dict]
+        graph_version=None,  # type: Optional[Text]
+        timeout=None,  # type: Optional[int]
+    ):
+        # type: (...) -> FacebookResponse
+        request = self.request(
+            method=method,
+            access_token=access_token,
+            endpoint=endpoint,
+            params=params,
+            headers=headers,
+            graph_version=graph_version,
+            timeout=timeout,
+        )
+
+        return await self.send_facebook_request(request=request)
+
+    async def send_facebook_request(self, request):
+        # type: (FacebookRequest) -> FacebookResponse
+        return await self.client.send_request(request=request)
+
+    async def send_batch_request(
+        self,
+        requests,  # type: Union[Iterable[FacebookRequest], Mapping[Text, FacebookRequest]]
+        access_token=None,  # type: Optional[Text]
+        graph_version=None,  # type: Optional[Text]
+        timeout=None,  # type: Optional[int]
+        chunked=False,  # type: bool
+        max_workers=None,  # type: Optional[int]
+    ):
+        # type: (...) -> FacebookBatchResponse
+        access_token = access_token or getattr(self, 'default_access_token', None)
+        graph_version = graph_version or self.default_graph_version
+
+        batch_request = FacebookBatchRequest(
+            app=self.app,
+            requests=requests,
+            access_token=access_token,
+            graph_version=graph_version,
+            timeout=timeout,
+        )
+
+        return await self.client.send_batch_request(
+            batch_request=batch_request,
+            chunked=chunked,
+            max_workers=max_workers,
+        )
+
+    async def post(
+        self,
+        endpoint,  # type: Text
+        access_token=None,  # type: Optional[Text]
+        params=None,  # type: Optional[Dict]
+        headers=None,  # type: Optional[Dict]
+        graph_version=None,  # type: Optional[Text]
+    ):
+        return await self.send_request(
+            method=METHOD_POST,
+            access_token=access_token,
+            endpoint=endpoint,
+            params=params,
+            headers=headers,
+            graph_version=graph_version,
+        )
+
+    async def get(
+        self,
+        endpoint,  # type: Text
+        access_token=None,  # type: Optional[Text]
+        params=None,  # type: Optional[Dict]
+        headers=None,  # type: Optional[Dict]
+        graph_version=None,  # type: Optional[Text]
+        fields=None,  # type: Optional[Union[FieldSet, Text, Iterable]]
+    ):
+        return await self.send_request(
+            method=METHOD_GET,
+            access_token=access_token,
+            endpoint=endpoint,
+            params=with_fields(params, fields),
+            headers=headers,
+            graph_version=graph_version,
+        )
+
+    async def query(
+        self,
+        query,  # type: GraphQuery
+        access_token=None,  # type: Optional[Text]
+        graph_version=None,  # type: Optional[Text]
+    ):
+        # type: (...) -> Dict[Text, Dict]
+        access_token = access_token or getattr(self, 'default_access_token', None)
+        graph_version = graph_version or self.default_graph_version
+
+        responses = await asyncio.gather(*[
+            self.send_facebook_request(request)
+            for request in query.requests(app=self.app, access_token=access_token, graph_version=graph_version)
+        ])
+
+        objects = {}  # type: Dict[Text, Dict]
+        for response in responses:
+            objects.update(response.json_body)
+
+        return objects
+
+    async def get_many(
+        self,
+        ids,  # type: Iterable[Text]
+        fields=None,  # type: Optional[Union[FieldSet, Text, Iterable]]
+        access_token=None,  # type: Optional[Text]
+        graph_version=None,  # type: Optional[Text]
+        max_workers=None,  # type: Optional[int]
+    ):
+        # type: (...) -> Dict[Text, Union[Dict, Exception]]
+        groups = self._get_many_groups(ids, fields)
+        if not groups:
+            return {}
+
+        results = {}  # type: Dict[Text, Union[Dict, Exception]]
+        batch_response = await self.send_batch_request(
+            requests=self._get_many_requests(groups, access_token, graph_version),
+            access_token=access_token,
+            graph_version=graph_version,
+            chunked=True,
+            max_workers=max_workers,
+        )
+        failed_ids = self._collect_get_many_chunks(groups, batch_response, results)
+
+        if failed_ids:
+            batch_response = await self.send_batch_request(
+                requests=self._get_many_fallback_requests(failed_ids, fields, access_token, graph_version),
+                access_token=access_token,
+                graph_version=graph_version,
+                chunked=True,
+                max_workers=max_workers,
+            )
+            self._collect_get_many_objects(failed_ids, batch_response, results)
+
+        return results
+
+    async def delete(
+        self,
+        endpoint,  # type: Text
+        access_token=None,  # type: Optional[Text]
+        params=None,  # type: Optional[Dict]
+        headers=None,  # type: Optional[Dict]
+        graph_version=None,  # type: Optional[Text]
+    ):
+        return await self.send_request(
+            method=METHOD_DELETE,
+            access_token=access_token,
+            endpoint=endpoint,
+            params=params,
+            headers=headers,
+            graph_version=graph_version,
+        )
+
+    async def paginate(
+        self,
+        endpoint,  # type: Text
+        access_token=None,  # type: Optional[Text]
+        params=None,  # type: Optional[Dict]
+        headers=None,  # type: Optional[Dict]
+        graph_version=None,  # type: Optional[Text]
+        max_pages=None,  # type: Optional[int]
+        max_items=None,  # type: Optional[int]
+        prefetch=False,  # type: bool
+    ):
+        # type: (...) -> AsyncIterator[Dict]
+        response = await self.get(
+            endpoint=endpoint,
+            access_token=access_token,
+            params=params,
+            headers=headers,
+            graph_version=graph_version,
+        )
+
+        async for item in aiter_items(
+            response,
+            client=self.client,
+            max_pages=max_pages,
+            max_items=max_items,
+            prefetch=prefetch,
+        ):
+            yield item
+
+    async def resend_failed_batch_entries(self, batch_response, exception_classes=None, max_workers=None):
+        # type: (FacebookBatchResponse, Optional[Tuple[type, ...]], Optional[int]) -> FacebookBatchResponse
+        return await self.client.resend_failed_batch_entries(
+            batch_response,
+            exception_classes=exception_classes,
+            max_workers=max_workers,
+        )
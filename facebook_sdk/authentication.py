@@ -1,17 +1,22 @@
 import datetime
 import hashlib
 import hmac
+import time
 
 from six.moves.urllib.parse import urlencode
 from typing import (  # noqa: F401
     TYPE_CHECKING,
     Any,
     Dict,
+    Generic,
     Iterable,
     List,
     Mapping,
     Optional,
+    Set,
     Text,
+    Tuple,
+    TypeVar,
     Union,
 )
 
@@ -19,40 +24,82 @@ from facebook_sdk import (
     __version__ as VERSION,
     constants,
 )
+from facebook_sdk.cache import (  # noqa: F401
+    BaseCache,
+    LRUCache,
+)
+from facebook_sdk.client import (
+    BaseFacebookClient,
+    FacebookClient,
+)
 from facebook_sdk.exceptions import FacebookSDKException
-from facebook_sdk.request import FacebookRequest
+from facebook_sdk.request import (
+    FacebookBatchRequest,
+    FacebookRequest,
+)
 
 
 if TYPE_CHECKING:
-    from facebook_sdk.client import FacebookClient  # noqa: F401
     from facebook_sdk.facebook import FacebookApp  # noqa: F401
-    from facebook_sdk.response import FacebookResponse  # noqa: F401
+    from facebook_sdk.response import FacebookBatchResponse, FacebookResponse  # noqa: F401
+
+
+APP_SECRET_PROOF_CACHE_MAX_SIZE = 1024
+DEFAULT_TOKEN_METADATA_TTL = 3600
+
+C = TypeVar('C', bound=BaseFacebookClient)
+
+_app_secret_proof_cache = {}  # type: Dict[Tuple[Text, Text], Text]
+
+
+def app_secret_proof(access_token, secret):  # type: (Text, Text) -> Text
+    """ The HMAC-SHA256 of the access token keyed by the app secret, computed once per pair.
+
+    :param access_token: the access token to sign
+    :param secret: the app secret
+    """
+    key = (access_token, secret)
+    proof = _app_secret_proof_cache.get(key)
+    if proof is None:
+        proof = hmac.new(secret.encode('utf-8'), access_token.encode('utf-8'), hashlib.sha256).hexdigest()
+        if len(_app_secret_proof_cache) >= APP_SECRET_PROOF_CACHE_MAX_SIZE:
+            _app_secret_proof_cache.clear()
+        _app_secret_proof_cache[key] = proof
+
+    return proof
+
+
+def token_metadata_key(access_token):  # type: (Union[Text, AccessToken]) -> Text
+    """ Identify the cached metadata of a token by a hash of the token."""
+    return 'debug_token {token_hash}'.format(
+        token_hash=hashlib.sha256(str(access_token).encode('utf-8')).hexdigest(),
+    )
 
 
 class AccessToken(object):
+    __slots__ = ('access_token', 'expires_at')
+
     def __init__(self, access_token, expires_at=None):
         # type: (Text, Optional[datetime.datetime]) -> None
         super(AccessToken, self).__init__()
 
         self.access_token = access_token
-
-        if expires_at:
-            self.expires_at = expires_at
+        self.expires_at = expires_at
 
     def app_secret_proof(self, secret):  # type: (Text) -> Text
-        return hmac.new(bytes(secret.encode('utf-8')), self.access_token.encode('utf-8'), hashlib.sha256).hexdigest()
+        return app_secret_proof(self.access_token, secret)
 
     def is_app_access_token(self):  # type: () -> bool
         return len(self.access_token.split('|')) == 2
 
     def is_long_lived(self):  # type: () -> bool
-        if getattr(self, 'expires_at', None):
+        if self.expires_at:
             return self.expires_at > datetime.datetime.utcnow() + datetime.timedelta(hours=2)
 
         return self.is_app_access_token()
 
     def is_expired(self):  # type: () -> bool
-        if getattr(self, 'expires_at', None):
+        if self.expires_at:
             return self.expires_at < datetime.datetime.utcnow()
 
         return False
@@ -61,13 +108,28 @@ class AccessToken(object):
         return self.access_token
 
 
-class OAuth2Client(object):
-    def __init__(self, app, client, graph_version=None):
-        # type: (FacebookApp, FacebookClient, Optional[Text]) -> None
-        super(OAuth2Client, self).__init__()
+class BaseOAuth2Client(Generic[C]):
+    """ The parts of OAuth2Client and AsyncOAuth2Client that do not depend on the transport."""
+
+    def __init__(
+        self,
+        app,  # type: FacebookApp
+        client,  # type: C
+        graph_version=None,  # type: Optional[Text]
+        token_cache=None,  # type: Optional[BaseCache]
+        token_cache_ttl=DEFAULT_TOKEN_METADATA_TTL,  # type: float
+    ):
+        # type: (...) -> None
+        """
+        :param token_cache: the BaseCache keeping the metadata of the debugged tokens, an LRUCache by default
+        :param token_cache_ttl: the seconds to keep the metadata of the tokens that are invalid or do not expire
+        """
+        super(BaseOAuth2Client, self).__init__()
         self.app = app
         self.client = client
         self.graph_version = graph_version or constants.DEFAULT_GRAPH_VERSION  # type: Text
+        self.token_cache = token_cache if token_cache is not None else LRUCache()  # type: BaseCache
+        self.token_cache_ttl = token_cache_ttl
 
     def get_authorization_url(self, redirect_url, state, scope=None, params=None):
         # type: (Text, Text, Optional[Iterable[Text]], Optional[Dict[Text, Text]]) -> Text
@@ -96,16 +158,70 @@ class OAuth2Client(object):
             query=urlencode(_params)
         )
 
-    def debug_token(self, access_token):  # type: (Union[Text, AccessToken]) -> Dict
+    def is_valid(self, access_token):  # type: (Union[Text, AccessToken]) -> Optional[bool]
+        """ Check the cached metadata of a token, without any request.
+
+        :return: whether the token is valid and not expired, None if its metadata is not cached
         """
-        https://developers.facebook.com/docs/graph-api/reference/v2.8/debug_token
+        metadata = self._cached_token_metadata(access_token)
+        if metadata is None:
+            return None
+
+        expires_at = metadata.get('expires_at')
+        return bool(metadata.get('is_valid')) and (not expires_at or expires_at > time.time())
+
+    def _split_cached_token_metadata(self, access_tokens):
+        # type: (Iterable[Union[Text, AccessToken]]) -> Tuple[Dict[Text, Dict], List[Text]]
+        metadata = {}  # type: Dict[Text, Dict]
+        missing = []  # type: List[Text]
+        seen = set()  # type: Set[Text]
+        for access_token in access_tokens:
+            access_token = str(access_token)
+            if access_token in seen:
+                continue
+            seen.add(access_token)
+
+            cached = self._cached_token_metadata(access_token)
+            if cached is None:
+                missing.append(access_token)
+            else:
+                metadata[access_token] = cached
+
+        return metadata, missing
+
+    def _debug_tokens_batch_request(self, access_tokens):  # type: (List[Text]) -> FacebookBatchRequest
+        return FacebookBatchRequest(
+            app=self.app,
+            requests=[self._debug_token_request(access_token) for access_token in access_tokens],
+            access_token=self.app.access_token(),
+            graph_version=self.graph_version,
+        )
 
-        :param access_token:
+    def _collect_token_metadata(self, access_tokens, batch_response, metadata):
+        # type: (List[Text], FacebookBatchResponse, Dict[Text, Dict]) -> None
+        for access_token, record in zip(access_tokens, batch_response.responses):
+            response = record['response']
+            if not response.is_error:
+                metadata[access_token] = self._cache_token_metadata(access_token, response.json_body)
 
-        :raise FacebookSDKException
+    def _cached_token_metadata(self, access_token):  # type: (Union[Text, AccessToken]) -> Optional[Dict]
+        return self.token_cache.get(token_metadata_key(access_token))
 
-        :return: the token metadata
-        """
+    def _cache_token_metadata(self, access_token, json_body):
+        # type: (Union[Text, AccessToken], Dict) -> Dict
+        """ Cache the metadata of a valid token until it expires, the others for `token_cache_ttl` seconds."""
+        metadata = json_body.get('data', {})
+
+        ttl = self.token_cache_ttl
+        if metadata.get('is_valid') and metadata.get('expires_at'):
+            ttl = metadata['expires_at'] - time.time()
+
+        if ttl > 0:
+            self.token_cache.set(token_metadata_key(access_token), metadata, ttl=ttl)
+
+        return metadata
+
+    def _debug_token_request(self, access_token):  # type: (Union[Text, AccessToken]) -> FacebookRequest
         params = {
             'input_token': str(access_token)
         }
@@ -119,10 +235,104 @@ class OAuth2Client(object):
             graph_version=self.graph_version,
         )
 
-        response = self.client.send_request(self.last_request)
+        return self.last_request
+
+    def _code_from_response(self, response):  # type: (FacebookResponse) -> Text
+        data = response.json_body
+
+        if not data.get('code'):
+            raise FacebookSDKException('Code was not returned from Graph.', 401)
+
+        return data['code']
+
+    def _client_params_request(self, endpoint, params, access_token=None):
+        # type: (Text, Dict, Optional[Union[Text, AccessToken]]) -> FacebookRequest
+        params.update(self._get_client_params())
+
+        access_token = access_token or self.app.access_token()
+
+        self.last_request = FacebookRequest(
+            app=self.app,
+            access_token=str(access_token),
+            method='GET',
+            endpoint=endpoint,
+            params=params,
+            graph_version=self.graph_version,
+        )
+
+        return self.last_request
+
+    def _get_client_params(self):  # type: () -> Dict
+        return {
+            'client_id': self.app.app_id,
+            'client_secret': self.app.secret
+        }
+
+    def _access_token_from_response(self, response):  # type: (FacebookResponse) -> AccessToken
+        data = response.json_body
+
+        if 'access_token' not in data:
+            raise FacebookSDKException('Access token was not returned from Graph.', 401)
+
+        # For exchanging a short lived token with a long lived token.
+        # The expiration time in seconds will be returned as "expires".
+        expires_at = None
+        if 'expires' in data:
+            expires_at = datetime.datetime.utcfromtimestamp(int(data['expires']))
+        elif 'expires_in' in data:
+            # For exchanging a code for a short lived access token.
+            # The expiration time in seconds will be returned as "expires_in".
+            # See: https://developers.facebook.com/docs/facebook-login/access-tokens#long-via-code
+            expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=(data['expires_in']))
+
+        return AccessToken(
+            access_token=data['access_token'],
+            expires_at=expires_at,
+        )
+
+
+class OAuth2Client(BaseOAuth2Client[FacebookClient]):
+
+    def debug_token(self, access_token):  # type: (Union[Text, AccessToken]) -> Dict
+        """
+        https://developers.facebook.com/docs/graph-api/reference/v2.8/debug_token
+
+        :param access_token:
+
+        :raise FacebookSDKException
+
+        :return: the token metadata
+        """
+        metadata = self._cached_token_metadata(access_token)
+        if metadata is not None:
+            return {'data': metadata}
+
+        response = self.client.send_request(self._debug_token_request(access_token))
+        self._cache_token_metadata(access_token, response.json_body)
 
         return response.json_body
 
+    def debug_tokens(self, access_tokens, max_workers=None):
+        # type: (Iterable[Union[Text, AccessToken]], Optional[int]) -> Dict[Text, Dict]
+        """ Inspect many tokens at once with batches of /debug_token requests.
+
+        The tokens whose metadata is cached are not requested again.
+
+        :param access_tokens: the tokens to inspect
+        :param max_workers: the maximum number of batches sent at the same time
+        :return: the metadata of every token, by token, the tokens whose request failed are left out
+        """
+        metadata, missing = self._split_cached_token_metadata(access_tokens)
+        if missing:
+            batch_response = self.client.send_batch_request(
+                self._debug_tokens_batch_request(missing),
+                chunked=True,
+                max_workers=max_workers,
+            )
+            self._collect_token_metadata(missing, batch_response, metadata)
+
+        return metadata
+
     def get_access_token_from_code(self, code, redirect_uri=''):
         # type: (Text, Text) -> AccessToken
         params = {
@@ -161,61 +371,19 @@ class OAuth2Client(object):
             access_token=access_token,
         )
 
-        data = response.json_body
-
-        if not data.get('code'):
-            raise FacebookSDKException('Code was not returned from Graph.', 401)
-
-        return data['code']
+        return self._code_from_response(response)
 
     def _send_request_with_client_params(self, endpoint, params, access_token=None):
         # type: (Text, Dict, Optional[Union[Text, AccessToken]]) -> FacebookResponse
         """
         :return FacebookResponse
         """
-        params.update(self._get_client_params())
-
-        access_token = access_token or self.app.access_token()
-
-        self.last_request = FacebookRequest(
-            app=self.app,
-            access_token=str(access_token),
-            method='GET',
-            endpoint=endpoint,
-            params=params,
-            graph_version=self.graph_version,
-        )
-
-        return self.client.send_request(self.last_request)
-
-    def _get_client_params(self):  # type: () -> Dict
-        return {
-            'client_id': self.app.app_id,
-            'client_secret': self.app.secret
-        }
+        return self.client.send_request(self._client_params_request(endpoint, params, access_token))
 
     def _request_an_access_token(self, params):  # type: (Dict) -> AccessToken
         response = self._send_request_with_client_params(
             endpoint='/oauth/access_token',
             params=params,
         )
-        data = response.json_body
 
-        if 'access_token' not in data:
-            raise FacebookSDKException('Access token was not returned from Graph.', 401)
-
-        # For exchanging a short lived token with a long lived token.
-        # The expiration time in seconds will be returned as "expires".
-        expires_at = None
-        if 'expires' in data:
-            expires_at = datetime.datetime.utcfromtimestamp(int(data['expires']))
-        elif 'expires_in' in data:
-            # For exchanging a code for a short lived access token.
-            # The expiration time in seconds will be returned as "expires_in".
-            # See: https://developers.facebook.com/docs/facebook-login/access-tokens#long-via-code
-            expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=(data['expires_in']))
-
-        return AccessToken(
-            access_token=data['access_token'],
-            expires_at=expires_at,
-        )
+        return self._access_token_from_response(response)
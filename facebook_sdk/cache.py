@@ -0,0 +1,224 @@
+from collections import OrderedDict
+import fnmatch
+import hashlib
+import threading
+import time
+
+from six.moves.urllib.parse import urlencode
+from typing import (  # noqa: F401
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Text,
+    Tuple,
+)
+
+from facebook_sdk.constants import METHOD_GET
+from facebook_sdk.request import (  # noqa: F401
+    FacebookBatchRequest,
+    FacebookRequest,
+)
+from facebook_sdk.response import FacebookResponse
+from facebook_sdk.throttling import get_header
+from facebook_sdk.utils import (
+    convert_params_to_utf8,
+    force_slash_prefix,
+)
+
+
+if TYPE_CHECKING:
+    from facebook_sdk.json_codec import JSONCodec  # noqa: F401
+
+ETAG_HEADER = 'etag'
+IF_NONE_MATCH_HEADER = 'If-None-Match'
+HTTP_NOT_MODIFIED = 304
+
+DEFAULT_CACHE_MAX_SIZE = 1024
+DEFAULT_CACHE_TTL = 60
+DEFAULT_CACHE_MAX_STALE = 3600
+
+
+def request_key(request):  # type: (FacebookRequest) -> Text
+    """ Identify a request by its method, url, params and a hash of its access token."""
+    params = request.params
+    params.pop('access_token', None)
+    token_hash = hashlib.sha256((request.access_token or '').encode('utf-8')).hexdigest()
+
+    return '{method} {url}?{params} {token_hash}'.format(
+        method=request.method,
+        url=request.url,
+        params=urlencode(sorted(convert_params_to_utf8(params).items())),
+        token_hash=token_hash,
+    )
+
+
+def is_idempotent_read(request):  # type: (FacebookRequest) -> bool
+    return (
+        request.method == METHOD_GET and
+        not isinstance(request, FacebookBatchRequest) and
+        not request.contain_files()
+    )
+
+
+class BaseCache(object):
+    """ The interface of a cache backend.
+
+    The values stored by the SDK are dicts of plain types, so a backend shared between processes
+    only needs to serialize them.
+    """
+
+    def get(self, key):  # type: (Text) -> Optional[Any]
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):  # type: (Text, Any, Optional[float]) -> None
+        """
+        :param ttl: the seconds to keep the value for, None to keep it until it is evicted
+        """
+        raise NotImplementedError
+
+    def delete(self, key):  # type: (Text) -> None
+        raise NotImplementedError
+
+
+class LRUCache(BaseCache):
+    """ An in memory cache evicting the least recently used values once `max_size` is reached."""
+
+    def __init__(self, max_size=DEFAULT_CACHE_MAX_SIZE, clock=time.time):
+        # type: (int, Callable[[], float]) -> None
+        self.max_size = max_size
+        self.clock = clock
+        self._values = OrderedDict()  # type: OrderedDict
+        self._lock = threading.Lock()
+
+    def get(self, key):  # type: (Text) -> Optional[Any]
+        with self._lock:
+            if key not in self._values:
+                return None
+
+            value, expires_at = self._values.pop(key)
+            if expires_at is not None and expires_at <= self.clock():
+                return None
+
+            self._values[key] = (value, expires_at)
+            return value
+
+    def set(self, key, value, ttl=None):  # type: (Text, Any, Optional[float]) -> None
+        with self._lock:
+            self._values.pop(key, None)
+            self._values[key] = (value, self.clock() + ttl if ttl is not None else None)
+
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+
+    def delete(self, key):  # type: (Text) -> None
+        with self._lock:
+            self._values.pop(key, None)
+
+    def __len__(self):  # type: () -> int
+        return len(self._values)
+
+
+class ResponseCache(object):
+    """ Cache the successful responses to GET requests.
+
+    Entries are keyed on the url, the params and a hash of the access token. An expired entry with an
+    ETag is kept for up to `max_stale` seconds to revalidate it with If-None-Match.
+
+    :param backend: the BaseCache storing the entries, an LRUCache by default
+    :param default_ttl: the seconds a response is fresh for
+    :param ttls: the seconds a response is fresh for by endpoint glob pattern, e.g. {'/debug_token': 300}
+    :param max_stale: the seconds an expired entry with an ETag is kept for revalidation
+    """
+
+    def __init__(
+        self,
+        backend=None,  # type: Optional[BaseCache]
+        default_ttl=DEFAULT_CACHE_TTL,  # type: float
+        ttls=None,  # type: Optional[Mapping[Text, float]]
+        max_stale=DEFAULT_CACHE_MAX_STALE,  # type: float
+        clock=time.time,  # type: Callable[[], float]
+    ):
+        # type: (...) -> None
+        self.backend = backend or LRUCache()  # type: BaseCache
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.max_stale = max_stale
+        self.clock = clock
+
+    def is_cacheable(self, request):  # type: (FacebookRequest) -> bool
+        return is_idempotent_read(request)
+
+    def key(self, request):  # type: (FacebookRequest) -> Text
+        return request_key(request)
+
+    def ttl(self, request):  # type: (FacebookRequest) -> float
+        path = force_slash_prefix(request.endpoint.split('?')[0])
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatch(path, pattern):
+                return ttl
+
+        return self.default_ttl
+
+    def lookup(self, request, json_codec=None):
+        # type: (FacebookRequest, Optional[JSONCodec]) -> Tuple[Optional[FacebookResponse], Optional[Dict]]
+        """ Return the cached response if it is fresh, otherwise the stale entry to revalidate, if any.
+
+        The If-None-Match header is added to the request when the stale entry has an ETag.
+
+        :param json_codec: the JSONCodec decoding the cached response
+        """
+        entry = self.backend.get(self.key(request))
+        if entry is None:
+            return None, None
+
+        if entry['expires_at'] > self.clock():
+            return self._build_response(request, entry, json_codec), entry
+
+        if entry.get('etag'):
+            request.headers[IF_NONE_MATCH_HEADER] = entry['etag']
+
+        return None, entry
+
+    def save(self, request, response, entry=None):
+        # type: (FacebookRequest, FacebookResponse, Optional[Dict]) -> FacebookResponse
+        """ Store the response or, if it revalidated the stale entry, refresh the entry and return it."""
+        request.headers.pop(IF_NONE_MATCH_HEADER, None)
+
+        if response.http_status_code == HTTP_NOT_MODIFIED and entry is not None:
+            self._store(request, entry)
+            return self._build_response(request, entry, response.json_codec)
+
+        if response.http_status_code == 200:
+            headers = {}  # type: Dict[Text, Text]
+            if response.headers is not None and hasattr(response.headers, 'items'):
+                headers = dict(response.headers.items())
+            self._store(request, {
+                'http_status_code': response.http_status_code,
+                'body': response.body if response.body is not None else response.json_codec.dumps(response.json_body),
+                'headers': headers,
+                'etag': get_header(headers, ETAG_HEADER),
+            })
+
+        return response
+
+    def invalidate(self, request):  # type: (FacebookRequest) -> None
+        self.backend.delete(self.key(request))
+
+    def _store(self, request, entry):  # type: (FacebookRequest, Dict) -> None
+        ttl = self.ttl(request)
+        entry['expires_at'] = self.clock() + ttl
+        self.backend.set(self.key(request), entry, ttl=ttl + self.max_stale if entry.get('etag') else ttl)
+
+    @staticmethod
+    def _build_response(request, entry, json_codec=None):
+        # type: (FacebookRequest, Dict, Optional[JSONCodec]) -> FacebookResponse
+        return FacebookResponse(
+            request=request,
+            http_status_code=entry['http_status_code'],
+            body=entry['body'],
+            headers=entry['headers'],
+            json_codec=json_codec,
+        )
@@ -1,5 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from six.moves.urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
 from typing import (  # noqa: F401
     TYPE_CHECKING,
     Any,
@@ -11,27 +13,55 @@ from typing import (  # noqa: F401
     Union,
 )
 
+from facebook_sdk.cache import IF_NONE_MATCH_HEADER
+from facebook_sdk.coalescing import RequestCoalescer
 from facebook_sdk.constants import (
     BASE_GRAPH_URL,
+    DEFAULT_BATCH_MAX_WORKERS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
     DEFAULT_REQUEST_TIMEOUT,
 )
+from facebook_sdk.exceptions import FacebookSDKException
+from facebook_sdk.json_codec import get_codec
+from facebook_sdk.multipart import MultipartEncoder
+from facebook_sdk.request import MAX_REQUEST_BY_BATCH
 from facebook_sdk.response import (
     FacebookBatchResponse,
     FacebookResponse,
+    FacebookStreamResponse,
 )
-from facebook_sdk.utils import convert_params_to_utf8
 
 
 if TYPE_CHECKING:
+    from facebook_sdk.cache import ResponseCache  # noqa: F401
     from facebook_sdk.facebook_file import FacebookFile  # noqa: F401
+    from facebook_sdk.json_codec import JSONCodec  # noqa: F401
+    from facebook_sdk.retry import RetryPolicy  # noqa: F401
+    from facebook_sdk.throttling import RateLimiter  # noqa: F401
     from facebook_sdk.request import FacebookRequest, FacebookBatchRequest  # noqa: F401
 
 
-class FacebookClient(object):
+class BaseFacebookClient(object):
+    """ The parts of FacebookClient and AsyncFacebookClient that do not depend on the transport."""
 
-    def __init__(self, request_timeout=None):
-        # type: (Optional[int]) -> None
-        self.timeout = request_timeout or DEFAULT_REQUEST_TIMEOUT  # tpye: int
+    def __init__(
+        self,
+        request_timeout=None,  # type: Optional[int]
+        rate_limiter=None,  # type: Optional[RateLimiter]
+        retry_policy=None,  # type: Optional[RetryPolicy]
+        cache=None,  # type: Optional[ResponseCache]
+        json_codec=None,  # type: Optional[Union[Text, JSONCodec]]
+        keep_response_body=True,  # type: bool
+    ):
+        # type: (...) -> None
+        self.timeout = request_timeout or DEFAULT_REQUEST_TIMEOUT  # type: int
+        self.json_codec = get_codec(json_codec)
+        self.keep_response_body = keep_response_body
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
 
     def _prepareRequest(self, request):
         # type: (FacebookRequest) -> Dict
@@ -46,8 +76,7 @@ class FacebookClient(object):
             request.add_headers([
                 {'Content-Type': 'application/x-www-form-urlencoded'},
             ])
-            if request.post_params:
-                data = urlencode(convert_params_to_utf8(request.post_params))
+            data = request.url_encode_body
 
         return dict(
             url=url,
@@ -59,19 +88,19 @@ class FacebookClient(object):
             timeout=request.timeout or self.timeout,
         )
 
-    def send_request(self, request):
-        # type: (FacebookRequest) -> FacebookResponse
-        request_params = self._prepareRequest(request)
-
-        res = self.send(
-            **request_params
-        )
+    def _build_response(self, request, res):
+        # type: (FacebookRequest, Any) -> FacebookResponse
+        """ Wrap the transport response in a FacebookResponse, raising it if it is an error."""
+        if self.rate_limiter:
+            self.rate_limiter.update(request, res.headers)
 
         response = FacebookResponse(
             request=request,
             headers=res.headers,
             body=res.content,
             http_status_code=res.status_code,
+            json_codec=self.json_codec,
+            keep_body=self.keep_response_body,
         )
 
         if response.is_error:
@@ -79,6 +108,198 @@ class FacebookClient(object):
 
         return response
 
+    def _build_batch_response(self, batch_request, batch_response):
+        # type: (FacebookBatchRequest, FacebookResponse) -> FacebookBatchResponse
+        response = FacebookBatchResponse(
+            batch_request=batch_request,
+            batch_response=batch_response,
+        )
+
+        # Each entry reports the usage of its own access token and business objects.
+        if self.rate_limiter:
+            self.rate_limiter.update_batch(response)
+
+        return response
+
+    def _retryable_batch_indexes(self, batch_response, attempt):
+        # type: (FacebookBatchResponse, int) -> List[int]
+        retry_policy = self.retry_policy
+        if retry_policy is None:
+            return []
+
+        return [
+            index for index in batch_response.failed_indexes()
+            if retry_policy.should_retry(
+                batch_response.responses[index]['response'].exception,
+                attempt,
+                batch_response.request.requests[index]['request'],
+            )
+        ]
+
+    def _batch_entries_backoff(self, batch_response, indexes, attempt):
+        # type: (FacebookBatchResponse, List[int], int) -> float
+        return max(
+            self.retry_policy.backoff(attempt, batch_response.responses[index]['response'].exception)  # type: ignore
+            for index in indexes
+        )
+
+
+class FacebookClient(BaseFacebookClient):
+
+    def __init__(
+        self,
+        request_timeout=None,  # type: Optional[int]
+        pool_connections=None,  # type: Optional[int]
+        pool_maxsize=None,  # type: Optional[int]
+        pool_block=False,  # type: bool
+        max_retries=None,  # type: Optional[Any]
+        keep_alive=True,  # type: bool
+        session=None,  # type: Optional[requests.Session]
+        rate_limiter=None,  # type: Optional[RateLimiter]
+        retry_policy=None,  # type: Optional[RetryPolicy]
+        cache=None,  # type: Optional[ResponseCache]
+        coalesce_requests=False,  # type: bool
+        json_codec=None,  # type: Optional[Union[Text, JSONCodec]]
+        keep_response_body=True,  # type: bool
+    ):
+        # type: (...) -> None
+        """
+        :param request_timeout: the default timeout in seconds for every request
+        :param pool_connections: the number of connection pools to cache
+        :param pool_maxsize: the maximum number of connections to keep per host
+        :param pool_block: whether to block when the pool has no free connections
+        :param max_retries: the transport retries, an int or a urllib3 Retry instance
+        :param keep_alive: whether to keep the connections open between requests
+        :param session: a requests.Session to use instead of building one
+        :param rate_limiter: a RateLimiter pacing the requests from the Graph usage headers
+        :param retry_policy: a RetryPolicy applied to the requests and to the failed entries of the batches
+        :param cache: a ResponseCache for the GET requests
+        :param coalesce_requests: send a single request for concurrent identical GET requests
+        :param json_codec: the JSONCodec, or its name, encoding the batches and decoding the responses
+        :param keep_response_body: keep the raw body of the responses once parsed, only their json_body otherwise
+        """
+        super(FacebookClient, self).__init__(
+            request_timeout=request_timeout,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            json_codec=json_codec,
+            keep_response_body=keep_response_body,
+        )
+        self.coalescer = RequestCoalescer() if coalesce_requests else None
+        self.session = session or self._build_session(
+            pool_connections=pool_connections or DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or DEFAULT_POOL_MAXSIZE,
+            pool_block=pool_block,
+            max_retries=max_retries if max_retries is not None else DEFAULT_MAX_RETRIES,
+            keep_alive=keep_alive,
+        )
+
+    def _build_session(self, pool_connections, pool_maxsize, pool_block, max_retries, keep_alive):
+        # type: (int, int, bool, Any, bool) -> requests.Session
+        """ Build a session whose connection pool is shared by every request sent by the client."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=max_retries,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+
+        return session
+
+    def close(self):  # type: () -> None
+        """ Release the pooled connections."""
+        self.session.close()
+
+    def send_request(self, request):
+        # type: (FacebookRequest) -> FacebookResponse
+        if self.coalescer and self.coalescer.is_coalescable(request):
+            return self.coalescer.execute(request, self._send_request_with_cache)
+
+        return self._send_request_with_cache(request)
+
+    def _send_request_with_cache(self, request):
+        # type: (FacebookRequest) -> FacebookResponse
+        if not (self.cache and self.cache.is_cacheable(request)):
+            return self._send_request_with_retries(request)
+
+        response, entry = self.cache.lookup(request, json_codec=self.json_codec)
+        if response:
+            return response
+
+        try:
+            response = self._send_request_with_retries(request)
+        finally:
+            request.headers.pop(IF_NONE_MATCH_HEADER, None)
+
+        return self.cache.save(request, response, entry)
+
+    def _send_request_with_retries(self, request):
+        # type: (FacebookRequest) -> FacebookResponse
+        if self.retry_policy:
+            return self.retry_policy.execute_request(self._send_request, request)
+
+        return self._send_request(request)
+
+    def _send_request(self, request):
+        # type: (FacebookRequest) -> FacebookResponse
+        request_params = self._prepareRequest(request)
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire(request)
+
+        res = self.send(
+            **request_params
+        )
+
+        return self._build_response(request=request, res=res)
+
+    def send_streamed_request(self, request):
+        # type: (FacebookRequest) -> FacebookStreamResponse
+        """ Send a request whose `data` items are decoded while its body is being received.
+
+        The retry policy applies until the response headers are received, the cache and the
+        coalescing of requests do not apply. A response with an error status always raises.
+        """
+        if self.retry_policy:
+            return self.retry_policy.execute_request(self._send_streamed_request, request)
+
+        return self._send_streamed_request(request)
+
+    def _send_streamed_request(self, request):
+        # type: (FacebookRequest) -> FacebookStreamResponse
+        request_params = self._prepareRequest(request)
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire(request)
+
+        res = self.send(stream=True, **request_params)
+
+        if res.status_code >= 400:
+            # Errors are small, read them whole to raise them.
+            self._build_response(request=request, res=res)
+            raise FacebookSDKException(
+                'Graph responded with the HTTP status {status_code} without an error.'.format(
+                    status_code=res.status_code,
+                ),
+            )
+
+        if self.rate_limiter:
+            self.rate_limiter.update(request, res.headers)
+
+        return FacebookStreamResponse(
+            request=request,
+            http_status_code=res.status_code,
+            headers=res.headers,
+            raw=res,
+        )
+
     def send(
         self,
         data,  # type: Dict
@@ -88,9 +309,19 @@ class FacebookClient(object):
         url,  # type: Text
         files,  # type: List[Tuple[Text, Tuple[Text, FacebookFile, Text]]]
         timeout,  # type: int
+        stream=False,  # type: bool
     ):
         # type: (...) -> Any
-        response = requests.request(
+        """
+        :param stream: return before the body is received, it is read from the response as it arrives
+        """
+        if files:
+            # Stream the files from disk instead of letting requests read them whole.
+            body = MultipartEncoder(fields=data, files=files)
+            headers = dict(headers, **{'Content-Type': body.content_type})
+            data, files = body, None  # type: ignore
+
+        response = self.session.request(
             method=method,
             url=url,
             headers=headers,
@@ -98,18 +329,83 @@ class FacebookClient(object):
             data=data,
             files=files,
             timeout=timeout,
+            stream=stream,
         )
         return response
 
-    def send_batch_request(self, batch_request):
+    def send_batch_request(self, batch_request, chunked=False, max_workers=None):
+        # type: (FacebookBatchRequest, bool, Optional[int]) -> FacebookBatchResponse
+        """
+        :param batch_request: the FacebookBatchRequest to send
+        :param chunked: split batches over the Graph limit and send the chunks concurrently,
+            the entries of a chunk that cannot be sent fail with the exception raised sending it
+        :param max_workers: the maximum number of chunks sent at the same time
+        """
+        if chunked and len(batch_request.requests) > MAX_REQUEST_BY_BATCH:
+            return self._send_chunked_batch_request(
+                batch_request=batch_request,
+                max_workers=max_workers or DEFAULT_BATCH_MAX_WORKERS,
+            )
+
+        response = self._send_batch_request(batch_request)
+
+        if self.retry_policy:
+            self._retry_batch_entries(response)
+
+        return response
+
+    def _send_batch_request(self, batch_request):
         # type: (FacebookBatchRequest) -> FacebookBatchResponse
         batch_request.validate_batch_request_count()
-        batch_request.prepare_batch_request()
+        batch_request.prepare_batch_request(json_codec=self.json_codec)
         batch_response = self.send_request(request=batch_request)
 
-        response = FacebookBatchResponse(
+        return self._build_batch_response(batch_request, batch_response)
+
+    def resend_failed_batch_entries(self, batch_response, exception_classes=None, max_workers=None):
+        # type: (FacebookBatchResponse, Optional[Tuple[type, ...]], Optional[int]) -> FacebookBatchResponse
+        """ Resend only the failed entries of a batch and merge their new responses in place.
+
+        :param batch_response: the FacebookBatchResponse to recover
+        :param exception_classes: only resend the entries whose exception is an instance of these classes
+        :param max_workers: the maximum number of chunks sent at the same time, when there are over 50 entries to resend
+        :return: the updated batch_response
+        """
+        failed_batch_request = batch_response.failed_batch_request(exception_classes)
+        if failed_batch_request:
+            batch_response.update(self.send_batch_request(failed_batch_request, chunked=True, max_workers=max_workers))
+
+        return batch_response
+
+    def _retry_batch_entries(self, batch_response):
+        # type: (FacebookBatchResponse) -> None
+        """ Resend the failed entries of the batch the retry policy allows, in place."""
+        attempt = 1
+
+        while True:
+            indexes = self._retryable_batch_indexes(batch_response, attempt)
+            if not indexes:
+                return
+
+            self.retry_policy.sleep(self._batch_entries_backoff(batch_response, indexes, attempt))  # type: ignore
+            batch_response.update(self._send_batch_request(batch_response.request.subset(indexes)))
+            attempt += 1
+
+    def _send_batch_chunk(self, chunk):  # type: (FacebookBatchRequest) -> FacebookBatchResponse
+        """ Send a chunk of a batch, the failure of a chunk must not lose the responses of the other ones."""
+        try:
+            return self.send_batch_request(chunk)
+        except Exception as e:
+            return FacebookBatchResponse.failed(chunk, e)
+
+    def _send_chunked_batch_request(self, batch_request, max_workers):
+        # type: (FacebookBatchRequest, int) -> FacebookBatchResponse
+        chunks = batch_request.split()
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            batch_responses = list(executor.map(self._send_batch_chunk, chunks))
+
+        return FacebookBatchResponse.merge(
             batch_request=batch_request,
-            batch_response=batch_response,
+            batch_responses=batch_responses,
         )
-
-        return response
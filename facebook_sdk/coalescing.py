@@ -0,0 +1,80 @@
+from copy import copy
+import threading
+
+from typing import (  # noqa: F401
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Optional,
+    Text,
+)
+
+from facebook_sdk.cache import (
+    is_idempotent_read,
+    request_key,
+)
+
+
+if TYPE_CHECKING:
+    from facebook_sdk.request import FacebookRequest  # noqa: F401
+    from facebook_sdk.response import FacebookResponse  # noqa: F401
+
+
+class _Call(object):
+    def __init__(self):  # type: () -> None
+        self.done = threading.Event()
+        self.response = None  # type: Optional[FacebookResponse]
+        self.exception = None  # type: Optional[BaseException]
+
+
+class RequestCoalescer(object):
+    """ Collapse concurrent identical GET requests into a single call.
+
+    The first caller sends the request, the callers asking for the same request meanwhile wait for it
+    and get a copy of its response, bound to their own request, or its exception.
+    """
+
+    def __init__(self):  # type: () -> None
+        self._calls = {}  # type: Dict[Text, _Call]
+        self._lock = threading.Lock()
+
+    def is_coalescable(self, request):  # type: (FacebookRequest) -> bool
+        return is_idempotent_read(request)
+
+    def execute(self, request, send):
+        # type: (FacebookRequest, Callable[[FacebookRequest], FacebookResponse]) -> FacebookResponse
+        key = request_key(request)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()  # type: ignore
+            if call.exception is not None:  # type: ignore
+                raise call.exception  # type: ignore
+            return bind_response(call.response, request)  # type: ignore
+
+        try:
+            call.response = send(request)  # type: ignore
+            return call.response  # type: ignore
+        except BaseException as e:
+            # Even an interruption of the leader must reach the callers waiting for it.
+            call.exception = e  # type: ignore
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()  # type: ignore
+
+
+def bind_response(response, request):  # type: (FacebookResponse, FacebookRequest) -> FacebookResponse
+    """ A shallow copy of the response bound to another, identical, request."""
+    if response.request is request:
+        return response
+
+    response = copy(response)
+    response.request = request
+    return response
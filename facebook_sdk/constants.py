@@ -19,3 +19,9 @@ METHOD_DELETE = 'DELETE'
 METHOD_GET = 'GET'
 METHOD_POST = 'POST'
 METHOD_PUT = 'PUT'
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RETRIES = 0
+
+DEFAULT_BATCH_MAX_WORKERS = 4
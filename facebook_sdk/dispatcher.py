@@ -0,0 +1,158 @@
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+import threading
+import time
+
+from typing import (  # noqa: F401
+    TYPE_CHECKING,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    Union,
+)
+
+from facebook_sdk.constants import DEFAULT_BATCH_MAX_WORKERS
+from facebook_sdk.exceptions import FacebookSDKException
+from facebook_sdk.request import (
+    MAX_REQUEST_BY_BATCH,
+    FacebookBatchRequest,
+)
+
+
+if TYPE_CHECKING:
+    from facebook_sdk.authentication import AccessToken  # noqa: F401
+    from facebook_sdk.client import FacebookClient  # noqa: F401
+    from facebook_sdk.facebook import FacebookApp  # noqa: F401
+    from facebook_sdk.request import FacebookRequest  # noqa: F401
+
+DEFAULT_DISPATCH_MAX_DELAY = 0.01
+
+
+class BatchDispatcher(object):
+    """ Merge the requests submitted within a short window into batch requests.
+
+    A batch is sent once `max_size` requests are queued or `max_delay` seconds after the first one
+    was queued, whichever comes first. Each submitted request gets a Future resolved with its own
+    FacebookResponse or FacebookResponseException.
+
+    :param client: the FacebookClient sending the batches
+    :param app: the FacebookApp of the batches
+    :param access_token: the access token of the batches, the one of their first request by default
+    :param graph_version: the graph version of the batches
+    :param max_delay: the seconds a request can wait for others to join its batch
+    :param max_size: the maximum number of requests of a batch
+    :param max_workers: the maximum number of batches sent at the same time
+    """
+
+    def __init__(
+        self,
+        client,  # type: FacebookClient
+        app=None,  # type: Optional[FacebookApp]
+        access_token=None,  # type: Optional[Union[Text, AccessToken]]
+        graph_version=None,  # type: Optional[Text]
+        max_delay=DEFAULT_DISPATCH_MAX_DELAY,  # type: float
+        max_size=MAX_REQUEST_BY_BATCH,  # type: int
+        max_workers=DEFAULT_BATCH_MAX_WORKERS,  # type: int
+    ):
+        # type: (...) -> None
+        if not 0 < max_size <= MAX_REQUEST_BY_BATCH:
+            raise FacebookSDKException('The batch size must be between 1 and %d' % MAX_REQUEST_BY_BATCH)
+
+        self.client = client
+        self.app = app
+        self.access_token = access_token
+        self.graph_version = graph_version
+        self.max_delay = max_delay
+        self.max_size = max_size
+
+        self._queue = []  # type: List[Tuple[FacebookRequest, Future]]
+        self._first_queued_at = None  # type: Optional[float]
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = None  # type: Optional[threading.Thread]
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, request):  # type: (FacebookRequest) -> Future
+        """ Queue a request to be sent in the next batch.
+
+        :return: a Future resolved with the FacebookResponse of the request
+        """
+        future = Future()  # type: Future
+
+        with self._condition:
+            if self._closed:
+                raise FacebookSDKException('The dispatcher is closed.')
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='facebook-batch-dispatcher')
+                self._thread.daemon = True
+                self._thread.start()
+
+            if not self._queue:
+                self._first_queued_at = time.time()
+            self._queue.append((request, future))
+            self._condition.notify()
+
+        return future
+
+    def close(self):  # type: () -> None
+        """ Send the queued requests and stop the dispatcher."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _run(self):  # type: () -> None
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+
+                if not self._queue:
+                    return
+
+                deadline = self._first_queued_at + self.max_delay  # type: ignore
+                while len(self._queue) < self.max_size and not self._closed:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                items, self._queue = self._queue[:self.max_size], self._queue[self.max_size:]
+                self._first_queued_at = time.time() if self._queue else None
+
+            self._executor.submit(self._send, items)
+
+    def _send(self, items):  # type: (List[Tuple[FacebookRequest, Future]]) -> None
+        if len(items) == 1:
+            request, future = items[0]
+            try:
+                future.set_result(self.client.send_request(request))
+            except Exception as e:
+                future.set_exception(e)
+            return
+
+        try:
+            batch_response = self.client.send_batch_request(FacebookBatchRequest(
+                app=self.app,
+                requests=[request for request, _ in items],
+                access_token=self.access_token or items[0][0].access_token,
+                graph_version=self.graph_version,
+            ))
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        for (_, future), record in zip(items, batch_response.responses):
+            response = record['response']
+            if response.is_error:
+                future.set_exception(response.exception)
+            else:
+                future.set_result(response)
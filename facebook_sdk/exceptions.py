@@ -1,6 +1,7 @@
 from typing import (  # noqa: F401
     TYPE_CHECKING,
     Any,
+    Optional,
     Text,
     Tuple,
     Type,
@@ -86,7 +87,21 @@ class FacebookAuthenticationException(FacebookResponseException):
 
 
 class FacebookResumableUploadException(FacebookResponseException):
-    pass
+    @property
+    def start_offset(self):  # type: () -> Optional[int]
+        """ The offset Graph expects the upload to resume from, if it reported one."""
+        return self._error_data_offset('start_offset')
+
+    @property
+    def end_offset(self):  # type: () -> Optional[int]
+        return self._error_data_offset('end_offset')
+
+    def _error_data_offset(self, name):  # type: (Text) -> Optional[int]
+        error_data = self.response.json_body.get('error', {}).get('error_data')
+        if not isinstance(error_data, dict) or error_data.get(name) is None:
+            return None
+
+        return int(error_data[name])
 
 
 class FacebookServerException(FacebookResponseException):
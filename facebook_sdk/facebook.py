@@ -4,33 +4,58 @@ from typing import (  # noqa: F401
     TYPE_CHECKING,
     Any,
     Dict,
+    Generic,
     Iterable,
+    Iterator,
+    List,
     Mapping,
     Optional,
     Text,
     Tuple,
     Type,
+    TypeVar,
     Union,
     cast,
 )
 
-from facebook_sdk.authentication import (
+from facebook_sdk.authentication import (  # noqa: F401
     AccessToken,
+    BaseOAuth2Client,
     OAuth2Client,
+    app_secret_proof,
+)
+from facebook_sdk.client import (
+    BaseFacebookClient,
+    FacebookClient,
 )
-from facebook_sdk.client import FacebookClient
 from facebook_sdk.constants import (
     DEFAULT_GRAPH_VERSION,
     METHOD_DELETE,
     METHOD_GET,
     METHOD_POST,
 )
+from facebook_sdk.dispatcher import (
+    DEFAULT_DISPATCH_MAX_DELAY,
+    BatchDispatcher,
+)
 from facebook_sdk.exceptions import FacebookSDKException
 from facebook_sdk.facebook_file import FacebookFile
+from facebook_sdk.query import (  # noqa: F401
+    FieldSet,
+    GraphQuery,
+    ids_request,
+    with_fields,
+)
 from facebook_sdk.request import (
+    MAX_REQUEST_BY_BATCH,
     FacebookBatchRequest,
     FacebookRequest,
 )
+from facebook_sdk.upload import (  # noqa: F401
+    DEFAULT_MAX_TRANSFER_TRIES,
+    BaseFacebookResumableUploader,
+    FacebookResumableUploader,
+)
 
 
 if TYPE_CHECKING:
@@ -39,13 +64,30 @@ if TYPE_CHECKING:
 APP_ID_ENV_NAME = 'FACEBOOK_APP_ID'
 APP_SECRET_ENV_NAME = 'FACEBOOK_APP_SECRET'
 
+# The (code, subcode) of the errors of a chunk of ids caused by one of its ids, a None subcode matches any.
+# The other errors 100, e.g. an unknown field, fail every id alike and are not looked up id by id.
+GET_MANY_FALLBACK_ERRORS = (
+    (803, None),  # An id that does not exist.
+    (100, 33),  # An object that does not exist or cannot be loaded, e.g. without the permission.
+)
+
+C = TypeVar('C', bound=BaseFacebookClient)
+
 
 class FacebookApp(object):
-    def __init__(self, app_id, app_secret):
-        # type: (Text, Text) -> None
+    def __init__(self, app_id, app_secret, enable_appsecret_proof=False):
+        # type: (Text, Text, bool) -> None
+        """
+        :param enable_appsecret_proof: sign the access token of every request of the app with an appsecret_proof
+        """
         super(FacebookApp, self).__init__()
         self.app_id = app_id
         self.secret = app_secret
+        self.enable_appsecret_proof = enable_appsecret_proof
+
+    def appsecret_proof(self, access_token):
+        # type: (Text) -> Text
+        return app_secret_proof(str(access_token), self.secret)
 
     def access_token(self):
         # type: () -> AccessToken
@@ -58,10 +100,12 @@ class FacebookApp(object):
         )
 
 
-class Facebook(object):
+class BaseFacebook(Generic[C]):
+    """ The parts of Facebook and AsyncFacebook that do not depend on the transport."""
+
     def __init__(self, **kwargs):
         # type: (Any) -> None
-        super(Facebook, self).__init__()
+        super(BaseFacebook, self).__init__()
 
         self.config = {
             'app_id': os.getenv(APP_ID_ENV_NAME, kwargs.get('app_id')),
@@ -93,13 +137,27 @@ class Facebook(object):
         self.app = FacebookApp(
             app_id=cast(Text, self.config['app_id']),
             app_secret=cast(Text, self.config['app_secret']),
+            enable_appsecret_proof=kwargs.get('enable_appsecret_proof', False),
         )
-        self.client = FacebookClient(request_timeout=kwargs.get('default_request_timeout'))
-        self.oauth_client = OAuth2Client(
-            app=self.app,
-            client=self.client,
-            graph_version=self.default_graph_version,
-        )
+        self.client = self._build_client(kwargs)
+        self.oauth_client = self._build_oauth_client()
+        self.dispatcher = self._build_dispatcher(kwargs) if kwargs.get('auto_batch') else None
+
+    def _build_client(self, config):
+        # type: (Dict[Text, Any]) -> C
+        raise NotImplementedError
+
+    def _build_oauth_client(self):
+        # type: () -> BaseOAuth2Client[C]
+        raise NotImplementedError
+
+    def _build_dispatcher(self, config):
+        # type: (Dict[Text, Any]) -> BatchDispatcher
+        raise NotImplementedError
+
+    def _build_uploader(self, access_token=None, graph_version=None):
+        # type: (Optional[Text], Optional[Text]) -> BaseFacebookResumableUploader[C]
+        raise NotImplementedError
 
     def request(
         self,
@@ -126,6 +184,129 @@ class Facebook(object):
             timeout=timeout,
         )
 
+    def set_default_access_token(self, access_token):
+        # type: (Union[Text, AccessToken]) -> None
+        if isinstance(access_token, str):
+            self.default_access_token = AccessToken(access_token=access_token)
+        elif isinstance(access_token, AccessToken):
+            self.default_access_token = access_token
+        else:
+            raise ValueError('The default access token must be of type "str" or AccessToken')
+
+    def file_to_upload(self, path, use_mmap=False):
+        # type: (Text, bool) -> FacebookFile
+        """
+        :param use_mmap: stream the file from a memory map instead of reading copies of its chunks
+        """
+        return FacebookFile(path=path, use_mmap=use_mmap)
+
+    def _get_many_groups(self, ids, fields):
+        # type: (Iterable[Text], Optional[Union[FieldSet, Text, Iterable]]) -> List[Tuple[List[Text], Text]]
+        query = GraphQuery()
+        for object_id in ids:
+            query.add(object_id, fields)
+
+        return query.groups()
+
+    def _get_many_requests(self, groups, access_token, graph_version):
+        # type: (List[Tuple[List[Text], Text]], Optional[Text], Optional[Text]) -> List[FacebookRequest]
+        return [
+            ids_request(
+                ids=ids,
+                fields=group_fields,
+                app=self.app,
+                access_token=access_token or getattr(self, 'default_access_token', None),
+                graph_version=graph_version or self.default_graph_version,
+            )
+            for ids, group_fields in groups
+        ]
+
+    def _get_many_fallback_requests(self, ids, fields, access_token, graph_version):
+        # type: (List[Text], Optional[Union[FieldSet, Text, Iterable]], Optional[Text], Optional[Text]) -> List
+        return [
+            self.request(
+                method=METHOD_GET,
+                endpoint='/{object_id}'.format(object_id=object_id),
+                access_token=access_token,
+                params=with_fields(None, fields),
+                graph_version=graph_version,
+            )
+            for object_id in ids
+        ]
+
+    @classmethod
+    def _collect_get_many_chunks(cls, groups, batch_response, results):
+        # type: (List[Tuple[List[Text], Text]], FacebookBatchResponse, Dict) -> List[Text]
+        """ Gather the objects of the chunks that succeeded and return the ids to look up one by one.
+
+        A chunk failing for another reason than one of its ids, e.g. an expired token or a throttle,
+        gives its exception to each of its ids.
+        """
+        failed_ids = []  # type: List[Text]
+        for (ids, _), record in zip(groups, batch_response.responses):
+            response = record['response']
+            exception = response.exception
+            if exception is None:
+                results.update(response.json_body)
+            elif cls._is_get_many_fallback(exception):
+                failed_ids.extend(ids)
+            else:
+                results.update((object_id, exception) for object_id in ids)
+
+        return failed_ids
+
+    @staticmethod
+    def _is_get_many_fallback(exception):  # type: (Exception) -> bool
+        code = getattr(exception, 'code', None)
+        subcode = getattr(exception, 'error_subcode', None)
+        return (code, None) in GET_MANY_FALLBACK_ERRORS or (code, subcode) in GET_MANY_FALLBACK_ERRORS
+
+    @staticmethod
+    def _collect_get_many_objects(ids, batch_response, results):
+        # type: (List[Text], FacebookBatchResponse, Dict) -> None
+        for object_id, record in zip(ids, batch_response.responses):
+            response = record['response']
+            results[object_id] = response.exception if response.is_error else response.json_body
+
+
+class Facebook(BaseFacebook[FacebookClient]):
+
+    def _build_client(self, config):
+        # type: (Dict[Text, Any]) -> FacebookClient
+        return FacebookClient(
+            request_timeout=config.get('default_request_timeout'),
+            pool_connections=config.get('http_pool_connections'),
+            pool_maxsize=config.get('http_pool_maxsize'),
+            pool_block=config.get('http_pool_block', False),
+            max_retries=config.get('http_max_retries'),
+            keep_alive=config.get('http_keep_alive', True),
+            rate_limiter=config.get('rate_limiter'),
+            retry_policy=config.get('retry_policy'),
+            cache=config.get('cache'),
+            coalesce_requests=config.get('coalesce_requests', False),
+            json_codec=config.get('json_codec'),
+            keep_response_body=config.get('keep_response_body', True),
+        )
+
+    def _build_oauth_client(self):
+        # type: () -> OAuth2Client
+        return OAuth2Client(
+            app=self.app,
+            client=self.client,
+            graph_version=self.default_graph_version,
+        )
+
+    def _build_dispatcher(self, config):
+        # type: (Dict[Text, Any]) -> BatchDispatcher
+        return BatchDispatcher(
+            client=self.client,
+            app=self.app,
+            access_token=getattr(self, 'default_access_token', None),
+            graph_version=self.default_graph_version,
+            max_delay=config.get('auto_batch_max_delay', DEFAULT_DISPATCH_MAX_DELAY),
+            max_size=config.get('auto_batch_max_size', MAX_REQUEST_BY_BATCH),
+        )
+
     def send_request(
         self,
         method,  # type: Text
@@ -152,6 +333,9 @@ class Facebook(object):
 
     def send_facebook_request(self, request):
         # type: (FacebookRequest) -> FacebookResponse
+        if self.dispatcher is not None:
+            return self.dispatcher.submit(request).result()
+
         return self.client.send_request(request=request)
 
     def send_batch_request(
@@ -160,8 +344,14 @@ class Facebook(object):
         access_token=None,  # type: Optional[Text]
         graph_version=None,  # type: Optional[Text]
         timeout=None,  # type: Optional[int]
+        chunked=False,  # type: bool
+        max_workers=None,  # type: Optional[int]
     ):
         # type: (...) -> FacebookBatchResponse
+        """
+        :param chunked: accept more requests than the Graph batch limit, sending them in concurrent chunks
+        :param max_workers: the maximum number of chunks sent at the same time
+        """
         access_token = access_token or getattr(self, 'default_access_token', None)
         graph_version = graph_version or self.default_graph_version
 
@@ -173,21 +363,72 @@ class Facebook(object):
             timeout=timeout,
         )
 
-        response = self.client.send_batch_request(batch_request=batch_request)
+        response = self.client.send_batch_request(
+            batch_request=batch_request,
+            chunked=chunked,
+            max_workers=max_workers,
+        )
         return response
 
-    def set_default_access_token(self, access_token):
-        # type: (Union[Text, AccessToken]) -> None
-        if isinstance(access_token, str):
-            self.default_access_token = AccessToken(access_token=access_token)
-        elif isinstance(access_token, AccessToken):
-            self.default_access_token = access_token
-        else:
-            raise ValueError('The default access token must be of type "str" or AccessToken')
+    def resend_failed_batch_entries(
+        self,
+        batch_response,  # type: FacebookBatchResponse
+        exception_classes=None,  # type: Optional[Tuple[type, ...]]
+        max_workers=None,  # type: Optional[int]
+    ):
+        # type: (...) -> FacebookBatchResponse
+        """ Resend only the failed entries of a batch and merge their new responses in place.
+
+        :param exception_classes: only resend the entries whose exception is an instance of these classes
+        :param max_workers: the maximum number of chunks sent at the same time
+        """
+        return self.client.resend_failed_batch_entries(
+            batch_response,
+            exception_classes=exception_classes,
+            max_workers=max_workers,
+        )
+
+    def close(self):
+        # type: () -> None
+        """ Send the requests waiting to be batched and release the connections pooled by the client."""
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+        self.client.close()
+
+    def _build_uploader(self, access_token=None, graph_version=None):
+        # type: (Optional[Text], Optional[Text]) -> FacebookResumableUploader
+        return FacebookResumableUploader(
+            app=self.app,
+            client=self.client,
+            access_token=access_token or getattr(self, 'default_access_token', None),
+            graph_version=graph_version or self.default_graph_version,
+        )
 
-    def file_to_upload(self, path):
-        # type: (Text) -> FacebookFile
-        return FacebookFile(path=path)
+    def upload_video(
+        self,
+        target,  # type: Text
+        path,  # type: Text
+        metadata=None,  # type: Optional[Dict]
+        access_token=None,  # type: Optional[Text]
+        max_transfer_tries=DEFAULT_MAX_TRANSFER_TRIES,  # type: int
+        graph_version=None,  # type: Optional[Text]
+    ):
+        # type: (...) -> Dict[Text, Any]
+        """ Upload a video to `target` in chunks, transferring again the chunks that fail on the way.
+
+        :param target: the id of the user, page or group to upload the video to
+        :param metadata: the params of the video, e.g. its title and description
+        :param max_transfer_tries: the number of times a chunk is transferred again after a resumable failure
+        :return: the id of the video and whether it was published
+        """
+        uploader = self._build_uploader(access_token=access_token, graph_version=graph_version)
+
+        return uploader.upload(
+            endpoint='/{target}/videos'.format(target=target),
+            file=FacebookFile(path=path),
+            metadata=metadata,
+            max_transfer_tries=max_transfer_tries,
+        )
 
     def post(
         self,
@@ -213,16 +454,159 @@ class Facebook(object):
         params=None,  # type: Optional[Dict]
         headers=None,  # type: Optional[Dict]
         graph_version=None,  # type: Optional[Text]
+        fields=None,  # type: Optional[Union[FieldSet, Text, Iterable]]
     ):
+        """
+        :param fields: the fields to request, a FieldSet, a fields string or an iterable of fields
+        """
         return self.send_request(
             method=METHOD_GET,
             access_token=access_token,
             endpoint=endpoint,
+            params=with_fields(params, fields),
+            headers=headers,
+            graph_version=graph_version,
+        )
+
+    def query(
+        self,
+        query,  # type: GraphQuery
+        access_token=None,  # type: Optional[Text]
+        graph_version=None,  # type: Optional[Text]
+    ):
+        # type: (...) -> Dict[Text, Dict]
+        """ Send the requests of a GraphQuery, the objects asked with the same fields are requested together.
+
+        :return: the objects by id
+        """
+        access_token = access_token or getattr(self, 'default_access_token', None)
+        graph_version = graph_version or self.default_graph_version
+
+        objects = {}  # type: Dict[Text, Dict]
+        for request in query.requests(app=self.app, access_token=access_token, graph_version=graph_version):
+            objects.update(self.send_facebook_request(request).json_body)
+
+        return objects
+
+    def get_many(
+        self,
+        ids,  # type: Iterable[Text]
+        fields=None,  # type: Optional[Union[FieldSet, Text, Iterable]]
+        access_token=None,  # type: Optional[Text]
+        graph_version=None,  # type: Optional[Text]
+        max_workers=None,  # type: Optional[int]
+    ):
+        # type: (...) -> Dict[Text, Union[Dict, Exception]]
+        """ Look up objects by id with the `ids` param, in chunks of ids sent together in concurrent batches.
+
+        A chunk failing because one of its ids does not exist or cannot be loaded is requested again id by id,
+        the ids of a chunk failing for another reason, e.g. an unknown field, get its exception.
+
+        :param fields: the fields of the objects, their default fields if none is asked
+        :param max_workers: the maximum number of batches sent at the same time
+        :return: the object, or the exception, of every id
+        """
+        groups = self._get_many_groups(ids, fields)
+        if not groups:
+            return {}
+
+        results = {}  # type: Dict[Text, Union[Dict, Exception]]
+        batch_response = self.send_batch_request(
+            requests=self._get_many_requests(groups, access_token, graph_version),
+            access_token=access_token,
+            graph_version=graph_version,
+            chunked=True,
+            max_workers=max_workers,
+        )
+        failed_ids = self._collect_get_many_chunks(groups, batch_response, results)
+
+        if failed_ids:
+            batch_response = self.send_batch_request(
+                requests=self._get_many_fallback_requests(failed_ids, fields, access_token, graph_version),
+                access_token=access_token,
+                graph_version=graph_version,
+                chunked=True,
+                max_workers=max_workers,
+            )
+            self._collect_get_many_objects(failed_ids, batch_response, results)
+
+        return results
+
+    def paginate(
+        self,
+        endpoint,  # type: Text
+        access_token=None,  # type: Optional[Text]
+        params=None,  # type: Optional[Dict]
+        headers=None,  # type: Optional[Dict]
+        graph_version=None,  # type: Optional[Text]
+        max_pages=None,  # type: Optional[int]
+        max_items=None,  # type: Optional[int]
+        prefetch=False,  # type: bool
+        stream=False,  # type: bool
+    ):
+        # type: (...) -> Iterator[Dict]
+        """ Lazily yield the items of an edge across all its pages.
+
+        :param max_pages: the maximum number of pages to request
+        :param max_items: the maximum number of items to yield
+        :param prefetch: request the next page while the items of the current one are being processed
+        :param stream: decode the items of every page while it is being received instead of holding
+            whole pages in memory, `prefetch` does not apply
+        """
+        if stream:
+            request = self.request(
+                method=METHOD_GET,
+                access_token=access_token,
+                endpoint=endpoint,
+                params=params,
+                headers=headers,
+                graph_version=graph_version,
+            )
+            for item in self._iter_streamed_items(request, max_pages=max_pages, max_items=max_items):
+                yield item
+            return
+
+        response = self.get(
+            endpoint=endpoint,
+            access_token=access_token,
             params=params,
             headers=headers,
             graph_version=graph_version,
         )
 
+        for item in response.iter_items(
+            client=self.client,
+            max_pages=max_pages,
+            max_items=max_items,
+            prefetch=prefetch,
+        ):
+            yield item
+
+    def _iter_streamed_items(self, request, max_pages=None, max_items=None):
+        # type: (Optional[FacebookRequest], Optional[int], Optional[int]) -> Iterator[Dict]
+        pages = 0
+        count = 0
+
+        while request is not None:
+            response = self.client.send_streamed_request(request)
+            pages += 1
+            page_count = 0
+
+            items = response.iter_data()
+            for item in items:
+                count += 1
+                page_count += 1
+                yield item
+
+                if max_items is not None and count >= max_items:
+                    items.close()
+                    return
+
+            if not page_count or (max_pages is not None and pages >= max_pages):
+                return
+
+            request = response.next_page_request()
+
     def delete(
         self,
         endpoint,  # type: Text
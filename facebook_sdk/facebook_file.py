@@ -1,28 +1,143 @@
 import mimetypes
+import mmap
 import os
 
+import six
 from typing import (  # noqa: F401
+    IO,
+    Iterator,
     Optional,
     Text,
+    Union,
 )
 
 from facebook_sdk.exceptions import FacebookSDKException
 
 
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
 class FacebookFile(object):
-    def __init__(self, path):
-        # tpye: (Text) -> None
+    """ A file to upload, read lazily from disk.
+
+    It can be read as a whole or streamed by chunks, a file descriptor is only kept open while
+    it is being read in parts. `offset` and `max_length` restrict it to a part of the file.
+
+    :param path: the path of the file
+    :param max_length: the maximum number of bytes of the part, up to the end of the file by default
+    :param offset: the position of the part in the file
+    :param chunk_size: the size of the chunks yielded when iterating over the file
+    :param use_mmap: iterate over memoryview slices of the memory mapped file instead of reading
+        copies of its chunks, so they are written to the socket without intermediate copies
+    """
+
+    def __init__(self, path, max_length=None, offset=0, chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=False):
+        # type: (Text, Optional[int], int, int, bool) -> None
         super(FacebookFile, self).__init__()
         self.path = path
+        self.max_length = max_length
+        self.offset = offset
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
         if not os.path.exists(self.path):
             raise FacebookSDKException('File does not exist.')
 
-    def read(self):  # type: () -> bytes
-        """
-        Override read to open, read and close fd after reading.
+        self._fd = None  # type: Optional[IO[bytes]]
+
+    def open(self):  # type: () -> IO[bytes]
+        """ Open a new binary file object positioned at `offset`, it is up to the caller to close it."""
+        f = open(self.path, mode='rb')
+        if self.offset:
+            f.seek(self.offset)
+        return f
+
+    def read(self, size=-1):  # type: (int) -> bytes
+        """ Read up to `size` bytes from the current position, or everything left.
+
+        Reading everything left closes the fd and rewinds, so the file can be read again.
         """
+        if self._fd is None:
+            self._fd = self.open()
+
+        remaining = self.size - self.tell()
+        whole = size is None or size < 0
+        data = self._fd.read(max(0, remaining if whole else min(size, remaining)))
+        if whole:
+            self.close()
+
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):  # type: (int, int) -> int
+        if self._fd is None:
+            self._fd = self.open()
+
+        if whence == os.SEEK_SET:
+            self._fd.seek(self.offset + offset)
+        elif whence == os.SEEK_END:
+            self._fd.seek(self.offset + self.size + offset)
+        else:
+            self._fd.seek(offset, whence)
+
+        return self.tell()
+
+    def tell(self):  # type: () -> int
+        return self._fd.tell() - self.offset if self._fd is not None else 0
+
+    def close(self):  # type: () -> None
+        """ Close the fd opened by a partial read, the next read starts from the beginning."""
+        if self._fd is not None:
+            self._fd.close()
+            self._fd = None
+
+    def iter_chunks(self, chunk_size=None):  # type: (Optional[int]) -> Iterator[Union[bytes, memoryview]]
+        """ Yield the content of the file from the beginning, by chunks of `chunk_size` bytes."""
+        chunk_size = chunk_size or self.chunk_size
+        # Python 2 memoryviews do not support mmap, nor can an empty file be mapped.
+        if self.use_mmap and six.PY3 and self.size:
+            return self._iter_mapped_chunks(chunk_size)
+
+        return self._iter_read_chunks(chunk_size)
+
+    def _iter_mapped_chunks(self, chunk_size):  # type: (int) -> Iterator[memoryview]
         with open(self.path, mode='rb') as f:
-            return f.read()
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(mapped)
+        try:
+            for start in range(self.offset, self.offset + self.size, chunk_size):
+                yield view[start:min(start + chunk_size, self.offset + self.size)]
+        finally:
+            view.release()
+            try:
+                mapped.close()
+            except BufferError:
+                # Some chunks are still referenced, the map is closed once they are released.
+                pass
+
+    def _iter_read_chunks(self, chunk_size):  # type: (int) -> Iterator[bytes]
+        remaining = self.size
+        with self.open() as f:
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def __iter__(self):  # type: () -> Iterator[Union[bytes, memoryview]]
+        return self.iter_chunks()
+
+    def __len__(self):  # type: () -> int
+        return self.size
+
+    @property
+    def is_partial(self):  # type: () -> bool
+        return bool(self.offset) or self.max_length is not None
+
+    @property
+    def size(self):  # type: () -> int
+        size = max(0, os.path.getsize(self.path) - self.offset)
+        return size if self.max_length is None else min(size, self.max_length)
 
     @property
     def mime_type(self):  # type: () -> Optional[Text]
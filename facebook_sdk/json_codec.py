@@ -0,0 +1,103 @@
+import json
+
+from typing import (  # noqa: F401
+    Any,
+    Dict,
+    Optional,
+    Text,
+    Type,
+    Union,
+)
+
+from facebook_sdk.exceptions import FacebookSDKException
+from facebook_sdk.utils import smart_text
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+try:
+    import ujson  # type: ignore
+except ImportError:
+    ujson = None  # type: ignore
+
+CODEC_AUTO = 'auto'
+
+
+class JSONCodec(object):
+    """ Encode and decode JSON with the standard library json module."""
+
+    name = 'json'
+
+    def dumps(self, value):  # type: (Any) -> Text
+        return json.dumps(value)
+
+    def loads(self, value):  # type: (Union[Text, bytes]) -> Any
+        return json.loads(smart_text(value))
+
+
+class OrjsonCodec(JSONCodec):
+    """ Encode and decode JSON with orjson, it decodes bytes without decoding them to text first."""
+
+    name = 'orjson'
+
+    def __init__(self):  # type: () -> None
+        if orjson is None:
+            raise FacebookSDKException('orjson is required to use the OrjsonCodec.')
+
+    def dumps(self, value):  # type: (Any) -> Text
+        return orjson.dumps(value).decode('utf-8')
+
+    def loads(self, value):  # type: (Union[Text, bytes]) -> Any
+        return orjson.loads(value)
+
+
+class UjsonCodec(JSONCodec):
+    """ Encode and decode JSON with ujson."""
+
+    name = 'ujson'
+
+    def __init__(self):  # type: () -> None
+        if ujson is None:
+            raise FacebookSDKException('ujson is required to use the UjsonCodec.')
+
+    def dumps(self, value):  # type: (Any) -> Text
+        return ujson.dumps(value, ensure_ascii=False)
+
+    def loads(self, value):  # type: (Union[Text, bytes]) -> Any
+        return ujson.loads(value)
+
+
+CODECS = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+}  # type: Dict[Text, Type[JSONCodec]]
+
+DEFAULT_CODEC = JSONCodec()
+
+
+def get_codec(codec=None):  # type: (Optional[Union[Text, JSONCodec]]) -> JSONCodec
+    """ Resolve a codec from its name, 'auto' picks the fastest one installed.
+
+    :param codec: a JSONCodec, the name of a codec, 'auto' or None for the standard library json module
+    """
+    if codec is None:
+        return DEFAULT_CODEC
+
+    if isinstance(codec, JSONCodec):
+        return codec
+
+    if codec == CODEC_AUTO:
+        if orjson is not None:
+            return OrjsonCodec()
+        if ujson is not None:
+            return UjsonCodec()
+        return DEFAULT_CODEC
+
+    if codec not in CODECS:
+        raise FacebookSDKException('Unknown JSON codec "{codec}"'.format(codec=codec))
+
+    return CODECS[codec]()
@@ -0,0 +1,113 @@
+import uuid
+
+import six
+from typing import (  # noqa: F401
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Text,
+    Tuple,
+    Union,
+)
+
+from facebook_sdk.facebook_file import DEFAULT_CHUNK_SIZE
+
+
+if TYPE_CHECKING:
+    from facebook_sdk.facebook_file import FacebookFile  # noqa: F401
+
+CRLF = b'\r\n'
+
+
+def _to_bytes(value):  # type: (Any) -> bytes
+    if isinstance(value, six.binary_type):
+        return value
+    return six.text_type(value).encode('utf-8')
+
+
+def _is_iterable(value):  # type: (Any) -> bool
+    return hasattr(value, '__iter__') and not isinstance(value, (six.binary_type, six.text_type))
+
+
+def _quote(value):  # type: (Text) -> Text
+    return value.replace('\\', '\\\\').replace('"', '%22')
+
+
+class MultipartEncoder(object):
+    """ A multipart/form-data body streamed from its fields and files.
+
+    The files are read by chunks while the body is sent and its length is known beforehand, so the
+    whole body is never held in memory. It can be iterated over again, e.g. to retry the request.
+
+    :param fields: the form fields
+    :param files: the files to upload as (name, (file name, FacebookFile, mime type)) tuples
+    :param boundary: the boundary of the parts, a random one by default
+    :param chunk_size: the size of the chunks read from the files
+    """
+
+    def __init__(
+        self,
+        fields=None,  # type: Optional[Mapping[Text, Any]]
+        files=None,  # type: Optional[Sequence[Tuple[Text, Tuple[Text, FacebookFile, Optional[Text]]]]]
+        boundary=None,  # type: Optional[Text]
+        chunk_size=DEFAULT_CHUNK_SIZE,  # type: int
+    ):
+        # type: (...) -> None
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.parts = []  # type: List[Tuple[bytes, Union[bytes, FacebookFile]]]
+
+        for name, value in (fields or {}).items():
+            # Like requests, a list of values is sent as one part per value.
+            values = value if _is_iterable(value) else [value]
+            for item in values:
+                if item is None:
+                    continue
+                self.parts.append((self._part_headers(name), _to_bytes(item)))
+
+        for name, (file_name, _file, mime_type) in files or []:
+            self.parts.append((self._part_headers(name, file_name, mime_type), _file))
+
+    @property
+    def content_type(self):  # type: () -> Text
+        return 'multipart/form-data; boundary={boundary}'.format(boundary=self.boundary)
+
+    def _part_headers(self, name, file_name=None, mime_type=None):
+        # type: (Text, Optional[Text], Optional[Text]) -> bytes
+        disposition = 'form-data; name="{name}"'.format(name=_quote(name))
+        if file_name is not None:
+            disposition += '; filename="{file_name}"'.format(file_name=_quote(file_name))
+
+        headers = '--{boundary}\r\nContent-Disposition: {disposition}\r\n'.format(
+            boundary=self.boundary,
+            disposition=disposition,
+        )
+        if mime_type:
+            headers += 'Content-Type: {mime_type}\r\n'.format(mime_type=mime_type)
+
+        return _to_bytes(headers + '\r\n')
+
+    def _closing(self):  # type: () -> bytes
+        return _to_bytes('--{boundary}--\r\n'.format(boundary=self.boundary))
+
+    def __len__(self):  # type: () -> int
+        return sum(
+            len(headers) + len(payload) + len(CRLF)
+            for headers, payload in self.parts
+        ) + len(self._closing())
+
+    def __iter__(self):  # type: () -> Iterator[Union[bytes, memoryview]]
+        for headers, payload in self.parts:
+            yield headers
+            if isinstance(payload, six.binary_type):
+                yield payload
+            else:
+                for chunk in payload.iter_chunks(self.chunk_size):
+                    yield chunk
+            yield CRLF
+
+        yield self._closing()
@@ -0,0 +1,329 @@
+from collections import OrderedDict
+import re
+
+import six
+from typing import (  # noqa: F401
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    Union,
+)
+
+from facebook_sdk.constants import (
+    DEFAULT_GRAPH_VERSION,
+    METHOD_GET,
+)
+from facebook_sdk.exceptions import FacebookSDKException
+from facebook_sdk.request import FacebookRequest
+
+
+if TYPE_CHECKING:
+    from facebook_sdk.authentication import AccessToken  # noqa: F401
+    from facebook_sdk.facebook import FacebookApp  # noqa: F401
+
+MAX_IDS_BY_REQUEST = 50
+
+FIELD_NAME_RE = re.compile(r'\s*([^\s,{}.()]+)\s*')
+FIELD_MODIFIER_RE = re.compile(r'\.(\w+)\(([^)]*)\)\s*')
+
+
+class Field(object):
+    """ A field of a Graph object, with its modifiers, e.g. `limit`, and the fields it expands.
+
+    :param name: the name of the field
+    :param fields: the fields to expand, a FieldSet, a fields string or an iterable of fields
+    :param modifiers: the modifiers of the field, e.g. limit=10
+    """
+
+    def __init__(self, name, fields=None, **modifiers):
+        # type: (Text, Optional[Union[FieldSet, Text, Iterable]], Any) -> None
+        self.name = name
+        self.fields = FieldSet(fields)
+        self.modifiers = OrderedDict(
+            (key, six.text_type(value)) for key, value in sorted(modifiers.items())
+        )  # type: OrderedDict
+
+    def merge(self, other):  # type: (Field) -> None
+        """ Merge the expanded fields and the modifiers of the same field.
+
+        :raise FacebookSDKException: when both fields set the same modifier to different values
+        """
+        for key, value in other.modifiers.items():
+            if self.modifiers.get(key, value) != value:
+                raise FacebookSDKException('Conflicting values for "{name}.{key}": "{first}" and "{second}"'.format(
+                    name=self.name,
+                    key=key,
+                    first=self.modifiers[key],
+                    second=value,
+                ))
+            self.modifiers[key] = value
+
+        self.fields.add(other.fields)
+
+    def render(self):  # type: () -> Text
+        text = self.name
+        if self.fields:
+            text += '{' + self.fields.render() + '}'
+        for key, value in self.modifiers.items():
+            text += '.{key}({value})'.format(key=key, value=value)
+
+        return text
+
+    def _canonical(self):  # type: () -> Text
+        text = self.name
+        if self.fields:
+            text += '{' + self.fields._canonical() + '}'
+        for key, value in sorted(self.modifiers.items()):
+            text += '.{key}({value})'.format(key=key, value=value)
+
+        return text
+
+    def __eq__(self, other):  # type: (Any) -> bool
+        return isinstance(other, Field) and self._canonical() == other._canonical()
+
+    def __ne__(self, other):  # type: (Any) -> bool
+        return not self == other
+
+    def __repr__(self):  # type: () -> str
+        return 'Field({text!r})'.format(text=self.render())
+
+
+class FieldSet(object):
+    """ An ordered set of fields rendered to the `fields` param, merging the fields with the same name.
+
+        >>> FieldSet('id,posts{message}.limit(5)').add('name', Field('posts', fields='created_time')).render()
+        'id,posts{message,created_time}.limit(5),name'
+
+    :param fields: a FieldSet, a fields string or an iterable of fields and fields strings
+    """
+
+    def __init__(self, fields=None):  # type: (Optional[Union[FieldSet, Text, Iterable]]) -> None
+        self._fields = OrderedDict()  # type: OrderedDict
+        if fields:
+            self.add(fields)
+
+    @classmethod
+    def parse(cls, text):  # type: (Text) -> FieldSet
+        """ Parse a fields string, e.g. `id,posts{message,likes.summary(true)}.limit(5)`.
+
+        :raise FacebookSDKException: when the string is not valid
+        """
+        fields, position = _parse_fields(text, 0)
+        if position != len(text):
+            raise FacebookSDKException('Invalid fields "{text}" at position {position}'.format(
+                text=text,
+                position=position,
+            ))
+
+        return cls(fields)
+
+    def add(self, *fields):  # type: (Union[FieldSet, Field, Text, Iterable]) -> FieldSet
+        """ Add fields, a field already in the set is merged with the new one.
+
+        :return: the FieldSet itself
+        """
+        for field in fields:
+            if isinstance(field, Field):
+                if field.name in self._fields:
+                    self._fields[field.name].merge(field)
+                else:
+                    self._fields[field.name] = Field(field.name, fields=field.fields, **field.modifiers)
+            elif isinstance(field, FieldSet):
+                self.add(*field)
+            elif isinstance(field, six.string_types):
+                self.add(*FieldSet.parse(field))
+            else:
+                self.add(*field)
+
+        return self
+
+    def render(self):  # type: () -> Text
+        return ','.join(field.render() for field in self._fields.values())
+
+    def _canonical(self):  # type: () -> Text
+        """ The rendering of the fields in order, the same for the sets with the same fields."""
+        return ','.join(sorted(field._canonical() for field in self._fields.values()))
+
+    def __iter__(self):  # type: () -> Iterator[Field]
+        return iter(list(self._fields.values()))
+
+    def __contains__(self, name):  # type: (Text) -> bool
+        return name in self._fields
+
+    def __getitem__(self, name):  # type: (Text) -> Field
+        return self._fields[name]
+
+    def __len__(self):  # type: () -> int
+        return len(self._fields)
+
+    def __or__(self, other):  # type: (Union[FieldSet, Field, Text, Iterable]) -> FieldSet
+        return FieldSet(self).add(other)
+
+    def __eq__(self, other):  # type: (Any) -> bool
+        return isinstance(other, FieldSet) and self._canonical() == other._canonical()
+
+    def __ne__(self, other):  # type: (Any) -> bool
+        return not self == other
+
+    def __str__(self):  # type: () -> str
+        return str(self.render())
+
+    def __repr__(self):  # type: () -> str
+        return 'FieldSet({text!r})'.format(text=self.render())
+
+
+class GraphQuery(object):
+    """ Collect lookups of Graph objects by id and send as few requests as possible.
+
+    The fields asked for the same object are merged, and the objects asked with the same fields are
+    requested together with the `ids` param, up to `MAX_IDS_BY_REQUEST` objects by request.
+    """
+
+    def __init__(self):  # type: () -> None
+        self._lookups = OrderedDict()  # type: OrderedDict
+
+    def add(self, object_id, fields=None):
+        # type: (Text, Optional[Union[FieldSet, Field, Text, Iterable]]) -> GraphQuery
+        """ Look up an object, with fields merged into the ones already asked for it.
+
+        :param object_id: the id of the object
+        :param fields: the fields of the object, its default fields if none is asked
+        :return: the GraphQuery itself
+        """
+        object_id = six.text_type(object_id)
+        self._lookups.setdefault(object_id, FieldSet())
+        if fields:
+            self._lookups[object_id].add(fields)
+
+        return self
+
+    def fields(self, object_id):  # type: (Text) -> FieldSet
+        return self._lookups[six.text_type(object_id)]
+
+    def groups(self, max_ids=MAX_IDS_BY_REQUEST):  # type: (int) -> List[Tuple[List[Text], Text]]
+        """ The ids to request together and their rendered fields.
+
+        :param max_ids: the maximum number of ids of a group
+        """
+        groups = OrderedDict()  # type: OrderedDict
+        for object_id, fields in self._lookups.items():
+            groups.setdefault(fields._canonical(), (fields.render(), []))[1].append(object_id)
+
+        return [
+            (ids[start:start + max_ids], fields)
+            for fields, ids in groups.values()
+            for start in range(0, len(ids), max_ids)
+        ]
+
+    def requests(
+        self,
+        app=None,  # type: Optional[FacebookApp]
+        access_token=None,  # type: Optional[Union[Text, AccessToken]]
+        graph_version=None,  # type: Optional[Text]
+        max_ids=MAX_IDS_BY_REQUEST,  # type: int
+    ):
+        # type: (...) -> List[FacebookRequest]
+        """ The GET requests of the lookups, their responses are the objects by id."""
+        return [
+            ids_request(
+                ids=ids,
+                fields=fields,
+                app=app,
+                access_token=access_token,
+                graph_version=graph_version,
+            )
+            for ids, fields in self.groups(max_ids=max_ids)
+        ]
+
+    def __len__(self):  # type: () -> int
+        return len(self._lookups)
+
+
+def with_fields(params, fields):
+    # type: (Optional[Dict], Optional[Union[FieldSet, Field, Text, Iterable]]) -> Optional[Dict]
+    """ A copy of the params whose `fields` param also asks for `fields`."""
+    if not fields:
+        return params
+
+    params = dict(params or {})
+    params['fields'] = FieldSet(params.get('fields')).add(fields).render()
+    return params
+
+
+def ids_request(
+    ids,  # type: Iterable[Text]
+    fields=None,  # type: Optional[Union[FieldSet, Text]]
+    app=None,  # type: Optional[FacebookApp]
+    access_token=None,  # type: Optional[Union[Text, AccessToken]]
+    graph_version=None,  # type: Optional[Text]
+):
+    # type: (...) -> FacebookRequest
+    """ A request looking up several objects at once, its response is a dict of the objects by id."""
+    params = {'ids': ','.join(six.text_type(object_id) for object_id in ids)}
+    if fields:
+        params['fields'] = six.text_type(fields)
+
+    return FacebookRequest(
+        app=app,
+        access_token=access_token,
+        method=METHOD_GET,
+        endpoint='/',
+        params=params,
+        graph_version=graph_version or DEFAULT_GRAPH_VERSION,
+    )
+
+
+def _parse_fields(text, position):  # type: (Text, int) -> Tuple[List[Field], int]
+    """ Parse a comma separated list of fields up to the end of the text or to a closing brace."""
+    fields = []  # type: List[Field]
+    position = _skip_whitespaces(text, position)
+    if position == len(text) or text[position] == '}':
+        return fields, position
+
+    while True:
+        match = FIELD_NAME_RE.match(text, position)
+        if match is None:
+            raise FacebookSDKException('Invalid fields "{text}" at position {position}'.format(
+                text=text,
+                position=position,
+            ))
+
+        field = Field(match.group(1))
+        position = match.end()
+
+        while position < len(text) and text[position] in '.{':
+            if text[position] == '{':
+                subfields, position = _parse_fields(text, position + 1)
+                if not text.startswith('}', position):
+                    raise FacebookSDKException('Missing "}}" in fields "{text}"'.format(text=text))
+                field.fields.add(*subfields)
+                position = _skip_whitespaces(text, position + 1)
+            else:
+                modifier = FIELD_MODIFIER_RE.match(text, position)
+                if modifier is None:
+                    raise FacebookSDKException('Invalid modifier in fields "{text}" at position {position}'.format(
+                        text=text,
+                        position=position,
+                    ))
+                field.modifiers[modifier.group(1)] = modifier.group(2)
+                position = modifier.end()
+
+        fields.append(field)
+
+        if position < len(text) and text[position] == ',':
+            position += 1
+            continue
+
+        return fields, position
+
+
+def _skip_whitespaces(text, position):  # type: (Text, int) -> int
+    while position < len(text) and text[position].isspace():
+        position += 1
+    return position
@@ -1,14 +1,18 @@
-import json
+import re
 import uuid
 
+import six
 from six.moves.urllib.parse import urlencode
 from typing import (  # noqa: F401
     TYPE_CHECKING,
+    Any,
+    Callable,
     Dict,
     Iterable,
     List,
     Mapping,
     Optional,
+    Set,
     Text,
     Tuple,
     Union,
@@ -20,20 +24,23 @@ from facebook_sdk.constants import (
 )
 from facebook_sdk.exceptions import FacebookSDKException
 from facebook_sdk.facebook_file import FacebookFile
+from facebook_sdk.json_codec import get_codec
 from facebook_sdk.utils import (
     convert_params_to_utf8,
     force_slash_prefix,
-    get_params_from_url,
-    remove_params_from_url,
+    split_endpoint_access_token,
 )
 
 
 MAX_REQUEST_BY_BATCH = 50
+# A JSONPath reference to the result of another request of the batch, e.g. {result=friends:$.data.*.id}.
+RESULT_REFERENCE_PATTERN = re.compile(r'{result=([^:}]+):')
 
 if TYPE_CHECKING:
     from mypy_extensions import TypedDict
     from facebook_sdk.facebook import FacebookApp  # noqa: F401
     from facebook_sdk.authentication import AccessToken  # noqa: F401
+    from facebook_sdk.json_codec import JSONCodec  # noqa: F401
     RequestRecord = TypedDict('RequestRecord', {
         'name': Text,
         'request': 'FacebookRequest',
@@ -46,6 +53,11 @@ class FacebookRequest(object):
 
     """
 
+    __slots__ = (
+        '_app', '_access_token', '_method', '_endpoint', '_graph_version', 'headers', '_params', 'timeout', 'files',
+        '_memo',
+    )
+
     def __init__(
         self,
         app=None,  # type: Optional[FacebookApp]
@@ -61,6 +73,8 @@ class FacebookRequest(object):
 
         super(FacebookRequest, self).__init__()
 
+        self._memo = None  # type: Optional[Dict[Text, Any]]
+
         # Default empty dicts for dict params.
         headers = headers or {}
         params = params or {}
@@ -81,9 +95,8 @@ class FacebookRequest(object):
 
     @endpoint.setter
     def endpoint(self, value):  # type: (Text) -> None
-        params = get_params_from_url(value)
-        if 'access_token' in params:
-            access_token = ''.join(params['access_token'])  # type: Text
+        endpoint, access_token = split_endpoint_access_token(value)
+        if access_token is not None:
             if not self.access_token:
                 self.access_token = access_token
             elif self.access_token != access_token:
@@ -92,7 +105,17 @@ class FacebookRequest(object):
                     'and the one provided in the URL or POST params do not match.'
                 )
 
-        self._endpoint = remove_params_from_url(value, params_to_remove=['access_token', 'appsecret_proof'])
+        self._endpoint = endpoint
+        self._invalidate()
+
+    @property
+    def app(self):  # type: () -> Optional[FacebookApp]
+        return self._app
+
+    @app.setter
+    def app(self, value):  # type: (Optional[FacebookApp]) -> None
+        self._app = value
+        self._invalidate()
 
     @property
     def access_token(self):  # type: () -> Optional[Text]
@@ -104,6 +127,25 @@ class FacebookRequest(object):
             self._access_token = str(value)
         else:
             self._access_token = None
+        self._invalidate()
+
+    @property
+    def method(self):  # type: () -> Optional[Text]
+        return self._method
+
+    @method.setter
+    def method(self, value):  # type: (Optional[Text]) -> None
+        self._method = value
+        self._invalidate()
+
+    @property
+    def graph_version(self):  # type: () -> Text
+        return self._graph_version
+
+    @graph_version.setter
+    def graph_version(self, value):  # type: (Text) -> None
+        self._graph_version = value
+        self._invalidate()
 
     @property
     def params(self):  # type: () -> Dict
@@ -111,11 +153,7 @@ class FacebookRequest(object):
 
         :rtype: dict
         """
-        params = self._params.copy() if self.method != METHOD_POST else {}
-        if self.access_token:
-            params.update(dict(access_token=self.access_token))
-
-        return params
+        return self._memoize('params', self._build_params).copy()
 
     @params.setter
     def params(self, value):  # type: (Dict) -> None
@@ -128,6 +166,15 @@ class FacebookRequest(object):
         self._extract_files_from_params(value)
         self._params = getattr(self, '_params', {})
         self._params.update(value)
+        self._invalidate()
+
+    @property
+    def appsecret_proof(self):  # type: () -> Optional[Text]
+        """ The proof of the access token, when the app of the request enables it."""
+        if self.access_token and self.app is not None and self.app.enable_appsecret_proof:
+            return self.app.appsecret_proof(self.access_token)
+
+        return None
 
     @property
     def post_params(self):  # type: () -> Optional[Dict]
@@ -146,7 +193,7 @@ class FacebookRequest(object):
 
         :rtype: str
         """
-        return force_slash_prefix(self.graph_version) + force_slash_prefix(self.endpoint)
+        return self._memoize('url', self._build_url)
 
     @property
     def batch_url(self):  # type: () -> Text
@@ -154,29 +201,60 @@ class FacebookRequest(object):
 
         :rtype: str
         """
-        params = self.params
+        return self._memoize('batch_url', self._build_batch_url)
+
+    @property
+    def url_encode_body(self):  # type: () -> Optional[Text]
+        """ Convert the post params to a urlencoded str
+
+        :rtype: str
+        """
+        return self._memoize('url_encode_body', self._build_url_encode_body)
+
+    def _memoize(self, name, build):  # type: (Text, Callable[[], Any]) -> Any
+        """ Return the derived value `name`, built once until the request is modified."""
+        memo = self._memo
+        if memo is None:
+            memo = self._memo = {}
+        if name not in memo:
+            memo[name] = build()
+        return memo[name]
+
+    def _invalidate(self):  # type: () -> None
+        """ Forget the derived values, a shallow copy of the request may share the previous ones."""
+        self._memo = None
+
+    def _build_params(self):  # type: () -> Dict
+        params = self._params.copy() if self.method != METHOD_POST else {}
+        if self.access_token:
+            params['access_token'] = self.access_token
+
+            appsecret_proof = self.appsecret_proof
+            if appsecret_proof:
+                params['appsecret_proof'] = appsecret_proof
+
+        return params
+
+    def _build_url(self):  # type: () -> Text
+        return force_slash_prefix(self.graph_version) + force_slash_prefix(self.endpoint)
+
+    def _build_batch_url(self):  # type: () -> Text
+        params = self._memoize('params', self._build_params)
         url = self.url
 
         if self.method != METHOD_POST and params:
             return '{url}?{encoded_params}'.format(
                 url=url,
-                encoded_params=urlencode(convert_params_to_utf8(self.params))
+                encoded_params=urlencode(convert_params_to_utf8(params))
             )
 
         return url
 
-    @property
-    def url_encode_body(self):  # type: () -> Optional[Text]
-        """ Convert the post params to a urlencoded str
-
-        :rtype: str
-        """
-        params = self.post_params
-
-        if not params:
+    def _build_url_encode_body(self):  # type: () -> Optional[Text]
+        if self.method != METHOD_POST or not self._params:
             return None
 
-        return urlencode(convert_params_to_utf8(params))
+        return urlencode(convert_params_to_utf8(self._params))
 
     def add_headers(self, headers):  # type: (Iterable[Dict]) -> None
         """ Append headers to the request.
@@ -207,6 +285,8 @@ class FacebookBatchRequest(FacebookRequest):
 
     """
 
+    __slots__ = ('requests',)
+
     def __init__(
         self,
         app=None,  # type: Optional[FacebookApp]
@@ -259,6 +339,8 @@ class FacebookBatchRequest(FacebookRequest):
             raise FacebookSDKException('Arguments must be of type dict, list or FacebookRequest.')
 
         self._add_access_token(request)
+        if request.app is None:
+            request.app = self.app
 
         request_to_add = {
             'name': str(name),
@@ -285,12 +367,16 @@ class FacebookBatchRequest(FacebookRequest):
 
             request.access_token = self.access_token
 
-    def prepare_batch_request(self):  # type: () -> None
+    def prepare_batch_request(self, json_codec=None):  # type: (Optional[JSONCodec]) -> None
+        """
+        :param json_codec: the JSONCodec encoding the requests, the standard library json module by default
+        """
         params = {
-            'batch': self.requests_to_json_str(),
+            'batch': self.requests_to_json_str(json_codec),
             'include_headers': True,
         }
         self._params.update(params)
+        self._invalidate()
 
     def request_entity_to_batch_array(self, request, request_name, attached_files):
         # type: (FacebookRequest, Text, Optional[Text]) -> Dict
@@ -317,12 +403,17 @@ class FacebookBatchRequest(FacebookRequest):
         if request.access_token != self.access_token:
             batch['access_token'] = request.access_token
 
+            # The url params of a POST entry are dropped, so its proof is sent along with its body.
+            appsecret_proof = request.appsecret_proof
+            if appsecret_proof and request.method == METHOD_POST:
+                batch['body'] = '&'.join(filter(None, [encoded_body, urlencode({'appsecret_proof': appsecret_proof})]))
+
         if attached_files:
             batch['attached_files'] = attached_files
 
         return batch
 
-    def requests_to_json_str(self):  # type: () -> Text
+    def requests_to_json_str(self, json_codec=None):  # type: (Optional[JSONCodec]) -> Text
         """ Convert the requests to json."""
         json_requests = [
             self.request_entity_to_batch_array(
@@ -332,7 +423,7 @@ class FacebookBatchRequest(FacebookRequest):
             ) for request in self.requests
         ]
 
-        return json.dumps(json_requests)
+        return get_codec(json_codec).dumps(json_requests)
 
     def validate_batch_request_count(self):  # type: () -> None
         """ Validate the request count before sending them as a batch.
@@ -346,6 +437,62 @@ class FacebookBatchRequest(FacebookRequest):
         if requests_count > MAX_REQUEST_BY_BATCH:
             raise FacebookSDKException('The limit of requests in batch is %d' % MAX_REQUEST_BY_BATCH)
 
+    def split(self, size=MAX_REQUEST_BY_BATCH):  # type: (int) -> List[FacebookBatchRequest]
+        """ Split the requests in batches of at most `size` requests, keeping their names and order.
+
+        Graph only resolves the {result=name:...} references within a batch, so a request cannot refer
+        to the result of a request sent in another chunk.
+
+        :param size: the maximum number of requests of every batch
+        :return: a list of FacebookBatchRequest
+        """
+        chunks = [
+            self.subset(range(start, min(start + size, len(self.requests))))
+            for start in range(0, len(self.requests), size)
+        ]
+
+        names = set(request['name'] for request in self.requests)
+        for chunk in chunks:
+            chunk_names = set(request['name'] for request in chunk.requests)
+            for request in chunk.requests:
+                for name in self._result_references(request['request']):
+                    if name in names and name not in chunk_names:
+                        raise FacebookSDKException(
+                            'The request "%s" refers to the result of "%s", they cannot be sent in '
+                            'different chunks of the batch.' % (request['name'], name)
+                        )
+
+        return chunks
+
+    @staticmethod
+    def _result_references(request):  # type: (FacebookRequest) -> Set[Text]
+        """ The names of the requests whose result `request` refers to."""
+        texts = [request.endpoint]
+        texts.extend(value for value in request._params.values() if isinstance(value, six.string_types))
+        return set(name for text in texts for name in RESULT_REFERENCE_PATTERN.findall(text))
+
+    def subset(self, indexes):  # type: (Iterable[int]) -> FacebookBatchRequest
+        """ Build a batch request with some of the requests, keeping their names and attached files.
+
+        :param indexes: the positions of the requests to keep
+        :return: a FacebookBatchRequest
+        """
+        batch_request = FacebookBatchRequest(
+            app=self.app,
+            access_token=self.access_token,
+            graph_version=self.graph_version,
+            timeout=self.timeout,
+        )
+        batch_request.headers = self.headers.copy()
+
+        for index in indexes:
+            request = self.requests[index]
+            batch_request.requests.append(request)
+            for file_name in filter(None, request.get('attached_files', '').split(',')):
+                batch_request.files[file_name] = self.files[file_name]
+
+        return batch_request
+
     def extract_file_attachments(self, request):  # type: (FacebookRequest) -> Text
         """ Remove files from the request and return file names removed."""
         file_names = []
@@ -1,11 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
-import json
-
+import six
 from typing import (  # noqa: F401
     TYPE_CHECKING,
+    Any,
     Dict,
+    Generator,
     Generic,
     Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
@@ -21,14 +24,19 @@ from facebook_sdk.exceptions import (
     FacebookResponseException,
     FacebookSDKException,
 )
+from facebook_sdk.json_codec import (  # noqa: F401
+    JSONCodec,
+    get_codec,
+)
 from facebook_sdk.request import (  # noqa: F401
     FacebookBatchRequest,
     FacebookRequest,
 )
-from facebook_sdk.utils import (
-    base_graph_url_endpoint,
-    smart_text,
+from facebook_sdk.streaming import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    JSONStreamDecoder,
 )
+from facebook_sdk.utils import base_graph_url_endpoint
 
 
 if TYPE_CHECKING:
@@ -40,14 +48,21 @@ if TYPE_CHECKING:
 
 T = TypeVar('T', bound=FacebookRequest)
 
+ERROR_KEY_MARKER = u'"error"'
+# Graph answers null for the entries of a batch it did not run, they fail with a temporary server error.
+NOT_RUN_BATCH_ENTRY_BODY = u'{"error": {"code": 2, "message": "The request was not run by the batch."}}'
+
 
 class BaseResponse(Generic[T]):
+    __slots__ = ('request',)
 
     def __init__(self, request):  # type (T) -> None
         self.request = request
 
 
 class ResponsePaginationMixin(object):
+    __slots__ = ()
+
     def next_page_request(self):  # type: () -> Optional[FacebookRequest]
         """ Return a FacebookRequest for the next page of the current Response
 
@@ -62,6 +77,58 @@ class ResponsePaginationMixin(object):
         """
         return self._build_pagination_request('previous')
 
+    def iter_pages(self, client, max_pages=None, prefetch=False):
+        # type: (Any, Optional[int], bool) -> Iterator[FacebookResponse]
+        """ Yield the current Response and then every following page, lazily.
+
+        :param client: the FacebookClient used to request the next pages
+        :param max_pages: the maximum number of pages to yield, including the current one
+        :param prefetch: request the next page while the current one is being processed
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        page = self  # type: Any
+        count = 0
+
+        try:
+            while True:
+                count += 1
+                next_request = None
+                if page.json_body.get('data') and (max_pages is None or count < max_pages):
+                    next_request = page.next_page_request()
+
+                future = None
+                if executor and next_request:
+                    future = executor.submit(client.send_request, next_request)
+
+                yield page
+
+                if next_request is None:
+                    return
+
+                page = future.result() if future else client.send_request(next_request)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def iter_items(self, client, max_pages=None, max_items=None, prefetch=False):
+        # type: (Any, Optional[int], Optional[int], bool) -> Iterator[Dict]
+        """ Yield the items of the `data` list of the current Response and of every following page, lazily.
+
+        :param client: the FacebookClient used to request the next pages
+        :param max_pages: the maximum number of pages to walk, including the current one
+        :param max_items: the maximum number of items to yield
+        :param prefetch: request the next page while the items of the current one are being processed
+        """
+        count = 0
+
+        for page in self.iter_pages(client=client, max_pages=max_pages, prefetch=prefetch):
+            for item in page.json_body.get('data', []):
+                count += 1
+                yield item
+
+                if max_items is not None and count >= max_items:
+                    return
+
     def _build_pagination_request(self, direction):  # type: (Text) -> Optional[FacebookRequest]
         if self.request.method != METHOD_GET:  # type: ignore
             raise FacebookSDKException('You can only paginate on a GET request.', 720)
@@ -81,87 +148,345 @@ class FacebookResponse(ResponsePaginationMixin, BaseResponse[FacebookRequest]):
 
     """
 
+    __slots__ = ('body', 'http_status_code', 'headers', 'json_codec', 'keep_body', '_json_body', '_exception')
+
     def __init__(
         self,
         request,  # type: FacebookRequest
-        http_status_code,  # type: int
-        body,  # type: Text
+        http_status_code,  # type: Optional[int]
+        body,  # type: Optional[Text]
         headers=None,  # type: Optional[Dict[Text, Text]]
+        json_codec=None,  # type: Optional[JSONCodec]
+        keep_body=True,  # type: bool
     ):
         # type: (...) -> None
+        """
+        :param json_codec: the JSONCodec decoding the body, the standard library json module by default
+        :param keep_body: keep the raw body once it is parsed, otherwise only json_body is kept
+        """
         super(FacebookResponse, self).__init__(request)
         self.body = body
         self.http_status_code = http_status_code
         self.headers = headers
+        self.json_codec = get_codec(json_codec)
+        self.keep_body = keep_body
 
-        self._parse_body()
+        self._json_body = None  # type: Optional[Any]
+        self._exception = None  # type: Optional[Exception]
 
-        if self.is_error:
-            self._build_exception()
+    @property
+    def json_body(self):  # type: () -> Any
+        """ The parsed body, it is only parsed on first access."""
+        if self._json_body is None:
+            self._json_body = self._parse_body()
+            if not self.keep_body and self._json_body is not None:
+                self.body = None
+        return self._json_body
+
+    @json_body.setter
+    def json_body(self, value):  # type: (Any) -> None
+        self._json_body = value
 
     @property
     def is_error(self):  # type: () -> bool
-        """ Check if the response is an error."""
+        """ Check if the response is an error.
+
+        A body that does not contain the "error" key cannot be an error, so it is not parsed.
+        """
+        if self._json_body is None and not self._may_be_error():
+            return False
+
         return 'error' in self.json_body
 
-    def _parse_body(self):  # type: () -> None
+    @property
+    def exception(self):  # type: () -> Optional[Exception]
+        """ The FacebookResponseException of an error response, built on first access.
+
+        The entries of a chunk of a batch that could not be sent carry the exception raised sending it instead.
+        """
+        if self._exception is None and self.is_error:
+            self._exception = FacebookResponseException.create(response=self)
+        return self._exception
+
+    def _may_be_error(self):  # type: () -> bool
+        if isinstance(self.body, six.binary_type):
+            return ERROR_KEY_MARKER.encode('utf-8') in self.body
+        if isinstance(self.body, six.text_type):
+            return ERROR_KEY_MARKER in self.body
+        return self.body is not None
+
+    def _parse_body(self):  # type: () -> Any
         """ Parse the raw response to json."""
+        if self.body is None:
+            return {}
+
         try:
-            self.json_body = json.loads(smart_text(self.body))  # type: Dict
+            return self.json_codec.loads(self.body)
         except Exception:
-            self.json_body = {}
+            return {}
 
     def raiseException(self):  # type: () -> None
-        """ Raise the FacebookSDKException."""
-        raise self.exception
+        """ Raise the FacebookSDKException of an error response."""
+        exception = self.exception
+        if exception is not None:
+            raise exception
+
+
+class FacebookStreamResponse(FacebookResponse):
+    """ A Facebook Response whose `data` items are decoded while the body is being received.
+
+    The other members of the body, e.g. `paging`, are in `json_body` once every item was consumed.
+    """
+
+    __slots__ = ('raw', 'chunk_size', '_consumed')
+
+    def __init__(
+        self,
+        request,  # type: FacebookRequest
+        http_status_code,  # type: int
+        raw,  # type: Any
+        headers=None,  # type: Optional[Dict[Text, Text]]
+        chunk_size=DEFAULT_STREAM_CHUNK_SIZE,  # type: int
+    ):
+        # type: (...) -> None
+        """
+        :param raw: the requests.Response whose content was not read yet
+        :param chunk_size: the size of the chunks read from the connection
+        """
+        super(FacebookStreamResponse, self).__init__(
+            request=request,
+            http_status_code=http_status_code,
+            body=None,  # type: ignore
+            headers=headers,
+        )
+        self.raw = raw
+        self.chunk_size = chunk_size
+        self.json_body = {}
+        self._consumed = False
+
+    def iter_data(self):  # type: () -> Generator[Dict, None, None]
+        """ Yield the items of the `data` list as they are received, the body can only be read once."""
+        if self._consumed:
+            raise FacebookSDKException('The streamed response body was already consumed.')
+        self._consumed = True
+
+        decoder = JSONStreamDecoder(self.raw.iter_content(chunk_size=self.chunk_size))
+        try:
+            for item in decoder:
+                yield item
+        finally:
+            self.close()
 
-    def _build_exception(self):  # type: () -> None
-        self.exception = FacebookResponseException.create(response=self)   # type: FacebookResponseException
+        self.json_body = decoder.members
+
+    def close(self):  # type: () -> None
+        """ Release the connection, the items that were not read yet are dropped."""
+        self.raw.close()
 
 
 class FacebookBatchResponse(FacebookResponse, BaseResponse[FacebookBatchRequest]):
     """ A Facebook Batch Response"""
 
+    __slots__ = ('responses',)
+
     def __init__(self, batch_request, batch_response):
         # type: (FacebookBatchRequest, FacebookResponse) -> None
         super(FacebookBatchResponse, self).__init__(
             request=batch_request,
             body=batch_response.body,
             http_status_code=batch_response.http_status_code,
-            headers=batch_response.headers
+            headers=batch_response.headers,
+            json_codec=batch_response.json_codec,
+            keep_body=batch_response.keep_body,
+        )
+        # Reuse the body parsed by the wrapped response, if any.
+        self._json_body = batch_response._json_body
+
+        self.responses = self.build_responses(self.json_body)
+
+    @classmethod
+    def merge(cls, batch_request, batch_responses):
+        # type: (FacebookBatchRequest, Iterable[FacebookBatchResponse]) -> FacebookBatchResponse
+        """ Stitch the responses of the chunks of a split batch request into a single response.
+
+        :param batch_request: the FacebookBatchRequest that was split
+        :param batch_responses: the FacebookBatchResponse of every chunk, in order
+        """
+        batch_responses = list(batch_responses)
+        body = []  # type: List[Dict]
+        for batch_response in batch_responses:
+            body.extend(batch_response.json_body)
+
+        json_codec = batch_responses[0].json_codec
+        keep_body = batch_responses[0].keep_body
+        merged_response = FacebookResponse(
+            request=batch_request,
+            body=json_codec.dumps(body) if keep_body else None,  # type: ignore
+            http_status_code=batch_responses[0].http_status_code,
+            headers=batch_responses[0].headers,
+            json_codec=json_codec,
+            keep_body=keep_body,
         )
+        merged_response.json_body = body
+
+        merged = cls(batch_request=batch_request, batch_response=merged_response)
+
+        # Keep the records already built, e.g. the entries resent after a failure.
+        offset = 0
+        for batch_response in batch_responses:
+            for index, record in batch_response.responses.built_records():
+                merged.responses[offset + index] = record
+            offset += len(batch_response.responses)
+
+        return merged
+
+    @classmethod
+    def failed(cls, batch_request, exception):
+        # type: (FacebookBatchRequest, Exception) -> FacebookBatchResponse
+        """ The response of a batch that could not be sent, every entry fails with `exception`.
+
+        Graph may have run some of the entries, e.g. when the connection was lost while waiting for the response.
 
-        self.responses = self.build_responses(self.json_body)  # type: List[ResponseRecord]
+        :param batch_request: the FacebookBatchRequest that failed
+        :param exception: the exception raised sending it
+        """
+        response = FacebookResponse(request=batch_request, body=None, http_status_code=None)
+        response.json_body = [None] * len(batch_request.requests)
+        failed = cls(batch_request=batch_request, batch_response=response)
+
+        for index, request_record in enumerate(batch_request.requests):
+            entry_response = FacebookResponse(request=request_record['request'], body=None, http_status_code=None)
+            entry_response.json_body = {'error': {'message': six.text_type(exception)}}
+            entry_response._exception = exception
+            failed.responses[index] = {'name': request_record['name'], 'response': entry_response}
+
+        return failed
 
-    def build_responses(self, json_body):  # type: (Dict) -> List[ResponseRecord]
-        """ Parse the json_body to a set of FacebookResponse.
+    def build_responses(self, json_body):  # type: (List[Optional[Dict]]) -> BatchResponseRecords
+        """ Wrap the entries of the parsed batch response, their FacebookResponse are built on access.
 
         :param json_body: parsed batch response
         """
-        responses = []  # type: List[ResponseRecord]
-
-        for index, response in enumerate(json_body):
-            request_name = self.request.requests[index]['name']
-            request = self.request.requests[index]['request']
-
-            body = response.get('body')
-            code = response.get('code')
-            headers = response.get('headers')
-
-            responses.insert(
-                index,
-                {
-                    'name': request_name,
-                    'response': FacebookResponse(
-                        request=request,
-                        body=body,
-                        headers=headers,
-                        http_status_code=code,
-                    ),
-                }
+        return BatchResponseRecords(batch_response=self, entries=json_body)
+
+    def iter_statuses(self):  # type: () -> Iterator[Tuple[Text, Optional[int]]]
+        """ Yield the name and the http status code of every entry, without building their responses."""
+        return self.responses.iter_statuses()
+
+    def failed_indexes(self, exception_classes=None):
+        # type: (Optional[Tuple[type, ...]]) -> List[int]
+        """ The positions of the entries that failed.
+
+        :param exception_classes: only keep the entries whose exception is an instance of these classes
+        """
+        return [
+            index for index in range(len(self.responses))
+            if self.responses.may_be_error(index) and self.responses[index]['response'].is_error and (
+                exception_classes is None or isinstance(self.responses[index]['response'].exception, exception_classes)
             )
+        ]
+
+    def failed_batch_request(self, exception_classes=None):
+        # type: (Optional[Tuple[type, ...]]) -> Optional[FacebookBatchRequest]
+        """ Build a FacebookBatchRequest resending only the failed entries, with the same names.
+
+        :param exception_classes: only resend the entries whose exception is an instance of these classes
+        :return: a FacebookBatchRequest or None if no entry failed
+        """
+        indexes = self.failed_indexes(exception_classes)
+        if not indexes:
+            return None
+
+        return self.request.subset(indexes)
 
-        return responses
+    def update(self, batch_response):  # type: (FacebookBatchResponse) -> None
+        """ Replace in place the entries resent through `batch_response`.
+
+        :param batch_response: the response to a subset of the batch request, see FacebookBatchRequest.subset
+        """
+        indexes = dict((id(request), index) for index, request in enumerate(self.request.requests))
+        for request, record in zip(batch_response.request.requests, batch_response.responses):
+            self.responses[indexes[id(request)]] = record
 
     def __iter__(self):  # type: () -> Iterable[ResponseRecord]
         return iter(self.responses)
+
+
+class BatchResponseRecords(object):
+    """ The records of the entries of a batch response, a list of {'name': ..., 'response': ...} dicts.
+
+    An entry is kept as parsed from the batch body until its record is accessed, so the names and the
+    status codes can be read without building a FacebookResponse or decoding the body of any entry.
+    """
+
+    __slots__ = ('batch_response', '_entries', '_records')
+
+    def __init__(self, batch_response, entries):
+        # type: (FacebookBatchResponse, List[Optional[Dict]]) -> None
+        self.batch_response = batch_response
+        self._entries = entries
+        self._records = [None] * len(entries)  # type: List[Optional[ResponseRecord]]
+
+    def name(self, index):  # type: (int) -> Text
+        record = self._records[index]
+        if record is not None:
+            return record['name']
+        return self.batch_response.request.requests[index]['name']
+
+    def status_code(self, index):  # type: (int) -> Optional[int]
+        record = self._records[index]
+        if record is not None:
+            return record['response'].http_status_code
+        return (self._entries[index] or {}).get('code')
+
+    def iter_statuses(self):  # type: () -> Iterator[Tuple[Text, Optional[int]]]
+        for index in range(len(self)):
+            yield self.name(index), self.status_code(index)
+
+    def may_be_error(self, index):  # type: (int) -> bool
+        """ Whether the entry can be an error, without building its record if it was not built yet."""
+        record = self._records[index]
+        if record is not None:
+            return record['response'].is_error
+
+        body = (self._entries[index] or {}).get('body')
+        return not isinstance(body, six.string_types) or ERROR_KEY_MARKER in body
+
+    def built_records(self):  # type: () -> List[Tuple[int, ResponseRecord]]
+        return [(index, record) for index, record in enumerate(self._records) if record is not None]
+
+    def _build_record(self, index):  # type: (int) -> ResponseRecord
+        # An entry is null when Graph did not run its request, e.g. when a request it depends on failed.
+        entry = self._entries[index] or {'body': NOT_RUN_BATCH_ENTRY_BODY}
+        request_record = self.batch_response.request.requests[index]
+
+        return {
+            'name': request_record['name'],
+            'response': FacebookResponse(
+                request=request_record['request'],
+                body=entry.get('body'),
+                headers=entry.get('headers'),
+                http_status_code=entry.get('code'),
+                json_codec=self.batch_response.json_codec,
+                keep_body=self.batch_response.keep_body,
+            ),
+        }
+
+    def __getitem__(self, index):  # type: (Any) -> Any
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        record = self._records[index]
+        if record is None:
+            record = self._records[index] = self._build_record(index)
+        return record
+
+    def __setitem__(self, index, record):  # type: (int, ResponseRecord) -> None
+        self._records[index] = record
+
+    def __len__(self):  # type: () -> int
+        return len(self._entries)
+
+    def __iter__(self):  # type: () -> Iterator[ResponseRecord]
+        for index in range(len(self)):
+            yield self[index]
@@ -0,0 +1,223 @@
+import random
+import threading
+import time
+
+import requests
+from typing import (  # noqa: F401
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Text,
+    Tuple,
+    Type,
+)
+
+from facebook_sdk.cache import is_idempotent_read
+from facebook_sdk.exceptions import (
+    FacebookServerException,
+    FacebookThrottleException,
+)
+from facebook_sdk.request import (  # noqa: F401
+    FacebookBatchRequest,
+    FacebookRequest,
+)
+from facebook_sdk.throttling import (
+    BUSINESS_USE_CASE_USAGE_HEADER,
+    get_header,
+    iter_business_usage,
+    load_json_header,
+    parse_usage,
+)
+
+try:
+    import asyncio
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+RETRY_AFTER_HEADER = 'retry-after'
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_MAX_BACKOFF = 30
+
+# The transport failures of the AsyncFacebookClient, when aiohttp is installed.
+AIOHTTP_RETRY_ON = (
+    (aiohttp.ClientConnectionError, asyncio.TimeoutError) if aiohttp is not None else ()
+)  # type: Tuple[Type[BaseException], ...]
+# A connection that could not be established, aiohttp >= 3.10 raises ConnectionTimeoutError on a connect timeout.
+AIOHTTP_WRITE_RETRY_ON = tuple(
+    getattr(aiohttp, name) for name in ('ClientConnectorError', 'ConnectionTimeoutError') if hasattr(aiohttp, name)
+)  # type: Tuple[Type[BaseException], ...]
+
+DEFAULT_RETRY_ON = (
+    FacebookServerException,
+    FacebookThrottleException,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+) + AIOHTTP_RETRY_ON
+
+# The failures of a request Graph did not run, the only ones a write is retried on by default.
+WRITE_RETRY_ON = (
+    FacebookThrottleException,
+    requests.exceptions.ConnectTimeout,
+) + AIOHTTP_WRITE_RETRY_ON
+
+
+def is_idempotent(request):  # type: (FacebookRequest) -> bool
+    """ Whether sending `request` again cannot repeat a write, a batch is when all its entries are."""
+    if isinstance(request, FacebookBatchRequest):
+        return all(is_idempotent_read(record['request']) for record in request.requests)
+
+    return is_idempotent_read(request)
+
+
+def get_retry_after(exception):  # type: (BaseException) -> Optional[float]
+    """ The seconds to wait before retrying as hinted by the response that raised `exception`, if any."""
+    headers = getattr(getattr(exception, 'response', None), 'headers', None)
+
+    retry_after = get_header(headers, RETRY_AFTER_HEADER)
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+
+    business_usage = load_json_header(headers, BUSINESS_USE_CASE_USAGE_HEADER)
+    if business_usage:
+        minutes = max([parse_usage(entry)[1] for _, entry in iter_business_usage(business_usage)] or [0])
+        if minutes:
+            return minutes * 60.0
+
+    return None
+
+
+class RetryBudget(object):
+    """ Limit the retries to a ratio of the requests sent.
+
+    Every request deposits `ratio` in the budget, up to `reserve`, and every retry withdraws one.
+    """
+
+    def __init__(self, ratio=0.2, reserve=10):
+        # type: (float, float) -> None
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def record_request(self):  # type: () -> None
+        with self._lock:
+            self.balance = min(self.reserve, self.balance + self.ratio)
+
+    def withdraw(self):  # type: () -> bool
+        """ Take a retry from the budget, return False if there is none left."""
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """ Decide which failures are retried and how long to wait before each attempt.
+
+    :param max_attempts: the number of attempts, including the first one
+    :param backoff_factor: the base of the exponential backoff in seconds
+    :param max_backoff: the longest wait between attempts, failures hinting a longer wait are not retried
+    :param jitter: randomize the backoff between zero and its value
+    :param retry_on: the exception classes to retry, or a dict of exception class to max attempts
+    :param budget: a RetryBudget shared by every retry of the policy
+    :param retry_writes: retry the writes on every failure of `retry_on`, not only on the WRITE_RETRY_ON ones
+    """
+
+    def __init__(
+        self,
+        max_attempts=DEFAULT_MAX_ATTEMPTS,  # type: int
+        backoff_factor=DEFAULT_BACKOFF_FACTOR,  # type: float
+        max_backoff=DEFAULT_MAX_BACKOFF,  # type: float
+        jitter=True,  # type: bool
+        retry_on=DEFAULT_RETRY_ON,  # type: Any
+        budget=None,  # type: Optional[RetryBudget]
+        sleep=time.sleep,  # type: Callable[[float], None]
+        retry_writes=False,  # type: bool
+    ):
+        # type: (...) -> None
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget
+        self.sleep = sleep
+        self.retry_writes = retry_writes
+
+        if isinstance(retry_on, dict):
+            self.retry_on = retry_on  # type: Dict[Type[BaseException], int]
+        else:
+            self.retry_on = dict((exception_class, max_attempts) for exception_class in retry_on)
+
+    def max_attempts_for(self, exception):  # type: (BaseException) -> int
+        """ The attempts allowed for the failure, the most specific matching class wins."""
+        matches = [exception_class for exception_class in self.retry_on if isinstance(exception, exception_class)]
+        if not matches:
+            return 1
+
+        most_specific = max(matches, key=lambda exception_class: len(exception_class.__mro__))
+        return self.retry_on[most_specific]
+
+    def should_retry(self, exception, attempt, request=None):
+        # type: (BaseException, int, Optional[FacebookRequest]) -> bool
+        """ Whether the failure of `attempt` (starting at 1) must be retried, it takes a retry from the budget.
+
+        :param request: the failed request, a write is only retried on the WRITE_RETRY_ON failures by default
+        """
+        if attempt >= self.max_attempts_for(exception):
+            return False
+
+        if (
+            request is not None and
+            not self.retry_writes and
+            not isinstance(exception, WRITE_RETRY_ON) and
+            not is_idempotent(request)
+        ):
+            return False
+
+        retry_after = get_retry_after(exception)
+        if retry_after is not None and retry_after > self.max_backoff:
+            return False
+
+        return self.budget.withdraw() if self.budget else True
+
+    def backoff(self, attempt, exception=None):  # type: (int, Optional[BaseException]) -> float
+        """ The seconds to wait after the failure of `attempt` (starting at 1)."""
+        retry_after = get_retry_after(exception) if exception is not None else None
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def execute(self, func, *args, **kwargs):  # type: (Callable, Any, Any) -> Any
+        """ Call `func` retrying its failures according to the policy."""
+        return self._execute(lambda: func(*args, **kwargs))
+
+    def execute_request(self, send, request):  # type: (Callable[[FacebookRequest], Any], FacebookRequest) -> Any
+        """ Send `request` with `send` retrying its failures according to the policy."""
+        return self._execute(lambda: send(request), request)
+
+    def _execute(self, call, request=None):  # type: (Callable[[], Any], Optional[FacebookRequest]) -> Any
+        if self.budget:
+            self.budget.record_request()
+
+        attempt = 1
+        while True:
+            try:
+                return call()
+            except Exception as e:
+                if not self.should_retry(e, attempt, request):
+                    raise
+                self.sleep(self.backoff(attempt, e))
+                attempt += 1
@@ -0,0 +1,139 @@
+import codecs
+import json
+
+import six
+from typing import (  # noqa: F401
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Text,
+    Tuple,
+    Union,
+)
+
+from facebook_sdk.exceptions import FacebookSDKException
+
+
+WHITESPACE = ' \t\n\r'
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class JSONStreamDecoder(object):
+    """ Decode the items of an array member of a JSON object as its chunks arrive.
+
+    Only the item being decoded is buffered, the other members of the object are decoded whole
+    and kept in `members` once the stream is exhausted, e.g. `paging` for the `data` array.
+
+    :param chunks: the chunks of the JSON document, bytes or text
+    :param key: the name of the array member to stream
+    """
+
+    def __init__(self, chunks, key='data'):
+        # type: (Iterable[Union[bytes, Text]], Text) -> None
+        self.key = key
+        self.members = {}  # type: Dict[Text, Any]
+
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = u''
+        self._position = 0
+        self._eof = False
+
+    def __iter__(self):  # type: () -> Iterator[Any]
+        self._expect(u'{')
+        if self._peek() == u'}':
+            self._position += 1
+            return
+
+        while True:
+            name = self._decode()
+            self._expect(u':')
+
+            if name == self.key and self._peek() == u'[':
+                self._position += 1
+                for item in self._iter_array():
+                    yield item
+            else:
+                self.members[name] = self._decode()
+
+            if self._next_token() == u'}':
+                return
+
+    def _iter_array(self):  # type: () -> Iterator[Any]
+        if self._peek() == u']':
+            self._position += 1
+            return
+
+        while True:
+            yield self._decode()
+            self._trim()
+            if self._next_token() == u']':
+                return
+
+    def _decode(self):  # type: () -> Any
+        """ Decode the value at the current position, reading chunks until it is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                value, end = None, None
+
+            # A number may go on in the next chunk, a value is only complete once followed by something.
+            if end is not None and (end < len(self._buffer) or self._eof):
+                self._position = end
+                return value
+
+            if not self._read():
+                raise FacebookSDKException('Invalid JSON stream at position {position}'.format(position=self._position))
+
+    def _next_token(self):  # type: () -> Text
+        """ Consume and return the comma or closing bracket following a value."""
+        token = self._peek()
+        if token not in (u',', u']', u'}'):
+            raise FacebookSDKException('Invalid JSON stream at position {position}'.format(position=self._position))
+
+        self._position += 1
+        return token
+
+    def _expect(self, token):  # type: (Text) -> None
+        if self._peek() != token:
+            raise FacebookSDKException('Invalid JSON stream, "{token}" expected'.format(token=token))
+        self._position += 1
+
+    def _peek(self):  # type: () -> Optional[Text]
+        """ Skip the whitespaces and return the next character, reading chunks as needed."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in WHITESPACE:
+                self._position += 1
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._read():
+                return None
+
+    def _read(self):  # type: () -> bool
+        if self._eof:
+            return False
+
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            self._buffer += self._text_decoder.decode(b'', final=True)
+            return True
+
+        if isinstance(chunk, six.binary_type):
+            self._buffer += self._text_decoder.decode(chunk)
+        else:
+            self._buffer += chunk
+        return True
+
+    def _trim(self):  # type: () -> None
+        """ Drop the decoded part of the buffer."""
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
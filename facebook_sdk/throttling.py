@@ -0,0 +1,259 @@
+import json
+import threading
+import time
+
+from typing import (  # noqa: F401
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Text,
+    Tuple,
+)
+
+
+if TYPE_CHECKING:
+    from facebook_sdk.request import FacebookRequest  # noqa: F401
+    from facebook_sdk.response import FacebookBatchResponse  # noqa: F401
+
+APP_USAGE_HEADER = 'x-app-usage'
+PAGE_USAGE_HEADER = 'x-page-usage'
+AD_ACCOUNT_USAGE_HEADER = 'x-ad-account-usage'
+BUSINESS_USE_CASE_USAGE_HEADER = 'x-business-use-case-usage'
+
+SCOPE_APP = 'app'
+SCOPE_TOKEN = 'token'
+SCOPE_BUSINESS = 'business'
+
+DEFAULT_USAGE_THRESHOLD = 75
+DEFAULT_MAX_INTERVAL = 10
+# Graph reports the usage over a rolling one hour window.
+DEFAULT_USAGE_TTL = 3600
+EXPIRY_INTERVAL = 60
+
+
+def get_header(headers, name):  # type: (Any, Text) -> Optional[Text]
+    """ Case insensitive lookup of a header in a mapping of headers or in the list of
+    {"name": ..., "value": ...} headers of a batch response entry.
+    """
+    if isinstance(headers, list):
+        items = [(header.get('name', ''), header.get('value')) for header in headers if isinstance(header, dict)]
+    elif hasattr(headers, 'items'):
+        items = headers.items()
+    else:
+        return None
+
+    for key, value in items:
+        if key.lower() == name:
+            return value
+
+    return None
+
+
+def load_json_header(headers, name):  # type: (Any, Text) -> Optional[Dict]
+    """ The JSON object of a header, None if the header is missing or is not a JSON object."""
+    value = get_header(headers, name)
+    if not value:
+        return None
+
+    try:
+        value = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+
+    return value if isinstance(value, dict) else None
+
+
+def iter_business_usage(business_usage):  # type: (Dict) -> Iterator[Tuple[Text, Dict]]
+    """ Yield the (business id, usage entry) pairs of a X-Business-Use-Case-Usage header, skipping the
+    malformed entries.
+    """
+    for business_id, entries in business_usage.items():
+        if isinstance(entries, dict):
+            entries = [entries]
+        if not isinstance(entries, list):
+            continue
+        for entry in entries:
+            if isinstance(entry, dict):
+                yield business_id, entry
+
+
+def _to_number(value):  # type: (Any) -> float
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_usage(value):  # type: (Dict) -> Tuple[float, float]
+    """ Return the highest usage percentage and the minutes to regain access of a usage entry,
+    the values that are not numbers count as 0.
+    """
+    percent = max(
+        _to_number(value.get('call_count', 0)),
+        _to_number(value.get('total_time', 0)),
+        _to_number(value.get('total_cputime', 0)),
+        _to_number(value.get('acc_id_util_pct', 0)),
+    )
+    return percent, _to_number(value.get('estimated_time_to_regain_access', 0))
+
+
+class RateLimiter(object):
+    """ Pace the requests using the usage reported by Graph in the X-App-Usage, X-Page-Usage,
+    X-Ad-Account-Usage and X-Business-Use-Case-Usage headers.
+
+    Usage is tracked per app, per access token and per business object. Once a usage goes over
+    `threshold` percent the requests sharing it are spaced out, up to `max_interval` seconds apart
+    when it reaches 100%, and they are held back while Graph reports a time to regain access.
+
+    The usage of an app, token or business object not reported again for `usage_ttl` seconds is forgotten.
+    """
+
+    def __init__(
+        self,
+        threshold=DEFAULT_USAGE_THRESHOLD,  # type: float
+        max_interval=DEFAULT_MAX_INTERVAL,  # type: float
+        clock=time.time,  # type: Callable[[], float]
+        sleep=time.sleep,  # type: Callable[[float], None]
+        usage_ttl=DEFAULT_USAGE_TTL,  # type: float
+    ):
+        # type: (...) -> None
+        self.threshold = threshold
+        self.max_interval = max_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.usage_ttl = usage_ttl
+
+        self._lock = threading.Lock()
+        self._next_expiry = 0.0
+        self._usage = {}  # type: Dict[Tuple[Text, Text], float]
+        self._updated_at = {}  # type: Dict[Tuple[Text, Text], float]
+        self._blocked_until = {}  # type: Dict[Tuple[Text, Text], float]
+        self._last_slot = {}  # type: Dict[Tuple[Text, Text], float]
+        self._businesses = {}  # type: Dict[Text, Set[Text]]
+
+    def usage(self, scope, key):  # type: (Text, Text) -> float
+        """ The last usage percentage reported for an app, token or business object."""
+        return self._usage.get((scope, key), 0)
+
+    def update(self, request, headers):  # type: (FacebookRequest, Any) -> None
+        """ Record the usage reported by the headers of the response to `request`."""
+        now = self.clock()
+        usages = []  # type: List[Tuple[Tuple[Text, Text], Dict]]
+
+        app_usage = load_json_header(headers, APP_USAGE_HEADER)
+        if app_usage and request.app:
+            usages.append(((SCOPE_APP, request.app.app_id), app_usage))
+
+        for header in (PAGE_USAGE_HEADER, AD_ACCOUNT_USAGE_HEADER):
+            token_usage = load_json_header(headers, header)
+            if token_usage and request.access_token:
+                usages.append(((SCOPE_TOKEN, request.access_token), token_usage))
+
+        business_ids = set()  # type: Set[Text]
+        business_usage = load_json_header(headers, BUSINESS_USE_CASE_USAGE_HEADER) or {}
+        for business_id, entry in iter_business_usage(business_usage):
+            business_ids.add(business_id)
+            usages.append(((SCOPE_BUSINESS, business_id), entry))
+
+        # A business object reports one entry per use case, keep the most restrictive one.
+        reported = {}  # type: Dict[Tuple[Text, Text], Tuple[float, float]]
+        for key, value in usages:
+            percent, minutes_to_regain_access = parse_usage(value)
+            previous_percent, previous_minutes = reported.get(key, (0, 0))
+            reported[key] = max(percent, previous_percent), max(minutes_to_regain_access, previous_minutes)
+
+        with self._lock:
+            self._expire(now)
+
+            if business_ids and request.access_token:
+                self._businesses.setdefault(request.access_token, set()).update(business_ids)
+
+            for key, (percent, minutes_to_regain_access) in reported.items():
+                self._usage[key] = percent
+                self._updated_at[key] = now
+                if minutes_to_regain_access:
+                    self._blocked_until[key] = now + minutes_to_regain_access * 60
+                else:
+                    self._blocked_until.pop(key, None)
+
+    def update_batch(self, batch_response):  # type: (FacebookBatchResponse) -> None
+        """ Record the usage reported by the headers of every entry of a batch response."""
+        for request_record, entry in zip(batch_response.request.requests, batch_response.json_body or []):
+            if isinstance(entry, dict) and entry.get('headers'):
+                self.update(request_record['request'], entry['headers'])
+
+    def reserve(self, request):  # type: (FacebookRequest) -> float
+        """ Reserve a send slot for `request` and return the seconds to wait before sending it."""
+        now = self.clock()
+        wait = 0.0
+
+        with self._lock:
+            self._expire(now)
+
+            for key in self._keys(request):
+                slot = now
+                if key in self._last_slot:
+                    slot = max(slot, self._last_slot[key] + self._interval(self._usage.get(key, 0)))
+                slot = max(slot, self._blocked_until.get(key, now))
+
+                self._last_slot[key] = slot
+                wait = max(wait, slot - now)
+
+        return wait
+
+    def acquire(self, request):  # type: (FacebookRequest) -> None
+        """ Block until `request` can be sent."""
+        wait = self.reserve(request)
+        if wait > 0:
+            self.sleep(wait)
+
+    def _interval(self, percent):  # type: (float) -> float
+        if percent < self.threshold:
+            return 0
+        if self.threshold >= 100:
+            return float(self.max_interval)
+
+        return float(self.max_interval) * min(percent - self.threshold, 100 - self.threshold) / (100 - self.threshold)
+
+    def _expire(self, now):  # type: (float) -> None
+        """ Drop the state that no longer paces any request, at most once every EXPIRY_INTERVAL seconds."""
+        if now < self._next_expiry:
+            return
+        self._next_expiry = now + EXPIRY_INTERVAL
+
+        for key, updated_at in list(self._updated_at.items()):
+            if updated_at + self.usage_ttl <= now:
+                del self._updated_at[key]
+                del self._usage[key]
+        for key, blocked_until in list(self._blocked_until.items()):
+            if blocked_until <= now:
+                del self._blocked_until[key]
+        # The next slot of a key is never later than now once its last slot is max_interval old.
+        for key, slot in list(self._last_slot.items()):
+            if slot + self.max_interval <= now:
+                del self._last_slot[key]
+
+        for access_token, business_ids in list(self._businesses.items()):
+            business_ids.difference_update([
+                business_id for business_id in business_ids if not self._is_tracked((SCOPE_BUSINESS, business_id))
+            ])
+            if not business_ids:
+                del self._businesses[access_token]
+
+    def _is_tracked(self, key):  # type: (Tuple[Text, Text]) -> bool
+        return key in self._usage or key in self._blocked_until or key in self._last_slot
+
+    def _keys(self, request):  # type: (FacebookRequest) -> List[Tuple[Text, Text]]
+        keys = []  # type: List[Tuple[Text, Text]]
+        if request.app:
+            keys.append((SCOPE_APP, request.app.app_id))
+        if request.access_token:
+            keys.append((SCOPE_TOKEN, request.access_token))
+            keys.extend((SCOPE_BUSINESS, business_id) for business_id in self._businesses.get(request.access_token, ()))
+
+        return keys
@@ -0,0 +1,229 @@
+from concurrent.futures import Future
+import datetime
+import threading
+
+from typing import (  # noqa: F401
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    Union,
+)
+
+from facebook_sdk.authentication import AccessToken
+from facebook_sdk.exceptions import FacebookSDKException
+
+
+if TYPE_CHECKING:
+    from facebook_sdk.authentication import OAuth2Client  # noqa: F401
+
+DEFAULT_REFRESH_MARGIN = datetime.timedelta(days=1)
+DEFAULT_REFRESH_INTERVAL = 60
+
+
+class TokenStore(object):
+    """ The interface of a token store.
+
+    A store shared between processes only needs to persist the `access_token` and `expires_at`
+    of the AccessToken instances.
+    """
+
+    def get(self, key):  # type: (Text) -> Optional[AccessToken]
+        raise NotImplementedError
+
+    def set(self, key, access_token):  # type: (Text, AccessToken) -> None
+        raise NotImplementedError
+
+    def delete(self, key):  # type: (Text) -> None
+        raise NotImplementedError
+
+    def items(self):  # type: () -> List[Tuple[Text, AccessToken]]
+        raise NotImplementedError
+
+
+class MemoryTokenStore(TokenStore):
+    """ An in memory token store."""
+
+    def __init__(self):  # type: () -> None
+        self._tokens = {}  # type: Dict[Text, AccessToken]
+        self._lock = threading.Lock()
+
+    def get(self, key):  # type: (Text) -> Optional[AccessToken]
+        with self._lock:
+            return self._tokens.get(key)
+
+    def set(self, key, access_token):  # type: (Text, AccessToken) -> None
+        with self._lock:
+            self._tokens[key] = access_token
+
+    def delete(self, key):  # type: (Text) -> None
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def items(self):  # type: () -> List[Tuple[Text, AccessToken]]
+        with self._lock:
+            return list(self._tokens.items())
+
+    def __len__(self):  # type: () -> int
+        return len(self._tokens)
+
+
+class TokenManager(object):
+    """ Keep the access tokens of a store fresh by exchanging them before they expire.
+
+    A token is refreshed once it expires within `refresh_margin`, either by `get` or by the background
+    thread started with `start`. Concurrent refreshes of the same token are collapsed into a single
+    exchange. The last exception raised by the refresh of a token is kept in `failures`.
+
+    :param oauth_client: the OAuth2Client exchanging the tokens for long-lived ones
+    :param store: the TokenStore keeping the tokens, a MemoryTokenStore by default
+    :param refresh_margin: how long before their expiration the tokens are refreshed
+    :param refresh_interval: the seconds between two checks of the background thread
+    :param refresher: a callable returning the new AccessToken of an AccessToken, instead of the oauth client
+    :param clock: a callable returning the current UTC datetime
+    """
+
+    def __init__(
+        self,
+        oauth_client=None,  # type: Optional[OAuth2Client]
+        store=None,  # type: Optional[TokenStore]
+        refresh_margin=DEFAULT_REFRESH_MARGIN,  # type: datetime.timedelta
+        refresh_interval=DEFAULT_REFRESH_INTERVAL,  # type: float
+        refresher=None,  # type: Optional[Callable[[AccessToken], AccessToken]]
+        clock=datetime.datetime.utcnow,  # type: Callable[[], datetime.datetime]
+    ):
+        # type: (...) -> None
+        if refresher is None and oauth_client is None:
+            raise FacebookSDKException('An OAuth2Client or a refresher is required to refresh the access tokens.')
+
+        self.store = store if store is not None else MemoryTokenStore()  # type: TokenStore
+        self.refresh_margin = refresh_margin
+        self.refresh_interval = refresh_interval
+        self.refresher = refresher or oauth_client.get_long_lived_access_token  # type: ignore
+        self.clock = clock
+        self.failures = {}  # type: Dict[Text, Exception]
+
+        self._refreshing = {}  # type: Dict[Text, Future]
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def add(self, key, access_token):  # type: (Text, Union[Text, AccessToken]) -> AccessToken
+        """ Track an access token under `key`, an AccessToken without expiration is never refreshed.
+
+        :param key: the name of the token, e.g. the id of its user or page
+        """
+        if not isinstance(access_token, AccessToken):
+            access_token = AccessToken(access_token=access_token)
+
+        self.store.set(key, access_token)
+        return access_token
+
+    def remove(self, key):  # type: (Text) -> None
+        self.store.delete(key)
+        self.failures.pop(key, None)
+
+    def get(self, key):  # type: (Text) -> AccessToken
+        """ The access token tracked under `key`, refreshed first if it expires soon.
+
+        A token that is not expired yet is returned even when its refresh fails.
+
+        :raise FacebookSDKException: when no token is tracked under `key`
+        """
+        access_token = self._get(key)
+        if not self.needs_refresh(access_token):
+            return access_token
+
+        try:
+            return self.refresh(key, force=False)
+        except Exception:
+            if access_token.expires_at <= self.clock():  # type: ignore
+                raise
+            return access_token
+
+    def needs_refresh(self, access_token):  # type: (AccessToken) -> bool
+        return access_token.expires_at is not None and access_token.expires_at - self.refresh_margin <= self.clock()
+
+    def refresh(self, key, force=True):  # type: (Text, bool) -> AccessToken
+        """ Exchange the access token tracked under `key` and store the new one.
+
+        The callers refreshing the same token meanwhile wait for this exchange and share its result.
+
+        :param force: exchange the token even if it does not need a refresh anymore, e.g. because another
+            caller refreshed it since it was read
+        """
+        with self._lock:
+            future = self._refreshing.get(key)
+            leader = future is None
+            if leader:
+                future = self._refreshing[key] = Future()
+
+        if not leader:
+            return future.result()  # type: ignore
+
+        try:
+            access_token = self._get(key)
+            if force or self.needs_refresh(access_token):
+                access_token = self.refresher(access_token)
+                self.store.set(key, access_token)
+                self.failures.pop(key, None)
+            future.set_result(access_token)  # type: ignore
+            return access_token
+        except Exception as e:
+            self.failures[key] = e
+            future.set_exception(e)  # type: ignore
+            raise
+        finally:
+            with self._lock:
+                del self._refreshing[key]
+
+    def refresh_expiring(self):  # type: () -> List[Text]
+        """ Refresh every token expiring within the margin.
+
+        :return: the keys of the tokens whose refresh failed
+        """
+        failed = []
+        for key, access_token in self.store.items():
+            if not self.needs_refresh(access_token):
+                continue
+            try:
+                self.refresh(key, force=False)
+            except Exception:
+                failed.append(key)
+
+        return failed
+
+    def start(self):  # type: () -> None
+        """ Refresh the expiring tokens every `refresh_interval` seconds in a background thread."""
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='facebook-token-manager')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def close(self):  # type: () -> None
+        """ Stop the background thread."""
+        self._stopped.set()
+
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _run(self):  # type: () -> None
+        while True:
+            self.refresh_expiring()
+            if self._stopped.wait(self.refresh_interval):
+                return
+
+    def _get(self, key):  # type: (Text) -> AccessToken
+        access_token = self.store.get(key)
+        if access_token is None:
+            raise FacebookSDKException('No access token is tracked under "{key}"'.format(key=key))
+
+        return access_token
@@ -0,0 +1,221 @@
+import requests
+from typing import (  # noqa: F401
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    Optional,
+    Text,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from facebook_sdk.client import (
+    BaseFacebookClient,
+    FacebookClient,
+)
+from facebook_sdk.constants import METHOD_POST
+from facebook_sdk.exceptions import FacebookResumableUploadException
+from facebook_sdk.facebook_file import FacebookFile
+from facebook_sdk.request import FacebookRequest
+from facebook_sdk.retry import RetryPolicy
+
+
+if TYPE_CHECKING:
+    from facebook_sdk.authentication import AccessToken  # noqa: F401
+    from facebook_sdk.facebook import FacebookApp  # noqa: F401
+    from facebook_sdk.response import FacebookResponse  # noqa: F401
+
+UPLOAD_PHASE_START = 'start'
+UPLOAD_PHASE_TRANSFER = 'transfer'
+UPLOAD_PHASE_FINISH = 'finish'
+
+DEFAULT_MAX_TRANSFER_TRIES = 5
+
+C = TypeVar('C', bound=BaseFacebookClient)
+
+
+class FacebookTransferChunk(object):
+    """ The range of a file Graph expects in the next transfer of a resumable upload.
+
+    It is all a resumable upload needs to carry on, a failed upload can be resumed from its last chunk.
+    """
+
+    def __init__(self, file, upload_session_id, video_id, start_offset, end_offset):
+        # type: (FacebookFile, Text, Text, int, int) -> None
+        self.file = file
+        self.upload_session_id = upload_session_id
+        self.video_id = video_id
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+
+    def partial_file(self):  # type: () -> FacebookFile
+        return FacebookFile(
+            path=self.file.path,
+            max_length=self.end_offset - self.start_offset,
+            offset=self.start_offset,
+        )
+
+    @property
+    def is_last_chunk(self):  # type: () -> bool
+        return self.start_offset == self.end_offset
+
+
+class BaseFacebookResumableUploader(Generic[C]):
+    """ The parts of the sync and async resumable uploaders that do not depend on the transport."""
+
+    def __init__(
+        self,
+        app,  # type: FacebookApp
+        client,  # type: C
+        access_token=None,  # type: Optional[Union[Text, AccessToken]]
+        graph_version=None,  # type: Optional[Text]
+        retry_policy=None,  # type: Optional[RetryPolicy]
+    ):
+        # type: (...) -> None
+        """
+        :param retry_policy: the RetryPolicy spacing out the transfers after a network failure,
+            the retry policy of the client by default
+        """
+        self.app = app
+        self.client = client
+        self.access_token = access_token
+        self.graph_version = graph_version
+        self.retry_policy = retry_policy or client.retry_policy or RetryPolicy()
+        self.last_chunk = None  # type: Optional[FacebookTransferChunk]
+
+    def _request(self, endpoint, params):  # type: (Text, Dict) -> FacebookRequest
+        return FacebookRequest(
+            app=self.app,
+            method=METHOD_POST,
+            access_token=self.access_token,
+            endpoint=endpoint,
+            params=params,
+            graph_version=self.graph_version,
+        )
+
+    def _start_request(self, endpoint, file):  # type: (Text, FacebookFile) -> FacebookRequest
+        return self._request(endpoint, {
+            'upload_phase': UPLOAD_PHASE_START,
+            'file_size': file.size,
+        })
+
+    def _transfer_request(self, endpoint, chunk):  # type: (Text, FacebookTransferChunk) -> FacebookRequest
+        return self._request(endpoint, {
+            'upload_phase': UPLOAD_PHASE_TRANSFER,
+            'upload_session_id': chunk.upload_session_id,
+            'start_offset': chunk.start_offset,
+            'video_file_chunk': chunk.partial_file(),
+        })
+
+    def _finish_request(self, endpoint, upload_session_id, metadata=None):
+        # type: (Text, Text, Optional[Dict]) -> FacebookRequest
+        params = dict(metadata or {})
+        params.update({
+            'upload_phase': UPLOAD_PHASE_FINISH,
+            'upload_session_id': upload_session_id,
+        })
+        return self._request(endpoint, params)
+
+    def _chunk_from_response(self, file, response, previous_chunk=None):
+        # type: (FacebookFile, FacebookResponse, Optional[FacebookTransferChunk]) -> FacebookTransferChunk
+        body = response.json_body
+        self.last_chunk = FacebookTransferChunk(
+            file=file,
+            upload_session_id=body.get('upload_session_id') or previous_chunk.upload_session_id,  # type: ignore
+            video_id=body.get('video_id') or previous_chunk.video_id,  # type: ignore
+            start_offset=int(body['start_offset']),
+            end_offset=int(body['end_offset']),
+        )
+        return self.last_chunk
+
+    def _transfer_backoff(self, failures, exception):  # type: (int, BaseException) -> float
+        """ The seconds to wait before transferring again a chunk that failed `failures` times in a row."""
+        # Graph asks to resume right away from the offsets it reports, only the network failures are spaced out.
+        if isinstance(exception, FacebookResumableUploadException):
+            return 0
+
+        return self.retry_policy.backoff(failures, exception)
+
+    def _resumed_chunk(self, chunk, exception):
+        # type: (FacebookTransferChunk, BaseException) -> FacebookTransferChunk
+        start_offset = getattr(exception, 'start_offset', None)
+        end_offset = getattr(exception, 'end_offset', None)
+        if start_offset is None or end_offset is None:
+            return chunk
+
+        self.last_chunk = FacebookTransferChunk(
+            file=chunk.file,
+            upload_session_id=chunk.upload_session_id,
+            video_id=chunk.video_id,
+            start_offset=start_offset,
+            end_offset=end_offset,
+        )
+        return self.last_chunk
+
+
+class FacebookResumableUploader(BaseFacebookResumableUploader[FacebookClient]):
+    """ Upload a video in the chunks negotiated with Graph, going through the start, transfer and finish phases.
+
+    A chunk failing with a resumable error or a network error is transferred again, from the offsets
+    reported by Graph if any. Graph only accepts the chunks one after the other.
+    """
+
+    resumable_exceptions = (
+        FacebookResumableUploadException,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+    )  # type: Tuple[Type[BaseException], ...]
+
+    def upload(self, endpoint, file, metadata=None, max_transfer_tries=DEFAULT_MAX_TRANSFER_TRIES, chunk=None):
+        # type: (Text, FacebookFile, Optional[Dict], int, Optional[FacebookTransferChunk]) -> Dict[Text, Any]
+        """ Upload the whole file and publish it with `metadata`.
+
+        :param max_transfer_tries: the number of times a chunk is transferred again after a resumable failure
+        :param chunk: the last chunk of an upload to resume, `last_chunk` after a failure
+        """
+        chunk = chunk or self.start(endpoint, file)
+        tries = max_transfer_tries
+        while not chunk.is_last_chunk:
+            try:
+                chunk = self.transfer(endpoint, chunk, allow_to_throw=True)
+                tries = max_transfer_tries
+            except self.resumable_exceptions as e:
+                if tries < 1:
+                    raise
+                tries -= 1
+                self.retry_policy.sleep(self._transfer_backoff(max_transfer_tries - tries, e))
+                chunk = self._resumed_chunk(chunk, e)
+
+        return {
+            'video_id': chunk.video_id,
+            'success': self.finish(endpoint, chunk.upload_session_id, metadata),
+        }
+
+    def start(self, endpoint, file):  # type: (Text, FacebookFile) -> FacebookTransferChunk
+        response = self.client.send_request(self._start_request(endpoint, file))
+
+        return self._chunk_from_response(file, response)
+
+    def transfer(self, endpoint, chunk, allow_to_throw=False):
+        # type: (Text, FacebookTransferChunk, bool) -> FacebookTransferChunk
+        """ Send a chunk and return the next one, or the same one when it must be transferred again.
+
+        :param allow_to_throw: raise the resumable failures instead of returning the chunk to transfer again
+        """
+        try:
+            response = self.client.send_request(self._transfer_request(endpoint, chunk))
+        except self.resumable_exceptions as e:
+            if allow_to_throw:
+                raise
+            return self._resumed_chunk(chunk, e)
+
+        return self._chunk_from_response(chunk.file, response, chunk)
+
+    def finish(self, endpoint, upload_session_id, metadata=None):
+        # type: (Text, Text, Optional[Dict]) -> bool
+        response = self.client.send_request(self._finish_request(endpoint, upload_session_id, metadata))
+
+        return bool(response.json_body.get('success'))
@@ -14,10 +14,17 @@ from typing import (  # noqa: F401
     Iterable,
     List,
     Mapping,
+    Optional,
     Text,
+    Tuple,
 )
 
 
+ENDPOINT_CACHE_MAX_SIZE = 1024
+
+_endpoint_cache = {}  # type: Dict[Text, Text]
+
+
 def force_slash_prefix(value):  # type: (Text) -> Text
     return '/' + value if not (value and str(value).startswith('/')) else value
 
@@ -48,6 +55,46 @@ def get_params_from_url(url):  # type: (Text) -> Dict[Text, List[Text]]
     return qd
 
 
+def split_endpoint_access_token(endpoint):  # type: (Text) -> Tuple[Text, Optional[Text]]
+    """ Remove the access_token and appsecret_proof params of an endpoint, parsing it once.
+
+    The endpoints without a query string are returned as is and the normalized endpoints without
+    an access token are cached, the ones with a token are usually unique pagination urls.
+
+    :param endpoint: the endpoint, with or without a query string
+    :return: the endpoint without these params and the access token it contained, if any
+    """
+    if '?' not in endpoint:
+        return endpoint, None
+
+    cached = _endpoint_cache.get(endpoint)
+    if cached is not None:
+        return cached, None
+
+    parsed = urlparse(endpoint)
+    query = parse_qs(parsed.query, keep_blank_values=True)
+    access_token = query.pop('access_token', None)
+    query.pop('appsecret_proof', None)
+
+    normalized = urlunparse([
+        parsed.scheme,
+        parsed.netloc,
+        parsed.path,
+        parsed.params,
+        urlencode(query, doseq=True),
+        parsed.fragment
+    ])
+
+    if access_token is not None:
+        return normalized, ''.join(access_token)
+
+    if len(_endpoint_cache) >= ENDPOINT_CACHE_MAX_SIZE:
+        _endpoint_cache.clear()
+    _endpoint_cache[endpoint] = normalized
+
+    return normalized, None
+
+
 def convert_params_to_utf8(params):  # type: (Mapping[Any, Any]) -> Mapping[Any, Any]
     return {
         k: v.encode("utf-8") if isinstance(v, six.text_type) else v
@@ -55,7 +102,7 @@ def convert_params_to_utf8(params):  # type: (Mapping[Any, Any]) -> Mapping[Any,
     }
 
 
-def smart_text(value, encoding='utf-8', **kwargs):  # type: (Text, Text, Any) -> Text
+def smart_text(value, encoding='utf-8', **kwargs):  # type: (Any, Text, Any) -> Text
     if isinstance(value, six.text_type):
         return value
     elif isinstance(value, six.binary_type):
@@ -1,10 +1,24 @@
 import io
+import sys
+
 from setuptools import setup
+from setuptools.command.build_py import build_py as _build_py
+
 from facebook_sdk import __version__
 
 with io.open('README.rst', 'r', encoding='utf-8') as readme_file:
     readme = readme_file.read()
 
+
+class build_py(_build_py):
+    """ Leave the asyncio module out of the builds for Python versions that cannot compile it."""
+
+    def build_module(self, module, module_file, package):
+        if module == 'aio' and sys.version_info < (3, 6):
+            return None
+        return _build_py.build_module(self, module, module_file, package)
+
+
 tests_require = [
     'coveralls',
     'pytest >= 4.1; python_version > "3.5"',
@@ -23,13 +37,18 @@ setup(
     packages=['facebook_sdk'],
     package_data={'facebook_sdk': ['py.typed']},
     install_requires=[
-        'requests >=0.8',
+        'requests >=2.0',
         'six',
+        'futures;python_version<"3.2"',
         'typing;python_version<"3.5"'
     ],
     tests_require=tests_require,
+    cmdclass={'build_py': build_py},
     extras_require={
         'testing': tests_require,
+        'aio': ['aiohttp >=3.3; python_version>="3.6"'],
+        'orjson': ['orjson; python_version>="3.6"'],
+        'ujson': ['ujson'],
     },
     classifiers=[
         'License :: OSI Approved :: MIT License',
@@ -1,3 +1,5 @@
+import json
+
 from facebook_sdk.client import FacebookClient
 from facebook_sdk.request import FacebookRequest, FacebookBatchRequest
 from facebook_sdk.response import FacebookResponse
@@ -55,3 +57,28 @@ class FakeResponse(object):
         self.content = content
         self.headers = headers
         self.status_code = status_code
+
+
+class FakePagesClient(object):
+    """ Serve the pages of an edge, each page links to the next one until the last."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def build_response(self, request, index):
+        body = {'data': self.pages[index]}
+        if index + 1 < len(self.pages):
+            body['paging'] = {
+                'next': 'https://graph.facebook.com/v2.12/me/feed?access_token=%s&after=%d' % (
+                    request.access_token,
+                    index + 1,
+                ),
+            }
+
+        return FacebookResponse(request=request, body=json.dumps(body), http_status_code=200)
+
+    def send_request(self, request):
+        self.requests.append(request)
+        index = int(request.endpoint.split('after=')[1]) if 'after=' in request.endpoint else 0
+        return self.build_response(request, index)
@@ -0,0 +1,9 @@
+import sys
+
+from typing import List  # noqa: F401
+
+
+collect_ignore = []  # type: List[str]
+
+if sys.version_info < (3, 6):
+    collect_ignore.append('test_aio.py')
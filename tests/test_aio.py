@@ -0,0 +1,341 @@
+import asyncio
+import json
+import os
+from typing import Dict  # noqa: F401
+from unittest import TestCase
+
+import aiohttp
+from six.moves.urllib.parse import parse_qs
+
+from facebook_sdk.aio import (
+    AsyncFacebook,
+    AsyncFacebookClient,
+    AsyncOAuth2Client,
+    aiter_items,
+)
+from facebook_sdk.authentication import AccessToken
+from facebook_sdk.exceptions import FacebookResponseException
+from facebook_sdk.facebook import FacebookApp
+from facebook_sdk.request import FacebookBatchRequest, FacebookRequest
+from facebook_sdk.response import FacebookBatchResponse, FacebookResponse
+from facebook_sdk.retry import RetryPolicy
+from tests import FakePagesClient, FakeResponse
+
+
+class FakeAsyncFacebookClient(AsyncFacebookClient):
+    def __init__(self, **kwargs):
+        self.fake_response = kwargs.pop('fake_response')
+        super(FakeAsyncFacebookClient, self).__init__(**kwargs)
+
+    async def send(self, *args, **kwargs):
+        self.send_kwargs = kwargs
+        return self.fake_response
+
+
+class FakeAiohttpResponse(object):
+    status = 200
+    headers = {}  # type: Dict[str, str]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def read(self):
+        return b'{}'
+
+
+class FakeAiohttpSession(object):
+    def request(self, **kwargs):
+        self.request_kwargs = kwargs
+        return FakeAiohttpResponse()
+
+
+class FakeAsyncPagesClient(FakePagesClient):
+    async def send_request(self, request):
+        return super(FakeAsyncPagesClient, self).send_request(request)
+
+
+async def collect(async_iterator):
+    return [item async for item in async_iterator]
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsyncFacebookClient(TestCase):
+    def setUp(self):
+        super(TestAsyncFacebookClient, self).setUp()
+        self.request = FacebookRequest(endpoint='me', method='GET', access_token='fake_token')
+
+    def test_send_params(self):
+        session = FakeAiohttpSession()
+        client = AsyncFacebookClient(session=session)
+        request = FacebookRequest(
+            endpoint='me/feed',
+            method='GET',
+            access_token=AccessToken('fake_token'),
+            params={'summary': True, 'limit': 10, 'ids': ['1', '2'], 'after': None},
+        )
+
+        run(client.send_request(request))
+
+        self.assertEqual(sorted(session.request_kwargs['params']), [
+            ('access_token', 'fake_token'),
+            ('ids', '1'),
+            ('ids', '2'),
+            ('limit', '10'),
+            ('summary', 'True'),
+        ])
+
+    def test_send_request(self):
+        client = FakeAsyncFacebookClient(fake_response=FakeResponse(
+            status_code=200,
+            content='{"id": "123"}',
+            headers={},
+        ))
+        response = run(client.send_request(self.request))
+
+        self.assertIsInstance(response, FacebookResponse)
+        self.assertEqual(response.json_body, {'id': '123'})
+        self.assertEqual(client.send_kwargs['url'], 'https://graph.facebook.com/v2.12/me')
+        self.assertEqual(client.send_kwargs['params'], {'access_token': 'fake_token'})
+
+    def test_send_request_error(self):
+        client = FakeAsyncFacebookClient(fake_response=FakeResponse(
+            status_code=400,
+            content='{"error": {"code": 100}}',
+            headers={},
+        ))
+
+        with self.assertRaises(FacebookResponseException):
+            run(client.send_request(self.request))
+
+    def test_send_batch_request(self):
+        client = FakeAsyncFacebookClient(fake_response=FakeResponse(
+            status_code=200,
+            content='[{"code": 200, "body": "{\\"id\\": \\"123\\"}"}]',
+            headers={},
+        ))
+        response = run(client.send_batch_request(FacebookBatchRequest(
+            access_token='fake_token',
+            requests=[self.request],
+        )))
+
+        self.assertIsInstance(response, FacebookBatchResponse)
+        self.assertEqual(response.responses[0]['response'].json_body, {'id': '123'})
+
+    def test_send_chunked_batch_request_with_a_failed_chunk(self):
+        client = FakeAsyncFacebookClient(fake_response=None)
+
+        async def send(**kwargs):
+            batch = json.loads(parse_qs(kwargs['data'])['batch'][0])
+            if len(batch) < 50:
+                raise asyncio.TimeoutError()
+            return FakeResponse(status_code=200, content=json.dumps([{'code': 200, 'body': '{}'}] * 50), headers={})
+
+        client.send = send
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests=[
+            FacebookRequest(endpoint='/%d' % index, method='GET') for index in range(60)
+        ])
+
+        response = run(client.send_batch_request(batch_request, chunked=True))
+
+        self.assertEqual(response.failed_indexes(), list(range(50, 60)))
+        self.assertIsInstance(response.responses[59]['response'].exception, asyncio.TimeoutError)
+
+    def test_send_request_retries_transport_errors(self):
+        failures = [aiohttp.ServerDisconnectedError(), asyncio.TimeoutError()]
+        client = FakeAsyncFacebookClient(
+            fake_response=FakeResponse(status_code=200, content='{"id": "123"}', headers={}),
+            retry_policy=RetryPolicy(backoff_factor=0, jitter=False),
+        )
+        send = client.send
+
+        async def fail_then_send(**kwargs):
+            if failures:
+                raise failures.pop(0)
+            return await send(**kwargs)
+
+        client.send = fail_then_send
+
+        response = run(client.send_request(self.request))
+
+        self.assertEqual(response.json_body, {'id': '123'})
+        self.assertEqual(failures, [])
+
+    def test_send_request_retries_writes_not_sent(self):
+        attempts = []
+        client = FakeAsyncFacebookClient(fake_response=None, retry_policy=RetryPolicy(backoff_factor=0, jitter=False))
+
+        async def send(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) == 1:
+                raise aiohttp.ClientConnectorError(connection_key=None, os_error=OSError(111, 'Connection refused'))
+            raise aiohttp.ServerDisconnectedError()
+
+        client.send = send
+
+        with self.assertRaises(aiohttp.ServerDisconnectedError):
+            run(client.send_request(FacebookRequest(endpoint='me/feed', method='POST', access_token='fake_token')))
+        self.assertEqual(len(attempts), 2)
+
+
+class TestAsyncOAuth2Client(TestCase):
+    def test_get_long_lived_access_token(self):
+        client = FakeAsyncFacebookClient(fake_response=FakeResponse(
+            status_code=200,
+            content='{"access_token": "my_access_token", "expires": "1422115200"}',
+            headers={},
+        ))
+        oauth_client = AsyncOAuth2Client(app=FacebookApp('app_id', 'secret'), client=client)
+        access_token = run(oauth_client.get_long_lived_access_token(access_token='foo_token'))
+
+        self.assertIsInstance(access_token, AccessToken)
+        self.assertEqual(str(access_token), 'my_access_token')
+        self.assertEqual(oauth_client.last_request.params['fb_exchange_token'], 'foo_token')
+
+    def test_debug_tokens(self):
+        client = FakeAsyncFacebookClient(fake_response=FakeResponse(
+            status_code=200,
+            content='[{"code": 200, "body": "{\\"data\\": {\\"is_valid\\": true}}"}]',
+            headers={},
+        ))
+        oauth_client = AsyncOAuth2Client(app=FacebookApp('app_id', 'secret'), client=client)
+
+        self.assertEqual(run(oauth_client.debug_tokens(['foo_token'])), {'foo_token': {'is_valid': True}})
+        self.assertTrue(oauth_client.is_valid('foo_token'))
+        self.assertEqual(run(oauth_client.debug_token('foo_token')), {'data': {'is_valid': True}})
+
+
+class TestAsyncFacebook(TestCase):
+    def setUp(self):
+        super(TestAsyncFacebook, self).setUp()
+        self.facebook = AsyncFacebook(
+            app_id='123',
+            app_secret='secret',
+            default_access_token='my_token',
+        )
+
+    def test_initialize(self):
+        self.assertIsInstance(self.facebook.client, AsyncFacebookClient)
+        self.assertIsInstance(self.facebook.oauth_client, AsyncOAuth2Client)
+        self.assertIs(self.facebook.oauth_client.client, self.facebook.client)
+
+    def test_get(self):
+        self.facebook.client = FakeAsyncFacebookClient(fake_response=FakeResponse(
+            status_code=200,
+            content='{"id": "123"}',
+            headers={},
+        ))
+        response = run(self.facebook.get(endpoint='/me'))
+
+        self.assertEqual(response.request.method, 'GET')
+        self.assertEqual(response.request.access_token, 'my_token')
+        self.assertEqual(response.json_body, {'id': '123'})
+
+    def test_get_many(self):
+        self.facebook.client = FakeAsyncFacebookClient(fake_response=FakeResponse(
+            status_code=200,
+            content='[{"code": 200, "body": "{\\"1\\": {\\"id\\": \\"1\\"}, \\"2\\": {\\"id\\": \\"2\\"}}"}]',
+            headers={},
+        ))
+
+        results = run(self.facebook.get_many(ids=['1', '2'], fields='id'))
+
+        self.assertEqual(results, {'1': {'id': '1'}, '2': {'id': '2'}})
+
+    def test_paginate(self):
+        self.facebook.client = FakeAsyncPagesClient(pages=[[{'id': '1'}], [{'id': '2'}, {'id': '3'}]])
+
+        items = run(collect(self.facebook.paginate(endpoint='/me/feed')))
+
+        self.assertEqual([item['id'] for item in items], ['1', '2', '3'])
+
+    def test_upload_video(self):
+        responses = [
+            '{"video_id": "42", "upload_session_id": "7", "start_offset": "0", "end_offset": "50"}',
+            '{"error": {"code": 6000, "error_subcode": 1363037, "message": "Retry"}}',
+            '{"start_offset": "50", "end_offset": "50"}',
+            '{"success": true}',
+        ]
+        client = FakeAsyncFacebookClient(fake_response=None)
+
+        async def send(**kwargs):
+            content = responses.pop(0)
+            return FakeResponse(status_code=500 if 'error' in content else 200, content=content, headers={})
+
+        client.send = send
+        self.facebook.client = client
+        file_path = '{base_path}/foo.txt'.format(base_path=os.path.dirname(os.path.abspath(__file__)))
+
+        result = run(self.facebook.upload_video(target='me', path=file_path))
+
+        self.assertEqual(result, {'video_id': '42', 'success': True})
+        self.assertEqual(responses, [])
+
+
+class TestAsyncIteration(TestCase):
+    def test_aiter_items_with_prefetch(self):
+        client = FakeAsyncPagesClient(pages=[[{'id': '1'}, {'id': '2'}], [{'id': '3'}], [{'id': '4'}]])
+        response = client.build_response(
+            request=FacebookRequest(endpoint='/me/feed', method='GET', access_token='fake_token'),
+            index=0,
+        )
+
+        items = run(collect(aiter_items(response, client=client, max_items=3, prefetch=True)))
+
+        self.assertEqual([item['id'] for item in items], ['1', '2', '3'])
+
+
+class TestAsyncCoalescing(TestCase):
+    def test_identical_requests_are_sent_once(self):
+        class SlowClient(AsyncFacebookClient):
+            sent = 0
+
+            async def send(self, **kwargs):
+                SlowClient.sent += 1
+                await asyncio.sleep(0.01)
+                return FakeResponse(status_code=200, content='{"id": "me"}', headers={})
+
+        client = SlowClient(coalesce_requests=True)
+        requests = [FacebookRequest(endpoint='me', method='GET', access_token='fake_token') for _ in range(3)]
+
+        async def send_all():
+            return await asyncio.gather(*[client.send_request(request) for request in requests])
+
+        responses = run(send_all())
+
+        self.assertEqual(SlowClient.sent, 1)
+        self.assertEqual([response.request for response in responses], requests)
+        self.assertEqual(client.coalescer._calls, {})
+
+    def test_cancelled_leader_cancels_the_waiting_requests(self):
+        class SlowClient(AsyncFacebookClient):
+            async def send(self, **kwargs):
+                await asyncio.sleep(1)
+
+        client = SlowClient(coalesce_requests=True)
+
+        async def cancel_leader():
+            leader, follower = [
+                asyncio.ensure_future(client.send_request(
+                    FacebookRequest(endpoint='me', method='GET', access_token='fake_token'),
+                ))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await asyncio.wait_for(follower, 0.5)
+
+        run(cancel_leader())
+
+        self.assertEqual(client.coalescer._calls, {})
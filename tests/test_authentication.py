@@ -1,14 +1,38 @@
 import datetime
+import json
+import time
 from unittest import TestCase
 
 from facebook_sdk import __version__ as VERSION
 from facebook_sdk.authentication import AccessToken, OAuth2Client
+from facebook_sdk.client import FacebookClient
 from facebook_sdk.facebook import FacebookApp
+from facebook_sdk.response import FacebookResponse
 from tests import FakeOAuth2Client
 
 from six.moves.urllib.parse import quote_plus
 
 
+class FakeDebugTokenClient(FacebookClient):
+    """ Answer the /debug_token entries of the batches with the metadata of the known tokens."""
+
+    def __init__(self, metadata):
+        super(FakeDebugTokenClient, self).__init__()
+        self.metadata = metadata
+        self.batches = []
+
+    def send_request(self, request):
+        tokens = [record['request'].params['input_token'] for record in request.requests]
+        self.batches.append(tokens)
+
+        entries = [
+            {'code': 200, 'body': json.dumps({'data': self.metadata[token]})} if token in self.metadata else
+            {'code': 400, 'body': json.dumps({'error': {'code': 100, 'message': 'Invalid input_token'}})}
+            for token in tokens
+        ]
+        return FacebookResponse(request=request, body=json.dumps(entries), http_status_code=200)
+
+
 class TestAccessToken(TestCase):
     def setUp(self):
         super(TestAccessToken, self).setUp()
@@ -19,6 +43,8 @@ class TestAccessToken(TestCase):
         access_token = AccessToken(self.foo_token)
 
         self.assertEqual(access_token.access_token, self.foo_token)
+        self.assertIsNone(access_token.expires_at)
+        self.assertFalse(hasattr(access_token, '__dict__'))
 
     def test_is_valid_access_token(self):
         access_token = AccessToken(self.foo_token)
@@ -87,6 +113,42 @@ class OAuth2ClientTest(TestCase):
         self.assertEqual(request.graph_version, 'v2.12')
         self.assertDictEqual(request.params, expected_params)
 
+    def test_debug_token_is_cached(self):
+        fb_client = FakeOAuth2Client(http_status_code=200, body='{"data": {"is_valid": true}}', headers=[])
+        oauth_client = OAuth2Client(app=self.app, client=fb_client)
+
+        oauth_client.debug_token(access_token='foo_token')
+        fb_client.body = '{"data": {"is_valid": false}}'
+
+        self.assertEqual(oauth_client.debug_token(access_token='foo_token'), {'data': {'is_valid': True}})
+        self.assertTrue(oauth_client.is_valid('foo_token'))
+
+    def test_debug_tokens(self):
+        now = int(time.time())
+        metadata = dict(('token-%d' % index, {'is_valid': True, 'expires_at': 0}) for index in range(120))
+        metadata['expired'] = {'is_valid': True, 'expires_at': now - 10}
+        metadata['invalid'] = {'is_valid': False, 'expires_at': 0}
+        metadata['expiring'] = {'is_valid': True, 'expires_at': now + 3600 * 24}
+        fb_client = FakeDebugTokenClient(metadata)
+        oauth_client = OAuth2Client(app=self.app, client=fb_client)
+        access_tokens = list(metadata) + ['unknown', 'token-0']
+
+        result = oauth_client.debug_tokens(access_tokens)
+
+        self.assertEqual(result, metadata)
+        self.assertEqual(sorted(len(batch) for batch in fb_client.batches), [24, 50, 50])
+        self.assertEqual(oauth_client.debug_tokens(['token-1', AccessToken('expiring')]), {
+            'token-1': metadata['token-1'],
+            'expiring': metadata['expiring'],
+        })
+        self.assertEqual(len(fb_client.batches), 3)
+
+        self.assertTrue(oauth_client.is_valid('token-0'))
+        self.assertTrue(oauth_client.is_valid('expiring'))
+        self.assertFalse(oauth_client.is_valid('invalid'))
+        self.assertIsNone(oauth_client.is_valid('expired'))
+        self.assertIsNone(oauth_client.is_valid('unknown'))
+
     def test_get_authorization_url(self):
         oauth_client = OAuth2Client(app=self.app, client=None, graph_version='v2.12')
         scope = ['email', 'base_foo']
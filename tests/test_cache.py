@@ -0,0 +1,146 @@
+from unittest import TestCase
+
+from facebook_sdk.cache import (
+    LRUCache,
+    ResponseCache,
+)
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.request import FacebookRequest
+from tests import FakeResponse
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCachedClient(FacebookClient):
+    def __init__(self, responses, **kwargs):
+        super(FakeCachedClient, self).__init__(**kwargs)
+        self.responses = list(responses)
+        self.sent = []
+
+    def send(self, **kwargs):
+        self.sent.append(dict(kwargs, headers=dict(kwargs['headers'])))
+        return self.responses.pop(0)
+
+
+class TestLRUCache(TestCase):
+    def setUp(self):
+        super(TestLRUCache, self).setUp()
+        self.clock = FakeClock()
+        self.cache = LRUCache(max_size=2, clock=self.clock)
+
+    def test_get_set(self):
+        self.cache.set('foo', 'bar')
+
+        self.assertEqual(self.cache.get('foo'), 'bar')
+        self.assertIsNone(self.cache.get('baz'))
+
+    def test_expiration(self):
+        self.cache.set('foo', 'bar', ttl=10)
+        self.clock.now += 10
+
+        self.assertIsNone(self.cache.get('foo'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), 3)
+
+    def test_delete(self):
+        self.cache.set('a', 1)
+        self.cache.delete('a')
+
+        self.assertIsNone(self.cache.get('a'))
+
+
+class TestResponseCache(TestCase):
+    def setUp(self):
+        super(TestResponseCache, self).setUp()
+        self.clock = FakeClock()
+        self.cache = ResponseCache(default_ttl=10, ttls={'/debug_token': 300}, clock=self.clock)
+
+    def build_request(self, endpoint='/me', access_token='token', params=None, method='GET'):
+        return FacebookRequest(endpoint=endpoint, access_token=access_token, params=params, method=method)
+
+    def test_key(self):
+        key = self.cache.key(self.build_request(params={'b': '2', 'a': '1'}))
+
+        self.assertEqual(key, self.cache.key(self.build_request(params={'a': '1', 'b': '2'})))
+        self.assertNotEqual(key, self.cache.key(self.build_request(params={'a': '1', 'b': '3'})))
+        self.assertNotEqual(key, self.cache.key(self.build_request(params={'a': '1', 'b': '2'}, access_token='other')))
+        self.assertNotIn('access_token', key)
+
+    def test_is_cacheable(self):
+        self.assertTrue(self.cache.is_cacheable(self.build_request()))
+        self.assertFalse(self.cache.is_cacheable(self.build_request(method='POST')))
+
+    def test_ttl(self):
+        self.assertEqual(self.cache.ttl(self.build_request(endpoint='/debug_token?input_token=foo')), 300)
+        self.assertEqual(self.cache.ttl(self.build_request(endpoint='me')), 10)
+
+    def test_client_serves_fresh_responses_from_cache(self):
+        client = FakeCachedClient(cache=self.cache, responses=[
+            FakeResponse(status_code=200, content='{"id": "1"}', headers={}),
+            FakeResponse(status_code=200, content='{"id": "2"}', headers={}),
+        ])
+
+        first = client.send_request(self.build_request())
+        second = client.send_request(self.build_request())
+        self.clock.now += 10
+        third = client.send_request(self.build_request())
+
+        self.assertEqual(first.json_body, {'id': '1'})
+        self.assertEqual(second.json_body, {'id': '1'})
+        self.assertEqual(third.json_body, {'id': '2'})
+        self.assertEqual(len(client.sent), 2)
+
+    def test_client_caches_responses_without_body(self):
+        client = FakeCachedClient(cache=self.cache, keep_response_body=False, responses=[
+            FakeResponse(status_code=200, content='{"message": "error"}', headers={}),
+        ])
+
+        first = client.send_request(self.build_request())
+        second = client.send_request(self.build_request())
+
+        self.assertIsNone(first.body)
+        self.assertEqual(second.json_body, {'message': 'error'})
+
+    def test_client_revalidates_with_etag(self):
+        client = FakeCachedClient(cache=self.cache, responses=[
+            FakeResponse(status_code=200, content='{"id": "1"}', headers={'ETag': '"abc"'}),
+            FakeResponse(status_code=304, content='', headers={'ETag': '"abc"'}),
+        ])
+        request = self.build_request()
+
+        client.send_request(request)
+        self.clock.now += 10
+        response = client.send_request(request)
+
+        self.assertEqual(response.json_body, {'id': '1'})
+        self.assertEqual(client.sent[1]['headers']['If-None-Match'], '"abc"')
+        self.assertNotIn('If-None-Match', request.headers)
+
+        self.assertEqual(client.send_request(request).json_body, {'id': '1'})
+        self.assertEqual(len(client.sent), 2)
+
+    def test_client_does_not_cache_errors(self):
+        client = FakeCachedClient(cache=self.cache, responses=[
+            FakeResponse(status_code=400, content='{"error": {"code": 100}}', headers={}),
+            FakeResponse(status_code=200, content='{"id": "1"}', headers={}),
+        ])
+
+        with self.assertRaises(Exception):
+            client.send_request(self.build_request())
+
+        self.assertEqual(client.send_request(self.build_request()).json_body, {'id': '1'})
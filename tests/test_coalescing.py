@@ -0,0 +1,122 @@
+import threading
+import time
+from unittest import TestCase
+
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.coalescing import RequestCoalescer
+from facebook_sdk.exceptions import FacebookServerException
+from facebook_sdk.request import FacebookRequest
+from tests import FakeResponse
+
+
+class BlockingFacebookClient(FacebookClient):
+    """ Hold every request until `release` is set."""
+
+    def __init__(self, response, **kwargs):
+        super(BlockingFacebookClient, self).__init__(**kwargs)
+        self.response = response
+        self.release = threading.Event()
+        self.sent = []
+
+    def send(self, **kwargs):
+        self.sent.append(kwargs)
+        self.release.wait()
+        return self.response
+
+
+class Interrupted(BaseException):
+    pass
+
+
+class InterruptedFacebookClient(BlockingFacebookClient):
+    def send(self, **kwargs):
+        super(InterruptedFacebookClient, self).send(**kwargs)
+        raise Interrupted()
+
+
+class TestRequestCoalescer(TestCase):
+    def build_request(self, endpoint='me'):
+        return FacebookRequest(endpoint=endpoint, method='GET', access_token='fake_token')
+
+    def send_concurrently(self, client, requests):
+        results = [None] * len(requests)
+        entered = []
+        execute = client.coalescer.execute
+
+        def counting_execute(request, send):
+            entered.append(request)
+            return execute(request, send)
+
+        client.coalescer.execute = counting_execute
+
+        def send(index):
+            try:
+                results[index] = client.send_request(requests[index])
+            except BaseException as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=send, args=(index,)) for index in range(len(requests))]
+        for thread in threads:
+            thread.start()
+        while len(entered) < len(requests):
+            time.sleep(0.001)
+        # Let the last callers reach the in-flight call before the leader completes it.
+        time.sleep(0.05)
+        client.release.set()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def test_is_coalescable(self):
+        coalescer = RequestCoalescer()
+
+        self.assertTrue(coalescer.is_coalescable(self.build_request()))
+        self.assertFalse(coalescer.is_coalescable(FacebookRequest(endpoint='me', method='POST')))
+
+    def test_identical_requests_are_sent_once(self):
+        client = BlockingFacebookClient(
+            response=FakeResponse(status_code=200, content='{"id": "me"}', headers={}),
+            coalesce_requests=True,
+        )
+        requests = [self.build_request() for _ in range(5)]
+
+        responses = self.send_concurrently(client, requests)
+
+        self.assertEqual(len(client.sent), 1)
+        for request, response in zip(requests, responses):
+            self.assertIs(response.request, request)
+            self.assertEqual(response.json_body, {'id': 'me'})
+        self.assertEqual(client.coalescer._calls, {})
+
+    def test_distinct_requests_are_not_coalesced(self):
+        client = BlockingFacebookClient(
+            response=FakeResponse(status_code=200, content='{"id": "me"}', headers={}),
+            coalesce_requests=True,
+        )
+
+        self.send_concurrently(client, [self.build_request('me'), self.build_request('you')])
+
+        self.assertEqual(len(client.sent), 2)
+
+    def test_exceptions_are_shared(self):
+        client = BlockingFacebookClient(
+            response=FakeResponse(status_code=500, content='{"error": {"code": 2}}', headers={}),
+            coalesce_requests=True,
+        )
+
+        results = self.send_concurrently(client, [self.build_request() for _ in range(3)])
+
+        self.assertEqual(len(client.sent), 1)
+        for result in results:
+            self.assertIsInstance(result, FacebookServerException)
+
+    def test_interruptions_are_shared(self):
+        client = InterruptedFacebookClient(response=None, coalesce_requests=True)
+
+        results = self.send_concurrently(client, [self.build_request() for _ in range(3)])
+
+        self.assertEqual(len(client.sent), 1)
+        for result in results:
+            self.assertIsInstance(result, Interrupted)
+        self.assertEqual(client.coalescer._calls, {})
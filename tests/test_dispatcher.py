@@ -0,0 +1,163 @@
+import json
+import threading
+from unittest import TestCase
+
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.dispatcher import BatchDispatcher
+from facebook_sdk.exceptions import (
+    FacebookResponseException,
+    FacebookSDKException,
+    FacebookServerException,
+)
+from facebook_sdk.facebook import Facebook
+from facebook_sdk.request import FacebookRequest
+from facebook_sdk.response import (
+    FacebookBatchResponse,
+    FacebookResponse,
+)
+
+
+class EchoFacebookClient(FacebookClient):
+    """ Answer every request with its endpoint, or with an error for the 'error' endpoint."""
+
+    def __init__(self, **kwargs):
+        super(EchoFacebookClient, self).__init__(**kwargs)
+        self.lock = threading.Lock()
+        self.batches = []
+        self.requests = []
+
+    def send_request(self, request):
+        with self.lock:
+            self.requests.append(request)
+        return FacebookResponse(
+            request=request,
+            http_status_code=200,
+            body=json.dumps({'endpoint': request.endpoint}),
+            headers={},
+        )
+
+    def send_batch_request(self, batch_request, chunked=False, max_workers=None):
+        with self.lock:
+            self.batches.append(batch_request)
+
+        entries = []
+        for record in batch_request.requests:
+            if record['request'].endpoint == '/not_run':
+                entries.append(None)
+            elif record['request'].endpoint == '/error':
+                entries.append({'code': 400, 'body': json.dumps({'error': {'code': 100, 'message': 'Invalid'}})})
+            else:
+                entries.append({'code': 200, 'body': json.dumps({'endpoint': record['request'].endpoint})})
+
+        response = FacebookResponse(
+            request=batch_request,
+            http_status_code=200,
+            body=json.dumps(entries),
+            headers={},
+        )
+        return FacebookBatchResponse(batch_request=batch_request, batch_response=response)
+
+
+class TestBatchDispatcher(TestCase):
+    def build_request(self, endpoint):
+        return FacebookRequest(endpoint=endpoint, method='GET', access_token='fake_token')
+
+    def test_requests_submitted_together_are_batched(self):
+        client = EchoFacebookClient()
+        dispatcher = BatchDispatcher(client=client, max_delay=10)
+
+        futures = [dispatcher.submit(self.build_request('/page_%d' % index)) for index in range(3)]
+        dispatcher.close()
+
+        self.assertEqual(len(client.batches), 1)
+        self.assertEqual(client.batches[0].access_token, 'fake_token')
+        self.assertEqual(
+            [future.result().json_body for future in futures],
+            [{'endpoint': '/page_0'}, {'endpoint': '/page_1'}, {'endpoint': '/page_2'}],
+        )
+
+    def test_batches_are_limited_to_max_size(self):
+        client = EchoFacebookClient()
+        dispatcher = BatchDispatcher(client=client, max_delay=10, max_size=2)
+
+        futures = [dispatcher.submit(self.build_request('/page_%d' % index)) for index in range(5)]
+        dispatcher.close()
+
+        self.assertEqual(sorted(len(batch.requests) for batch in client.batches), [2, 2])
+        self.assertEqual(len(client.requests), 1)
+        self.assertEqual(futures[4].result().json_body, {'endpoint': '/page_4'})
+
+    def test_single_request_is_not_batched(self):
+        client = EchoFacebookClient()
+        dispatcher = BatchDispatcher(client=client, max_delay=0)
+
+        response = dispatcher.submit(self.build_request('/me')).result()
+        dispatcher.close()
+
+        self.assertEqual(client.batches, [])
+        self.assertEqual(response.json_body, {'endpoint': '/me'})
+
+    def test_failed_entry_raises_its_exception(self):
+        client = EchoFacebookClient()
+        dispatcher = BatchDispatcher(client=client, max_delay=10)
+
+        success = dispatcher.submit(self.build_request('/me'))
+        failure = dispatcher.submit(self.build_request('/error'))
+        dispatcher.close()
+
+        self.assertEqual(success.result().json_body, {'endpoint': '/me'})
+        self.assertIsInstance(failure.exception(), FacebookResponseException)
+
+    def test_entry_not_run_raises(self):
+        client = EchoFacebookClient()
+        dispatcher = BatchDispatcher(client=client, max_delay=10)
+
+        dispatcher.submit(self.build_request('/me'))
+        not_run = dispatcher.submit(self.build_request('/not_run'))
+        dispatcher.close()
+
+        self.assertIsInstance(not_run.exception(), FacebookServerException)
+
+    def test_invalid_max_size(self):
+        with self.assertRaises(FacebookSDKException):
+            BatchDispatcher(client=EchoFacebookClient(), max_size=51)
+
+    def test_submit_after_close(self):
+        dispatcher = BatchDispatcher(client=EchoFacebookClient())
+        dispatcher.close()
+
+        with self.assertRaises(FacebookSDKException):
+            dispatcher.submit(self.build_request('/me'))
+
+
+class TestFacebookAutoBatch(TestCase):
+    def test_concurrent_calls_are_batched(self):
+        facebook = Facebook(
+            app_id='123',
+            app_secret='foo_secret',
+            default_access_token='fake_token',
+            auto_batch=True,
+            auto_batch_max_delay=10,
+            auto_batch_max_size=4,
+        )
+        facebook.client = facebook.dispatcher.client = EchoFacebookClient()
+
+        results = {}
+
+        def get(index):
+            results[index] = facebook.get(endpoint='/page_%d' % index).json_body
+
+        threads = [threading.Thread(target=get, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        facebook.close()
+
+        self.assertEqual(len(facebook.client.batches), 1)
+        self.assertEqual(results, dict((index, {'endpoint': '/page_%d' % index}) for index in range(4)))
+
+    def test_disabled_by_default(self):
+        facebook = Facebook(app_id='123', app_secret='foo_secret')
+
+        self.assertIsNone(facebook.dispatcher)
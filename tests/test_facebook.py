@@ -7,7 +7,7 @@ from facebook_sdk.exceptions import FacebookSDKException
 from facebook_sdk.facebook import FacebookApp, Facebook
 from facebook_sdk.facebook_file import FacebookFile
 from facebook_sdk.response import FacebookResponse
-from tests import FakeFacebookClient, FakeResponse
+from tests import FakeFacebookClient, FakePagesClient, FakeResponse
 
 
 class TestFacebook(TestCase):
@@ -32,6 +32,17 @@ class TestFacebook(TestCase):
         self.assertEqual(str(self.facebook.default_access_token), 'my_token')
         self.assertEqual(self.facebook.client.timeout, 10)
 
+    def test_initialize_connection_pool(self):
+        facebook = Facebook(
+            app_id='123',
+            app_secret='secret',
+            http_pool_maxsize=30,
+        )
+
+        adapter = facebook.client.session.get_adapter('https://graph.facebook.com')
+        self.assertEqual(adapter._pool_maxsize, 30)
+        self.assertIs(facebook.oauth_client.client, facebook.client)
+
     def test_initialize_required_app_id_config(self):
         with self.assertRaises(FacebookSDKException):
             Facebook()
@@ -50,6 +61,19 @@ class TestFacebook(TestCase):
                 default_access_token=12345,
             )
 
+    def test_send_request_with_appsecret_proof(self):
+        facebook = Facebook(app_id='123', app_secret='secret', enable_appsecret_proof=True)
+        facebook.client = FakeFacebookClient(
+            fake_response=FakeResponse(status_code=200, content='{}', headers={}),
+        )
+
+        facebook.send_request(method='GET', endpoint='me', access_token='foo_token')
+
+        self.assertEqual(
+            facebook.client.send_kwargs['params']['appsecret_proof'],
+            AccessToken('foo_token').app_secret_proof('secret'),
+        )
+
     def test_send_request(self):
         self.facebook.client = FakeFacebookClient(
             fake_response=FakeResponse(
@@ -179,6 +203,15 @@ class TestFacebook(TestCase):
         )
         self.assertEqual(response.request.method, 'DELETE')
 
+    def test_paginate(self):
+        self.facebook.client = FakePagesClient(pages=[[{'id': '1'}], [{'id': '2'}, {'id': '3'}], [{'id': '4'}]])
+
+        items = list(self.facebook.paginate(endpoint='/me/feed', max_items=2))
+
+        self.assertEqual(items, [{'id': '1'}, {'id': '2'}])
+        self.assertEqual(len(self.facebook.client.requests), 2)
+        self.assertEqual(self.facebook.client.requests[0].access_token, 'my_token')
+
     def test_file_to_upload(self):
         facebook_file = self.facebook.file_to_upload(path='{base_path}/foo.txt'.format(
             base_path=os.path.dirname(os.path.abspath(__file__))
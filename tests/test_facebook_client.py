@@ -1,7 +1,12 @@
 # coding=utf-8
+import json
 import os
 from unittest import TestCase
 
+import requests
+from six.moves.urllib.parse import parse_qs
+
+from facebook_sdk.client import FacebookClient
 from facebook_sdk.constants import BASE_GRAPH_URL
 from facebook_sdk.exceptions import FacebookResponseException, FacebookSDKException
 from facebook_sdk.facebook_file import FacebookFile
@@ -147,6 +152,97 @@ class TestFacebookClient(TestCase):
                 ),
             )
 
+    def test_send_chunked_batch_request(self):
+        self.client = ChunkedFakeFacebookClient()
+        requests = dict(
+            ('request-%d' % index, FacebookRequest(endpoint='%d' % index, method='GET'))
+            for index in range(120)
+        )
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests=requests)
+
+        response = self.client.send_batch_request(batch_request=batch_request, chunked=True, max_workers=3)
+
+        self.assertEqual(sorted(len(batch) for batch in self.client.batches), [20, 50, 50])
+        self.assertEqual(len(response.responses), 120)
+        for record, request_record in zip(response, batch_request):
+            self.assertEqual(record['name'], request_record['name'])
+            self.assertIs(record['response'].request, request_record['request'])
+            self.assertEqual(
+                record['response'].json_body,
+                {'id': request_record['request'].endpoint},
+            )
+
+    def test_send_chunked_batch_request_with_a_failed_chunk(self):
+        self.client = ChunkedFakeFacebookClient(failing_ids=('60',))
+        requests_by_name = dict(
+            ('request-%d' % index, FacebookRequest(endpoint='%d' % index, method='GET'))
+            for index in range(120)
+        )
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests=requests_by_name)
+
+        response = self.client.send_batch_request(batch_request=batch_request, chunked=True)
+
+        self.assertEqual(response.failed_indexes(), list(range(50, 100)))
+        self.assertIsInstance(response.responses[50]['response'].exception, requests.exceptions.ConnectionError)
+        self.assertEqual(response.responses[50]['name'], batch_request.requests[50]['name'])
+        self.assertEqual(response.responses[100]['response'].json_body, {'id': '100'})
+
+    def test_send_chunked_batch_request_under_limit(self):
+        self.client = ChunkedFakeFacebookClient()
+        self.client.send_batch_request(batch_request=self.batch_request, chunked=True)
+
+        self.assertEqual(len(self.client.batches), 1)
+
+    def test_resend_failed_batch_entries(self):
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests={
+            'first': FacebookRequest(endpoint='1', method='GET'),
+            'second': FacebookRequest(endpoint='2', method='GET'),
+        })
+        failed_name = batch_request.requests[1]['name']
+        batch_response = FacebookBatchResponse(
+            batch_request=batch_request,
+            batch_response=FacebookResponse(
+                request=batch_request,
+                body='[{"code": 200, "body": "{}"}, {"code": 500, "body": "{\\"error\\": {\\"code\\": 2}}"}]',
+                http_status_code=200,
+            ),
+        )
+        self.client = FakeFacebookClient(fake_response=FakeResponse(
+            status_code=200,
+            content='[{"code": 200, "body": "{\\"id\\": \\"2\\"}"}]',
+            headers={},
+        ))
+
+        response = self.client.resend_failed_batch_entries(batch_response)
+
+        self.assertIs(response, batch_response)
+        self.assertIn('"name": "%s"' % failed_name, parse_qs(self.client.send_kwargs['data'])['batch'][0])
+        self.assertEqual(batch_response.failed_indexes(), [])
+        self.assertEqual(batch_response.responses[1]['name'], failed_name)
+        self.assertEqual(batch_response.responses[1]['response'].json_body, {'id': '2'})
+
+    def test_resend_failed_batch_entries_over_limit(self):
+        requests = dict(
+            ('request-%d' % index, FacebookRequest(endpoint='%d' % index, method='GET'))
+            for index in range(60)
+        )
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests=requests)
+        batch_response = FacebookBatchResponse(
+            batch_request=batch_request,
+            batch_response=FacebookResponse(
+                request=batch_request,
+                body=json.dumps([{'code': 500, 'body': '{"error": {"code": 2}}'}] * 60),
+                http_status_code=200,
+            ),
+        )
+        self.client = ChunkedFakeFacebookClient()
+
+        self.client.resend_failed_batch_entries(batch_response, max_workers=2)
+
+        self.assertEqual(sorted(len(batch) for batch in self.client.batches), [10, 50])
+        self.assertEqual(batch_response.failed_indexes(), [])
+        self.assertEqual(batch_response.responses[59]['response'].json_body, {'id': '59'})
+
     def test_send_over_limit_batch_request(self):
         requests = [self.request] * 51
         with self.assertRaises(FacebookSDKException):
@@ -156,3 +252,85 @@ class TestFacebookClient(TestCase):
                     requests=requests,
                 ),
             )
+
+
+class ChunkedFakeFacebookClient(FacebookClient):
+    """ Answer each batch with the endpoint of each request as its id, failing the batches of `failing_ids`."""
+
+    def __init__(self, failing_ids=()):
+        super(ChunkedFakeFacebookClient, self).__init__()
+        self.failing_ids = failing_ids
+        self.batches = []
+
+    def send(self, **kwargs):
+        batch = json.loads(parse_qs(kwargs['data'])['batch'][0])
+        self.batches.append(batch)
+        if any(request['relative_url'].split('/')[2].split('?')[0] in self.failing_ids for request in batch):
+            raise requests.exceptions.ConnectionError()
+        body = [
+            {'code': 200, 'body': json.dumps({'id': request['relative_url'].split('/')[2].split('?')[0]})}
+            for request in batch
+        ]
+        return FakeResponse(status_code=200, content=json.dumps(body), headers={})
+
+
+class FakeSession(object):
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+        self.closed = False
+
+    def request(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.response
+
+    def close(self):
+        self.closed = True
+
+
+class TestFacebookClientSession(TestCase):
+    def test_default_session(self):
+        client = FacebookClient()
+
+        self.assertIsInstance(client.session, requests.Session)
+        adapter = client.session.get_adapter(BASE_GRAPH_URL)
+        self.assertEqual(adapter._pool_connections, 10)
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    def test_configured_session(self):
+        client = FacebookClient(
+            pool_connections=2,
+            pool_maxsize=25,
+            pool_block=True,
+            max_retries=3,
+            keep_alive=False,
+        )
+
+        adapter = client.session.get_adapter(BASE_GRAPH_URL)
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(client.session.headers['Connection'], 'close')
+
+    def test_send_reuses_session(self):
+        session = FakeSession(response=FakeResponse(
+            status_code=200,
+            content='{"id": "123"}',
+            headers={},
+        ))
+        client = FacebookClient(session=session)
+
+        client.send_request(FacebookRequest(endpoint='me', method='GET', access_token='fake_token'))
+        client.send_request(FacebookRequest(endpoint='you', method='GET', access_token='fake_token'))
+
+        self.assertEqual(len(session.calls), 2)
+        self.assertEqual(session.calls[1]['url'], 'https://graph.facebook.com/v2.12/you')
+
+    def test_close(self):
+        session = FakeSession(response=None)
+        client = FacebookClient(session=session)
+        client.close()
+
+        self.assertTrue(session.closed)
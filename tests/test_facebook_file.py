@@ -1,6 +1,8 @@
 import os
 from unittest import TestCase
 
+import six
+
 from facebook_sdk.exceptions import FacebookSDKException
 from facebook_sdk.facebook_file import FacebookFile
 
@@ -28,3 +30,52 @@ class TestFacebookFile(TestCase):
             FacebookFile(
                 path='does_not_exist.path',
             )
+
+    def test_read_by_chunks(self):
+        with open(self.file_path, mode='rb') as f:
+            content = f.read()
+
+        self.assertEqual(self.facebook_file.read(3), content[:3])
+        self.assertEqual(self.facebook_file.tell(), 3)
+        self.assertEqual(self.facebook_file.read(), content[3:])
+        self.assertEqual(self.facebook_file.tell(), 0)
+
+        self.facebook_file.seek(2)
+        self.assertEqual(self.facebook_file.read(2), content[2:4])
+        self.facebook_file.close()
+
+    def test_iter_chunks(self):
+        with open(self.file_path, mode='rb') as f:
+            content = f.read()
+
+        chunks = list(self.facebook_file.iter_chunks(chunk_size=2))
+
+        self.assertEqual(b''.join(chunks), content)
+        self.assertTrue(all(len(chunk) <= 2 for chunk in chunks))
+
+    def test_size(self):
+        self.assertEqual(len(self.facebook_file), os.path.getsize(self.file_path))
+
+    def test_partial_file(self):
+        with open(self.file_path, mode='rb') as f:
+            content = f.read()
+
+        partial_file = FacebookFile(path=self.file_path, max_length=10, offset=5)
+
+        self.assertEqual(len(partial_file), 10)
+        self.assertEqual(partial_file.read(4), content[5:9])
+        self.assertEqual(partial_file.read(), content[9:15])
+        self.assertEqual(b''.join(partial_file.iter_chunks(chunk_size=3)), content[5:15])
+
+    def test_iter_mapped_chunks(self):
+        with open(self.file_path, mode='rb') as f:
+            content = f.read()
+
+        mapped_file = FacebookFile(path=self.file_path, max_length=10, offset=5, use_mmap=True)
+        chunks = list(mapped_file.iter_chunks(chunk_size=4))
+
+        # Python 2 memoryviews do not support mmap, the file is read instead.
+        chunk_type = bytes if six.PY2 else memoryview
+        self.assertTrue(all(isinstance(chunk, chunk_type) for chunk in chunks))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+        self.assertEqual(b''.join(chunks), content[5:15])
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import copy
+import json
 import os
 from unittest import TestCase
 
+from six.moves.urllib.parse import parse_qsl
+
 from facebook_sdk.constants import DEFAULT_GRAPH_VERSION, METHOD_POST, METHOD_GET, METHOD_DELETE
 from facebook_sdk.exceptions import FacebookSDKException
+from facebook_sdk.facebook import FacebookApp
 from facebook_sdk.facebook_file import FacebookFile
 from facebook_sdk.request import FacebookBatchRequest, FacebookRequest
 from facebook_sdk.utils import force_slash_prefix
@@ -56,6 +61,40 @@ class TestFacebookRequest(TestCase):
         self.assertIsInstance(request.params, dict)
         self.assertEqual(request.graph_version, DEFAULT_GRAPH_VERSION)
 
+    def test_copy(self):
+        request = FacebookRequest(endpoint='/foo', access_token='fake_token', method=METHOD_GET, params={'a': 'b'})
+        request_copy = copy.copy(request)
+
+        self.assertFalse(hasattr(request, '__dict__'))
+        self.assertEqual(request_copy.url, request.url)
+        self.assertEqual(request_copy.params, request.params)
+
+    def test_derived_values_follow_changes(self):
+        request = FacebookRequest(endpoint='/foo', access_token='fake_token', method=METHOD_GET, params={'a': 'b'})
+        self.assertEqual(request.batch_url, '/{version}/foo?a=b&access_token=fake_token'.format(
+            version=DEFAULT_GRAPH_VERSION,
+        ))
+
+        request.endpoint = '/bar'
+        request.graph_version = 'v2.5'
+        request.params = {'c': 'd'}
+        request.access_token = 'other_token'
+        self.assertEqual(request.url, '/v2.5/bar')
+        self.assertEqual(
+            dict(parse_qsl(request.batch_url.split('?')[1])),
+            {'a': 'b', 'c': 'd', 'access_token': 'other_token'},
+        )
+
+        request.method = METHOD_POST
+        self.assertEqual(request.batch_url, '/v2.5/bar')
+        self.assertEqual(dict(parse_qsl(request.url_encode_body)), {'a': 'b', 'c': 'd'})
+
+    def test_params_are_copies(self):
+        request = FacebookRequest(endpoint='/foo', access_token='fake_token', method=METHOD_GET)
+        request.params.pop('access_token')
+
+        self.assertEqual(request.params, {'access_token': 'fake_token'})
+
     def test_endpoint_url(self):
         request = FacebookRequest(endpoint='/foo')
         self.assertEqual(request.url, force_slash_prefix(DEFAULT_GRAPH_VERSION) + '/foo')
@@ -206,6 +245,74 @@ class TestFacebookBatchRequest(TestCase):
         self.assertTrue(batch_request.post_params['include_headers'])
 
 
+    def test_appsecret_proof_of_every_entry(self):
+        app = FacebookApp(app_id='123', app_secret='secret', enable_appsecret_proof=True)
+        batch_request = FacebookBatchRequest(
+            app=app,
+            requests=[self.req1, FacebookRequest(access_token='other_token', endpoint='123', method=METHOD_POST)],
+            access_token='fake_token',
+        )
+
+        first, second = json.loads(batch_request.requests_to_json_str())
+
+        self.assertEqual(batch_request.params['appsecret_proof'], app.appsecret_proof('fake_token'))
+        self.assertEqual(
+            dict(parse_qsl(first['relative_url'].split('?')[1]))['appsecret_proof'],
+            app.appsecret_proof('fake_token'),
+        )
+        self.assertEqual(dict(parse_qsl(second['body'])), {'appsecret_proof': app.appsecret_proof('other_token')})
+
+    def test_split(self):
+        requests = dict(('request-%d' % index, self.req1) for index in range(5))
+        batch_request = FacebookBatchRequest(
+            access_token='fake_token',
+            graph_version='v2.7',
+            requests=requests,
+        )
+
+        chunks = batch_request.split(size=2)
+
+        self.assertEqual([len(chunk.requests) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(
+            [record['name'] for chunk in chunks for record in chunk],
+            [record['name'] for record in batch_request],
+        )
+        for chunk in chunks:
+            self.assertEqual(chunk.access_token, 'fake_token')
+            self.assertEqual(chunk.graph_version, 'v2.7')
+
+    def test_split_rejects_references_across_chunks(self):
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests={
+            'friends': FacebookRequest(endpoint='/me/friends', method='GET'),
+            'profiles': FacebookRequest(endpoint='/', method='GET', params={'ids': '{result=friends:$.data.*.id}'}),
+        })
+
+        self.assertEqual(len(batch_request.split(size=2)), 1)
+        with self.assertRaises(FacebookSDKException):
+            batch_request.split(size=1)
+
+    def test_split_keeps_attached_files(self):
+        requests = [
+            FacebookRequest(
+                endpoint='/foo',
+                method='POST',
+                params={
+                    'source': FacebookFile(
+                        path='{base_path}/foo.txt'.format(
+                            base_path=os.path.dirname(os.path.abspath(__file__))
+                        ),
+                    ),
+                },
+            ),
+            self.req1,
+        ]
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests=requests)
+
+        with_file, without_file = batch_request.split(size=1)
+
+        self.assertEqual(list(with_file.files), [batch_request.requests[0]['attached_files']])
+        self.assertFalse(without_file.files)
+
     def test_request_entity_to_batch_array(self):
         pass
 
@@ -2,10 +2,14 @@ import json
 from unittest import TestCase
 
 from facebook_sdk.constants import METHOD_GET, METHOD_POST
-from facebook_sdk.exceptions import FacebookResponseException, FacebookSDKException
+from facebook_sdk.exceptions import (
+    FacebookResponseException,
+    FacebookSDKException,
+    FacebookServerException,
+)
 from facebook_sdk.request import FacebookRequest
 from facebook_sdk.response import FacebookResponse, FacebookBatchResponse
-from tests import FakeFacebookRequest, FakeFacebookBatchRequest
+from tests import FakeFacebookRequest, FakeFacebookBatchRequest, FakePagesClient
 
 
 class TestFacebookResponse(TestCase):
@@ -56,6 +60,41 @@ class TestFacebookResponse(TestCase):
         )
         self.assertIsInstance(response.exception, FacebookResponseException)
 
+    def test_body_is_parsed_lazily(self):
+        response = FacebookResponse(
+            request=FakeFacebookRequest(),
+            body=b'{"data": [{"message": "no error here"}]}',
+            http_status_code=200,
+        )
+
+        self.assertFalse(response.is_error)
+        self.assertIsNone(response._json_body)
+        self.assertIsNone(response.exception)
+        self.assertEqual(response.json_body, {'data': [{'message': 'no error here'}]})
+
+    def test_drop_body_once_parsed(self):
+        response = FacebookResponse(
+            request=FakeFacebookRequest(),
+            body='{"id": "1"}',
+            http_status_code=200,
+            keep_body=False,
+        )
+
+        self.assertEqual(response.body, '{"id": "1"}')
+        self.assertEqual(response.json_body, {'id': '1'})
+        self.assertIsNone(response.body)
+        self.assertEqual(response.json_body, {'id': '1'})
+
+    def test_nested_error_key_is_not_an_error(self):
+        response = FacebookResponse(
+            request=FakeFacebookRequest(),
+            body=json.dumps({'data': [{'error': 'not a graph error'}]}),
+            http_status_code=200,
+        )
+
+        self.assertFalse(response.is_error)
+        self.assertIsNone(response.exception)
+
 
 class TestFacebookResponsePagination(TestCase):
     def setUp(self):
@@ -119,6 +158,48 @@ class TestFacebookResponsePagination(TestCase):
             self.response.next_page_request()
 
 
+class TestFacebookResponseIteration(TestCase):
+    def setUp(self):
+        super(TestFacebookResponseIteration, self).setUp()
+        self.client = FakePagesClient(pages=[[{'id': '1'}, {'id': '2'}], [{'id': '3'}], [{'id': '4'}, {'id': '5'}]])
+        self.response = self.client.build_response(
+            request=FacebookRequest(endpoint='/me/feed', method='GET', access_token='fake_token'),
+            index=0,
+        )
+
+    def test_iter_items(self):
+        items = self.response.iter_items(client=self.client)
+
+        self.assertEqual(next(items), {'id': '1'})
+        self.assertEqual(self.client.requests, [])
+        self.assertEqual([item['id'] for item in items], ['2', '3', '4', '5'])
+        self.assertEqual(len(self.client.requests), 2)
+
+    def test_iter_items_with_prefetch(self):
+        items = list(self.response.iter_items(client=self.client, prefetch=True))
+
+        self.assertEqual([item['id'] for item in items], ['1', '2', '3', '4', '5'])
+
+    def test_iter_items_max_items(self):
+        items = list(self.response.iter_items(client=self.client, max_items=3))
+
+        self.assertEqual([item['id'] for item in items], ['1', '2', '3'])
+        self.assertEqual(len(self.client.requests), 1)
+
+    def test_iter_pages_max_pages(self):
+        pages = list(self.response.iter_pages(client=self.client, max_pages=2))
+
+        self.assertEqual(len(pages), 2)
+        self.assertIs(pages[0], self.response)
+        self.assertEqual(len(self.client.requests), 1)
+
+    def test_iter_pages_stops_on_empty_page(self):
+        client = FakePagesClient(pages=[[{'id': '1'}], [], [{'id': '2'}]])
+        response = client.build_response(request=self.response.request, index=0)
+
+        self.assertEqual(len(list(response.iter_pages(client=client))), 2)
+
+
 class TestFacebookBatchResponse(TestCase):
     def setUp(self):
         super(TestFacebookBatchResponse, self).setUp()
@@ -156,6 +237,104 @@ class TestFacebookBatchResponse(TestCase):
             self.assertEqual(response_dict.get('name'), request_dict.get('name'))
             self.assertEqual(response_dict.get('response').request, request_dict.get('request'))
 
+    def test_iter_statuses(self):
+        response = FacebookResponse(
+            request=self.batch_request,
+            body=json.dumps([{'code': 200, 'body': '{"foo": "bar"}'}, {'code': 200, 'body': '{"success": true}'}]),
+            http_status_code=200,
+        )
+        batch_response = FacebookBatchResponse(batch_request=self.batch_request, batch_response=response)
+
+        self.assertEqual(
+            list(batch_response.iter_statuses()),
+            [(record['name'], 200) for record in self.batch_request],
+        )
+        self.assertEqual(batch_response.failed_indexes(), [])
+        self.assertEqual(batch_response.responses.built_records(), [])
+
+    def test_null_entry(self):
+        response = FacebookResponse(
+            request=self.batch_request,
+            body=json.dumps([{'code': 200, 'body': '{"foo": "bar"}'}, None]),
+            http_status_code=200,
+        )
+        batch_response = FacebookBatchResponse(batch_request=self.batch_request, batch_response=response)
+
+        self.assertIsNone(batch_response.responses.status_code(1))
+        self.assertIsNone(batch_response.responses[1]['response'].http_status_code)
+        self.assertEqual(batch_response.responses[0]['response'].json_body, {'foo': 'bar'})
+        self.assertIsInstance(batch_response.responses[1]['response'].exception, FacebookServerException)
+        self.assertEqual(batch_response.failed_indexes(), [1])
+        self.assertEqual(
+            [record['name'] for record in batch_response.failed_batch_request()],
+            [self.batch_request.requests[1]['name']],
+        )
+
+
+class TestFacebookBatchResponseFailures(TestCase):
+    def setUp(self):
+        super(TestFacebookBatchResponseFailures, self).setUp()
+        self.batch_request = FakeFacebookBatchRequest(requests={
+            'ok': FacebookRequest(endpoint='1', method=METHOD_GET),
+            'server': FacebookRequest(endpoint='2', method=METHOD_POST, params={'foo': 'bar'}),
+            'auth': FacebookRequest(endpoint='3', method=METHOD_GET),
+        })
+        self.entries = {
+            'ok': {'code': 200, 'body': '{"id": "1"}'},
+            'server': {'code': 500, 'body': '{"error": {"code": 2}}'},
+            'auth': {'code': 400, 'body': '{"error": {"code": 190}}'},
+        }
+        self.batch_response = self.build_batch_response(self.batch_request, self.entries)
+
+    @staticmethod
+    def build_batch_response(batch_request, entries):
+        return FacebookBatchResponse(
+            batch_request=batch_request,
+            batch_response=FacebookResponse(
+                request=batch_request,
+                body=json.dumps([entries[record['name']] for record in batch_request]),
+                http_status_code=200,
+            ),
+        )
+
+    def index_of(self, name):
+        return [record['name'] for record in self.batch_request].index(name)
+
+    def test_failed_indexes(self):
+        self.assertEqual(
+            sorted(self.batch_response.failed_indexes()),
+            sorted([self.index_of('server'), self.index_of('auth')]),
+        )
+        self.assertEqual(
+            self.batch_response.failed_indexes(exception_classes=(FacebookServerException,)),
+            [self.index_of('server')],
+        )
+
+    def test_failed_batch_request(self):
+        batch_request = self.batch_response.failed_batch_request(exception_classes=(FacebookServerException,))
+
+        self.assertEqual([record['name'] for record in batch_request], ['server'])
+        self.assertEqual(batch_request.access_token, self.batch_request.access_token)
+
+    def test_failed_batch_request_without_failures(self):
+        batch_request = FakeFacebookBatchRequest(requests={'ok': FacebookRequest(endpoint='1', method=METHOD_GET)})
+        batch_response = self.build_batch_response(batch_request, self.entries)
+
+        self.assertIsNone(batch_response.failed_batch_request())
+
+    def test_update(self):
+        batch_request = self.batch_response.failed_batch_request()
+        self.entries['server'] = {'code': 200, 'body': '{"id": "2"}'}
+
+        self.batch_response.update(self.build_batch_response(batch_request, self.entries))
+
+        self.assertEqual(
+            [record['name'] for record in self.batch_response],
+            [record['name'] for record in self.batch_request],
+        )
+        self.assertEqual(self.batch_response.failed_indexes(), [self.index_of('auth')])
+        self.assertEqual(self.batch_response.responses[self.index_of('server')]['response'].json_body, {'id': '2'})
+
 
 class TestFacebookResponseException(TestCase):
 
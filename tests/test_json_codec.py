@@ -0,0 +1,104 @@
+import json
+from unittest import TestCase, skipIf
+
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.exceptions import FacebookSDKException
+from facebook_sdk.json_codec import (
+    DEFAULT_CODEC,
+    JSONCodec,
+    OrjsonCodec,
+    UjsonCodec,
+    get_codec,
+    orjson,
+    ujson,
+)
+from facebook_sdk.request import FacebookRequest
+from facebook_sdk.response import FacebookBatchResponse
+from tests import FakeFacebookBatchRequest, FakeFacebookClient, FakeResponse
+
+
+class RecordingCodec(JSONCodec):
+    def __init__(self):
+        self.dumped = []
+        self.loaded = []
+
+    def dumps(self, value):
+        self.dumped.append(value)
+        return super(RecordingCodec, self).dumps(value)
+
+    def loads(self, value):
+        self.loaded.append(value)
+        return super(RecordingCodec, self).loads(value)
+
+
+class TestGetCodec(TestCase):
+    def test_default(self):
+        self.assertIs(get_codec(), DEFAULT_CODEC)
+        self.assertIsInstance(get_codec('json'), JSONCodec)
+
+    def test_instance(self):
+        codec = RecordingCodec()
+
+        self.assertIs(get_codec(codec), codec)
+
+    def test_auto(self):
+        expected_class = OrjsonCodec if orjson else UjsonCodec if ujson else JSONCodec
+
+        self.assertIsInstance(get_codec('auto'), expected_class)
+
+    def test_unknown(self):
+        with self.assertRaises(FacebookSDKException):
+            get_codec('yaml')
+
+
+class TestCodecs(TestCase):
+    value = {'data': [{'id': '1', 'message': u'caf\xe9'}], 'paging': {'next': 'https://graph.facebook.com/'}}
+
+    def assertRoundTrip(self, codec):
+        self.assertEqual(codec.loads(codec.dumps(self.value)), self.value)
+        self.assertEqual(codec.loads(json.dumps(self.value).encode('utf-8')), self.value)
+
+    def test_json(self):
+        self.assertRoundTrip(JSONCodec())
+
+    @skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson(self):
+        self.assertRoundTrip(OrjsonCodec())
+
+    @skipIf(ujson is None, 'ujson is not installed')
+    def test_ujson(self):
+        self.assertRoundTrip(UjsonCodec())
+
+    @skipIf(ujson is not None, 'ujson is installed')
+    def test_missing_backend(self):
+        with self.assertRaises(FacebookSDKException):
+            UjsonCodec()
+
+
+class TestClientCodec(TestCase):
+    def test_batch_request_and_responses(self):
+        codec = RecordingCodec()
+        client = FakeFacebookClient(
+            fake_response=FakeResponse(
+                status_code=200,
+                content='[{"code": 200, "body": "{\\"id\\": \\"1\\"}"}]',
+                headers={},
+            ),
+            json_codec=codec,
+        )
+        batch_request = FakeFacebookBatchRequest(requests=[
+            FacebookRequest(endpoint='me', method='GET'),
+        ])
+
+        response = client.send_batch_request(batch_request)
+
+        self.assertIsInstance(response, FacebookBatchResponse)
+        self.assertEqual(response.responses[0]['response'].json_body, {'id': '1'})
+        self.assertEqual(len(codec.dumped), 1)
+        self.assertEqual(codec.loaded, [
+            '[{"code": 200, "body": "{\\"id\\": \\"1\\"}"}]',
+            '{"id": "1"}',
+        ])
+
+    def test_client_codec_by_name(self):
+        self.assertIsInstance(FacebookClient(json_codec='json').json_codec, JSONCodec)
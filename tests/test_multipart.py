@@ -0,0 +1,87 @@
+import os
+from unittest import TestCase
+
+from urllib3.filepost import encode_multipart_formdata
+
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.facebook_file import FacebookFile
+from facebook_sdk.multipart import MultipartEncoder
+from facebook_sdk.request import FacebookRequest
+from tests import FakeResponse
+from tests.test_facebook_client import FakeSession
+
+
+class TestMultipartEncoder(TestCase):
+    def setUp(self):
+        super(TestMultipartEncoder, self).setUp()
+        self.file_path = '{base_path}/foo.txt'.format(
+            base_path=os.path.dirname(os.path.abspath(__file__)),
+        )
+        self.facebook_file = FacebookFile(path=self.file_path)
+        with open(self.file_path, mode='rb') as f:
+            self.content = f.read()
+
+    def test_body(self):
+        encoder = MultipartEncoder(
+            fields={'message': 'hello'},
+            files=[('source', ('foo.txt', self.facebook_file, 'text/plain'))],
+            boundary='boundary',
+            chunk_size=4,
+        )
+        expected_body, expected_content_type = encode_multipart_formdata(
+            [('message', 'hello'), ('source', ('foo.txt', self.content, 'text/plain'))],
+            boundary='boundary',
+        )
+
+        body = b''.join(encoder)
+
+        self.assertEqual(body, expected_body)
+        self.assertEqual(encoder.content_type, expected_content_type)
+        self.assertEqual(len(encoder), len(expected_body))
+        self.assertEqual(b''.join(encoder), body)
+
+    def test_body_with_list_fields(self):
+        encoder = MultipartEncoder(
+            fields={'tags': ['a', 'b'], 'ids': (1, None, 2)},
+            boundary='boundary',
+        )
+        expected_body, _ = encode_multipart_formdata(
+            [('tags', 'a'), ('tags', 'b'), ('ids', '1'), ('ids', '2')],
+            boundary='boundary',
+        )
+
+        self.assertEqual(b''.join(encoder), expected_body)
+        self.assertEqual(len(encoder), len(expected_body))
+
+    def test_body_from_mapped_file(self):
+        mapped_file = FacebookFile(path=self.file_path, use_mmap=True)
+        encoder = MultipartEncoder(
+            files=[('source', ('foo.txt', mapped_file, 'text/plain'))],
+            boundary='boundary',
+            chunk_size=8,
+        )
+        expected_body, _ = encode_multipart_formdata(
+            [('source', ('foo.txt', self.content, 'text/plain'))],
+            boundary='boundary',
+        )
+
+        self.assertEqual(b''.join(encoder), expected_body)
+
+    def test_client_streams_files(self):
+        session = FakeSession(response=FakeResponse(status_code=200, content='{"id": "123"}', headers={}))
+        client = FacebookClient(session=session)
+        request = FacebookRequest(
+            endpoint='me/photos',
+            method='POST',
+            access_token='fake_token',
+            params={'message': 'hello', 'source': self.facebook_file},
+        )
+
+        client.send_request(request)
+
+        kwargs = session.calls[0]
+        self.assertIsNone(kwargs['files'])
+        self.assertIsInstance(kwargs['data'], MultipartEncoder)
+        self.assertEqual(kwargs['headers']['Content-Type'], kwargs['data'].content_type)
+        self.assertNotIn('Content-Type', request.headers)
+        self.assertIn(self.content, b''.join(kwargs['data']))
@@ -0,0 +1,190 @@
+import json
+from unittest import TestCase
+
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.exceptions import (
+    FacebookAuthenticationException,
+    FacebookResponseException,
+    FacebookSDKException,
+    FacebookThrottleException,
+)
+from facebook_sdk.facebook import Facebook
+from facebook_sdk.query import (
+    Field,
+    FieldSet,
+    GraphQuery,
+    with_fields,
+)
+from facebook_sdk.response import FacebookResponse
+from tests import FakeFacebookClient, FakeResponse
+
+
+class FakeObjectsClient(FacebookClient):
+    """ Answer the entries of the batches looking up the known objects, by ids or one by one."""
+
+    def __init__(self, objects, chunk_error=None):
+        super(FakeObjectsClient, self).__init__()
+        self.objects = objects
+        self.chunk_error = chunk_error
+        self.batches = []
+
+    def send_request(self, request):
+        entries = [record['request'] for record in request.requests]
+        self.batches.append(entries)
+
+        return FacebookResponse(
+            request=request,
+            body=json.dumps([self.build_entry(entry) for entry in entries]),
+            http_status_code=200,
+        )
+
+    def build_entry(self, request):
+        if 'ids' in request.params:
+            ids = request.params['ids'].split(',')
+        else:
+            ids = [request.endpoint.lstrip('/')]
+
+        if self.chunk_error is not None and 'ids' in request.params:
+            return {'code': 400, 'body': json.dumps({'error': self.chunk_error})}
+        if not all(object_id in self.objects for object_id in ids):
+            return {'code': 404, 'body': json.dumps({'error': {'code': 803, 'message': 'Unknown object'}})}
+        if 'ids' in request.params:
+            return {'code': 200, 'body': json.dumps({object_id: self.objects[object_id] for object_id in ids})}
+
+        return {'code': 200, 'body': json.dumps(self.objects[ids[0]])}
+
+
+class TestFieldSet(TestCase):
+    def test_render_nested_fields(self):
+        fields = FieldSet(['id', Field('posts', fields=['message', Field('likes', summary='true')], limit=5)])
+
+        self.assertEqual(fields.render(), 'id,posts{message,likes.summary(true)}.limit(5)')
+
+    def test_parse(self):
+        text = 'id,posts{message,comments{from}.limit(2)}.limit(5).order(reverse_chronological)'
+
+        self.assertEqual(FieldSet.parse(text).render(), text)
+        self.assertEqual(FieldSet.parse(' id , name ').render(), 'id,name')
+        self.assertEqual(len(FieldSet.parse('')), 0)
+
+    def test_parse_invalid(self):
+        for text in ('id,', 'posts{message', 'posts.limit', 'id}name'):
+            with self.assertRaises(FacebookSDKException):
+                FieldSet.parse(text)
+
+    def test_merge(self):
+        fields = FieldSet('id,posts{message}.limit(5)').add('name', Field('posts', fields='created_time'))
+
+        self.assertEqual(fields.render(), 'id,posts{message,created_time}.limit(5),name')
+        self.assertEqual(FieldSet('id,name'), FieldSet('name') | 'id')
+
+    def test_merge_conflicting_modifiers(self):
+        with self.assertRaises(FacebookSDKException):
+            FieldSet('posts.limit(5)').add('posts.limit(10)')
+
+    def test_with_fields(self):
+        self.assertEqual(with_fields({'fields': 'id', 'foo': 'bar'}, ['name']), {'fields': 'id,name', 'foo': 'bar'})
+        self.assertEqual(with_fields(None, None), None)
+
+
+class TestGraphQuery(TestCase):
+    def test_groups(self):
+        query = GraphQuery()
+        query.add('1', 'id,name').add('2', 'name').add('2', ['id']).add('3', 'picture')
+        for object_id in range(4, 60):
+            query.add(object_id, 'id,name')
+
+        groups = query.groups()
+
+        self.assertEqual(
+            [(len(ids), fields) for ids, fields in groups],
+            [(50, 'id,name'), (8, 'id,name'), (1, 'picture')],
+        )
+        self.assertEqual(groups[0][0][:2], ['1', '2'])
+
+    def test_requests(self):
+        request, = GraphQuery().add('1', 'id').add('2', 'id').requests(access_token='fake_token')
+
+        self.assertEqual(request.url, '/v2.12/')
+        self.assertEqual(request.params, {'ids': '1,2', 'fields': 'id', 'access_token': 'fake_token'})
+
+
+class TestFacebookQuery(TestCase):
+    def setUp(self):
+        super(TestFacebookQuery, self).setUp()
+        self.facebook = Facebook(app_id='123', app_secret='foo_secret', default_access_token='fake_token')
+
+    def test_get_with_fields(self):
+        self.facebook.client = FakeFacebookClient(fake_response=FakeResponse(status_code=200, content='{}', headers={}))
+
+        self.facebook.get('/me', params={'fields': 'id'}, fields=Field('friends', limit=10))
+
+        self.assertEqual(self.facebook.client.send_kwargs['params']['fields'], 'id,friends.limit(10)')
+
+    def test_query(self):
+        body = {'1': {'id': '1', 'name': 'foo'}, '2': {'id': '2', 'name': 'bar'}}
+        self.facebook.client = FakeFacebookClient(fake_response=FakeResponse(
+            status_code=200,
+            content=json.dumps(body),
+            headers={},
+        ))
+
+        objects = self.facebook.query(GraphQuery().add('1', 'id').add('2', 'name,id').add('1', 'name'))
+
+        self.assertEqual(objects, body)
+        self.assertEqual(self.facebook.client.send_kwargs['params']['ids'], '1,2')
+        self.assertEqual(self.facebook.client.send_kwargs['params']['fields'], 'id,name')
+
+    def test_get_many(self):
+        objects = {str(object_id): {'id': str(object_id)} for object_id in range(2520)}
+        self.facebook.client = FakeObjectsClient(objects)
+
+        results = self.facebook.get_many(ids=range(2520), fields='id')
+
+        self.assertEqual(results, objects)
+        self.assertEqual(sorted(len(batch) for batch in self.facebook.client.batches), [1, 50])
+        entries = [entry for batch in self.facebook.client.batches for entry in batch]
+        self.assertEqual(sorted(len(entry.params['ids'].split(',')) for entry in entries), [20] + [50] * 50)
+        self.assertEqual(entries[0].params['fields'], 'id')
+
+    def test_get_many_unknown_id(self):
+        objects = {str(object_id): {'id': str(object_id)} for object_id in range(60)}
+        self.facebook.client = FakeObjectsClient(objects)
+
+        results = self.facebook.get_many(ids=list(range(60)) + ['foo'])
+
+        self.assertEqual(len(self.facebook.client.batches), 2)
+        self.assertEqual(len(self.facebook.client.batches[1]), 11)
+        self.assertEqual(results['0'], {'id': '0'})
+        self.assertEqual(results['59'], {'id': '59'})
+        self.assertIsInstance(results['foo'], FacebookResponseException)
+
+    def test_get_many_unloadable_id(self):
+        objects = {str(object_id): {'id': str(object_id)} for object_id in range(3)}
+        self.facebook.client = FakeObjectsClient(objects, chunk_error={'code': 100, 'error_subcode': 33})
+
+        results = self.facebook.get_many(ids=range(3))
+
+        self.assertEqual(len(self.facebook.client.batches), 2)
+        self.assertEqual(results, objects)
+
+    def test_get_many_chunk_errors_are_not_looked_up_by_id(self):
+        for code, exception_class in (
+            (190, FacebookAuthenticationException),
+            (4, FacebookThrottleException),
+            # An unknown field.
+            (100, FacebookResponseException),
+        ):
+            self.facebook.client = FakeObjectsClient({'1': {'id': '1'}, '2': {'id': '2'}}, chunk_error={'code': code})
+
+            results = self.facebook.get_many(ids=['1', '2'])
+
+            self.assertEqual(len(self.facebook.client.batches), 1)
+            self.assertIsInstance(results['1'], exception_class)
+            self.assertIs(results['1'], results['2'])
+
+    def test_get_many_without_ids(self):
+        self.facebook.client = FakeObjectsClient({})
+
+        self.assertEqual(self.facebook.get_many(ids=[]), {})
+        self.assertEqual(self.facebook.client.batches, [])
@@ -0,0 +1,237 @@
+import json
+from unittest import TestCase
+
+import requests
+from six.moves.urllib.parse import parse_qs
+
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.exceptions import (
+    FacebookAuthenticationException,
+    FacebookResponseException,
+    FacebookServerException,
+    FacebookThrottleException,
+)
+from facebook_sdk.request import FacebookBatchRequest, FacebookRequest
+from facebook_sdk.response import FacebookResponse
+from facebook_sdk.retry import (
+    RetryBudget,
+    RetryPolicy,
+    get_retry_after,
+)
+from tests import FakeFacebookRequest, FakeResponse
+
+
+def build_exception(code, headers=None):
+    return FacebookResponse(
+        request=FakeFacebookRequest(),
+        body=json.dumps({'error': {'code': code}}),
+        headers=headers,
+        http_status_code=500,
+    ).exception
+
+
+class SequenceFacebookClient(FacebookClient):
+    """ Answer each request with the next of the given responses, raising it if it is an exception."""
+
+    def __init__(self, responses, **kwargs):
+        super(SequenceFacebookClient, self).__init__(**kwargs)
+        self.responses = list(responses)
+        self.sent = []
+
+    def send(self, **kwargs):
+        self.sent.append(kwargs)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class TestRetryPolicy(TestCase):
+    def setUp(self):
+        super(TestRetryPolicy, self).setUp()
+        self.sleeps = []
+        self.policy = RetryPolicy(max_attempts=3, backoff_factor=1, jitter=False, sleep=self.sleeps.append)
+
+    def test_should_retry(self):
+        self.assertTrue(self.policy.should_retry(build_exception(code=1), attempt=1))
+        self.assertTrue(self.policy.should_retry(build_exception(code=4), attempt=2))
+        self.assertFalse(self.policy.should_retry(build_exception(code=4), attempt=3))
+        self.assertFalse(self.policy.should_retry(build_exception(code=190), attempt=1))
+        self.assertTrue(self.policy.should_retry(requests.exceptions.ReadTimeout(), attempt=1))
+
+    def test_should_retry_writes(self):
+        post = FacebookRequest(endpoint='me/feed', method='POST', access_token='fake_token')
+        reads = FacebookBatchRequest(access_token='fake_token', requests=[FacebookRequest(endpoint='1', method='GET')])
+        writes = FacebookBatchRequest(access_token='fake_token', requests=[post])
+
+        self.assertFalse(self.policy.should_retry(build_exception(code=1), 1, post))
+        self.assertFalse(self.policy.should_retry(requests.exceptions.ReadTimeout(), 1, writes))
+        self.assertTrue(self.policy.should_retry(build_exception(code=4), 1, post))
+        self.assertTrue(self.policy.should_retry(requests.exceptions.ConnectTimeout(), 1, post))
+        self.assertTrue(self.policy.should_retry(build_exception(code=1), 1, reads))
+        self.assertTrue(RetryPolicy(retry_writes=True).should_retry(build_exception(code=1), 1, post))
+
+    def test_most_specific_rule_wins(self):
+        policy = RetryPolicy(retry_on={
+            FacebookResponseException: 2,
+            FacebookThrottleException: 5,
+        })
+
+        self.assertEqual(policy.max_attempts_for(build_exception(code=4)), 5)
+        self.assertEqual(policy.max_attempts_for(build_exception(code=1)), 2)
+        self.assertEqual(policy.max_attempts_for(ValueError()), 1)
+
+    def test_backoff(self):
+        self.assertEqual([self.policy.backoff(attempt) for attempt in (1, 2, 3)], [1, 2, 4])
+        self.assertEqual(RetryPolicy(backoff_factor=1, max_backoff=3, jitter=False).backoff(attempt=4), 3)
+
+    def test_backoff_with_jitter(self):
+        policy = RetryPolicy(backoff_factor=1)
+
+        for _ in range(20):
+            self.assertTrue(0 <= policy.backoff(attempt=3) <= 4)
+
+    def test_retry_after_hints(self):
+        self.assertEqual(get_retry_after(build_exception(code=4, headers={'Retry-After': '7'})), 7)
+        self.assertEqual(get_retry_after(build_exception(code=4, headers={
+            'X-Business-Use-Case-Usage': json.dumps({'1': [{'estimated_time_to_regain_access': 1}]}),
+        })), 60)
+        self.assertIsNone(get_retry_after(build_exception(code=4)))
+        self.assertIsNone(get_retry_after(build_exception(code=4, headers={
+            'X-Business-Use-Case-Usage': json.dumps({'1': 'pages', '2': [None]}),
+        })))
+
+        self.assertEqual(self.policy.backoff(1, build_exception(code=4, headers={'Retry-After': '7'})), 7)
+        self.assertFalse(self.policy.should_retry(build_exception(code=4, headers={'Retry-After': '120'}), 1))
+
+    def test_budget(self):
+        budget = RetryBudget(ratio=0.5, reserve=2)
+        policy = RetryPolicy(budget=budget)
+
+        self.assertTrue(policy.should_retry(build_exception(code=1), attempt=1))
+        self.assertTrue(policy.should_retry(build_exception(code=1), attempt=1))
+        self.assertFalse(policy.should_retry(build_exception(code=1), attempt=1))
+
+        budget.record_request()
+        budget.record_request()
+        self.assertTrue(policy.should_retry(build_exception(code=1), attempt=1))
+
+    def test_execute(self):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise build_exception(code=2)
+            return 'ok'
+
+        self.assertEqual(self.policy.execute(flaky), 'ok')
+        self.assertEqual(self.sleeps, [1, 2])
+
+    def test_execute_gives_up(self):
+        def failing():
+            raise build_exception(code=2)
+
+        with self.assertRaises(FacebookServerException):
+            self.policy.execute(failing)
+        self.assertEqual(len(self.sleeps), 2)
+
+
+class TestClientRetries(TestCase):
+    def setUp(self):
+        super(TestClientRetries, self).setUp()
+        self.sleeps = []
+        self.policy = RetryPolicy(backoff_factor=1, jitter=False, sleep=self.sleeps.append)
+        self.request = FacebookRequest(endpoint='me', method='GET', access_token='fake_token')
+
+    def test_send_request_retries(self):
+        client = SequenceFacebookClient(responses=[
+            requests.exceptions.ConnectTimeout(),
+            FakeResponse(status_code=500, content='{"error": {"code": 2}}', headers={}),
+            FakeResponse(status_code=200, content='{"id": "me"}', headers={}),
+        ], retry_policy=self.policy)
+
+        response = client.send_request(self.request)
+
+        self.assertEqual(response.json_body, {'id': 'me'})
+        self.assertEqual(len(client.sent), 3)
+        self.assertEqual(self.sleeps, [1, 2])
+
+    def test_send_request_does_not_retry_writes(self):
+        client = SequenceFacebookClient(responses=[
+            FakeResponse(status_code=500, content='{"error": {"code": 2}}', headers={}),
+        ], retry_policy=self.policy)
+
+        with self.assertRaises(FacebookServerException):
+            client.send_request(FacebookRequest(endpoint='me/feed', method='POST', access_token='fake_token'))
+        self.assertEqual(len(client.sent), 1)
+
+    def test_send_request_does_not_retry_other_errors(self):
+        client = SequenceFacebookClient(responses=[
+            FakeResponse(status_code=400, content='{"error": {"code": 190}}', headers={}),
+        ], retry_policy=self.policy)
+
+        with self.assertRaises(FacebookAuthenticationException):
+            client.send_request(self.request)
+
+    def test_send_batch_request_retries_failed_entries(self):
+        client = SequenceFacebookClient(responses=[
+            FakeResponse(status_code=200, headers={}, content=json.dumps([
+                {'code': 200, 'body': '{"id": "1"}'},
+                {'code': 500, 'body': '{"error": {"code": 2}}'},
+                {'code': 400, 'body': '{"error": {"code": 190}}'},
+            ])),
+            FakeResponse(status_code=200, headers={}, content=json.dumps([
+                {'code': 200, 'body': '{"id": "2"}'},
+            ])),
+        ], retry_policy=self.policy)
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests={
+            'first': FacebookRequest(endpoint='1', method='GET'),
+            'second': FacebookRequest(endpoint='2', method='GET'),
+            'third': FacebookRequest(endpoint='3', method='GET'),
+        })
+
+        response = client.send_batch_request(batch_request)
+
+        resent = json.loads(parse_qs(client.sent[1]['data'])['batch'][0])
+        self.assertEqual([entry['name'] for entry in resent], [batch_request.requests[1]['name']])
+        self.assertEqual([record['name'] for record in response], [record['name'] for record in batch_request])
+        self.assertEqual(response.responses[1]['response'].json_body, {'id': '2'})
+        self.assertTrue(response.responses[2]['response'].is_error)
+        self.assertEqual(self.sleeps, [1])
+
+    def test_send_batch_request_retries_entries_not_run(self):
+        client = SequenceFacebookClient(responses=[
+            FakeResponse(status_code=200, headers={}, content=json.dumps([
+                {'code': 200, 'body': '{"id": "1"}'},
+                None,
+            ])),
+            FakeResponse(status_code=200, headers={}, content=json.dumps([
+                {'code': 200, 'body': '{"id": "2"}'},
+            ])),
+        ], retry_policy=self.policy)
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests=[
+            FacebookRequest(endpoint='1', method='GET'),
+            FacebookRequest(endpoint='2', method='GET'),
+        ])
+
+        response = client.send_batch_request(batch_request)
+
+        self.assertEqual(len(client.sent), 2)
+        self.assertEqual(response.failed_indexes(), [])
+        self.assertEqual(response.responses[1]['response'].json_body, {'id': '2'})
+
+    def test_send_batch_request_does_not_retry_failed_writes(self):
+        client = SequenceFacebookClient(responses=[
+            FakeResponse(status_code=200, headers={}, content=json.dumps([
+                {'code': 500, 'body': '{"error": {"code": 2}}'},
+            ])),
+        ], retry_policy=self.policy)
+        batch_request = FacebookBatchRequest(access_token='fake_token', requests=[
+            FacebookRequest(endpoint='me/feed', method='POST', params={'message': 'hello'}),
+        ])
+
+        response = client.send_batch_request(batch_request)
+
+        self.assertTrue(response.responses[0]['response'].is_error)
+        self.assertEqual(len(client.sent), 1)
@@ -0,0 +1,133 @@
+import json
+from unittest import TestCase
+
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.exceptions import (
+    FacebookResponseException,
+    FacebookSDKException,
+    FacebookServerException,
+)
+from facebook_sdk.facebook import Facebook
+from facebook_sdk.request import FacebookRequest
+from facebook_sdk.response import FacebookStreamResponse
+from facebook_sdk.retry import RetryPolicy
+from facebook_sdk.streaming import JSONStreamDecoder
+
+
+def split(content, size):
+    return [content[index:index + size] for index in range(0, len(content), size)]
+
+
+class FakeStreamedResponse(object):
+    def __init__(self, body, status_code=200, chunk_size=7):
+        self.content = json.dumps(body).encode('utf-8')
+        self.status_code = status_code
+        self.headers = {}
+        self.chunk_size = chunk_size
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        return iter(split(self.content, self.chunk_size))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeStreamSession(object):
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.responses.pop(0)
+
+
+class TestJSONStreamDecoder(TestCase):
+    def test_decode_items_and_members(self):
+        body = {
+            'data': [{'id': '1', 'message': u'caf\xe9 \u2603'}, {'id': '2', 'count': 12345}],
+            'paging': {'cursors': {'after': 'abc'}, 'next': 'https://graph.facebook.com/v2.12/me/feed'},
+        }
+        content = json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+        for size in (1, 3, 64):
+            decoder = JSONStreamDecoder(split(content, size))
+
+            self.assertEqual(list(decoder), body['data'])
+            self.assertEqual(decoder.members, {'paging': body['paging']})
+
+    def test_data_after_other_members(self):
+        decoder = JSONStreamDecoder(split(b'{"summary": {"total": 3},  "data" : [ 1 , 2,3 ] }', 4))
+
+        self.assertEqual(list(decoder), [1, 2, 3])
+        self.assertEqual(decoder.members, {'summary': {'total': 3}})
+
+    def test_empty(self):
+        self.assertEqual(list(JSONStreamDecoder([b'{"data": []}'])), [])
+        self.assertEqual(list(JSONStreamDecoder([b'{}'])), [])
+
+    def test_invalid(self):
+        with self.assertRaises(FacebookSDKException):
+            list(JSONStreamDecoder(split(b'{"data": [{"id": 1}, {"id"', 5)))
+
+
+class TestFacebookClientStreamedRequest(TestCase):
+    def test_send_streamed_request(self):
+        raw = FakeStreamedResponse({'data': [{'id': '1'}, {'id': '2'}], 'paging': {}})
+        session = FakeStreamSession([raw])
+        client = FacebookClient(session=session)
+
+        response = client.send_streamed_request(FacebookRequest(endpoint='me/feed', method='GET'))
+
+        self.assertIsInstance(response, FacebookStreamResponse)
+        self.assertTrue(session.calls[0]['stream'])
+        self.assertEqual(list(response.iter_data()), [{'id': '1'}, {'id': '2'}])
+        self.assertEqual(response.json_body, {'paging': {}})
+        self.assertTrue(raw.closed)
+        with self.assertRaises(FacebookSDKException):
+            list(response.iter_data())
+
+    def test_send_streamed_request_error(self):
+        raw = FakeStreamedResponse({'error': {'code': 100, 'message': 'Invalid'}}, status_code=400)
+        client = FacebookClient(session=FakeStreamSession([raw]))
+
+        with self.assertRaises(FacebookResponseException):
+            client.send_streamed_request(FacebookRequest(endpoint='me/feed', method='GET'))
+
+    def test_send_streamed_request_does_not_retry_writes(self):
+        raw = FakeStreamedResponse({'error': {'code': 2, 'message': 'Unavailable'}}, status_code=500)
+        session = FakeStreamSession([raw])
+        client = FacebookClient(session=session, retry_policy=RetryPolicy(backoff_factor=0, jitter=False))
+
+        with self.assertRaises(FacebookServerException):
+            client.send_streamed_request(FacebookRequest(endpoint='me/feed', method='POST'))
+        self.assertEqual(len(session.calls), 1)
+
+
+class TestFacebookStreamedPagination(TestCase):
+    def test_paginate_stream(self):
+        session = FakeStreamSession([
+            FakeStreamedResponse({
+                'data': [{'id': '1'}, {'id': '2'}],
+                'paging': {'next': 'https://graph.facebook.com/v2.12/me/feed?access_token=fake_token&after=2'},
+            }),
+            FakeStreamedResponse({'data': [{'id': '3'}], 'paging': {}}),
+        ])
+        facebook = Facebook(app_id='123', app_secret='foo_secret', default_access_token='fake_token')
+        facebook.client = FacebookClient(session=session)
+
+        items = list(facebook.paginate(endpoint='/me/feed', stream=True))
+
+        self.assertEqual([item['id'] for item in items], ['1', '2', '3'])
+        self.assertEqual(session.calls[1]['url'], 'https://graph.facebook.com/v2.12/me/feed?after=2')
+
+    def test_paginate_stream_error_without_json_body(self):
+        raw = FakeStreamedResponse({}, status_code=502)
+        raw.content = b'<html><body>Bad Gateway</body></html>'
+        facebook = Facebook(app_id='123', app_secret='foo_secret', default_access_token='fake_token')
+        facebook.client = FacebookClient(session=FakeStreamSession([raw]))
+
+        with self.assertRaises(FacebookSDKException) as context:
+            list(facebook.paginate(endpoint='/me/feed', stream=True))
+        self.assertIn('502', str(context.exception))
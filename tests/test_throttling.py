@@ -0,0 +1,178 @@
+import json
+from unittest import TestCase
+
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.facebook import FacebookApp
+from facebook_sdk.request import (
+    FacebookBatchRequest,
+    FacebookRequest,
+)
+from facebook_sdk.throttling import (
+    SCOPE_APP,
+    SCOPE_BUSINESS,
+    SCOPE_TOKEN,
+    RateLimiter,
+    get_header,
+)
+from tests import FakeResponse
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+class TestRateLimiter(TestCase):
+    def setUp(self):
+        super(TestRateLimiter, self).setUp()
+        self.clock = FakeClock()
+        self.rate_limiter = RateLimiter(threshold=50, max_interval=10, clock=self.clock, sleep=self.clock.sleep)
+        self.request = FacebookRequest(
+            app=FacebookApp('app_id', 'secret'),
+            endpoint='/me',
+            method='GET',
+            access_token='page_token',
+        )
+
+    def test_get_header(self):
+        self.assertEqual(get_header({'X-App-Usage': '{}'}, 'x-app-usage'), '{}')
+        self.assertIsNone(get_header('', 'x-app-usage'))
+
+    def test_update(self):
+        self.rate_limiter.update(self.request, {
+            'X-App-Usage': json.dumps({'call_count': 10, 'total_time': 60, 'total_cputime': 5}),
+            'X-Page-Usage': json.dumps({'call_count': 30, 'total_time': 5, 'total_cputime': 5}),
+            'X-Business-Use-Case-Usage': json.dumps({
+                '1234': [{'type': 'pages', 'call_count': 80, 'total_time': 1, 'total_cputime': 1}],
+            }),
+        })
+
+        self.assertEqual(self.rate_limiter.usage(SCOPE_APP, 'app_id'), 60)
+        self.assertEqual(self.rate_limiter.usage(SCOPE_TOKEN, 'page_token'), 30)
+        self.assertEqual(self.rate_limiter.usage(SCOPE_BUSINESS, '1234'), 80)
+
+    def test_update_with_malformed_headers(self):
+        self.rate_limiter.update(self.request, {
+            'X-App-Usage': json.dumps([1, 2]),
+            'X-Page-Usage': json.dumps({'call_count': 'high', 'total_time': '40', 'total_cputime': None}),
+            'X-Business-Use-Case-Usage': json.dumps({
+                '1234': {'type': 'pages', 'call_count': 80},
+                '5678': [None, 'pages', {'call_count': [90]}],
+                '9012': 'pages',
+            }),
+        })
+
+        self.assertEqual(self.rate_limiter.usage(SCOPE_APP, 'app_id'), 0)
+        self.assertEqual(self.rate_limiter.usage(SCOPE_TOKEN, 'page_token'), 40)
+        self.assertEqual(self.rate_limiter.usage(SCOPE_BUSINESS, '1234'), 80)
+        self.assertEqual(self.rate_limiter.usage(SCOPE_BUSINESS, '5678'), 0)
+        self.assertEqual(self.rate_limiter._businesses['page_token'], {'1234', '5678'})
+
+    def test_no_wait_under_threshold(self):
+        self.rate_limiter.update(self.request, {'X-App-Usage': json.dumps({'call_count': 40})})
+
+        self.assertEqual(self.rate_limiter.reserve(self.request), 0)
+        self.assertEqual(self.rate_limiter.reserve(self.request), 0)
+
+    def test_paces_requests_over_threshold(self):
+        self.rate_limiter.update(self.request, {'X-App-Usage': json.dumps({'call_count': 75})})
+
+        self.assertEqual(self.rate_limiter.reserve(self.request), 0)
+        self.assertEqual(self.rate_limiter.reserve(self.request), 5)
+        self.assertEqual(self.rate_limiter.reserve(self.request), 10)
+
+    def test_waits_to_regain_access(self):
+        self.rate_limiter.update(self.request, {
+            'X-Business-Use-Case-Usage': json.dumps({
+                '1234': [{'type': 'pages', 'call_count': 100, 'estimated_time_to_regain_access': 2}],
+            }),
+        })
+
+        self.rate_limiter.acquire(self.request)
+
+        self.assertEqual(self.clock.sleeps, [120])
+
+    def test_interval_with_full_threshold(self):
+        rate_limiter = RateLimiter(threshold=100, max_interval=10, clock=self.clock, sleep=self.clock.sleep)
+        rate_limiter.update(self.request, {'X-App-Usage': json.dumps({'call_count': 100})})
+
+        self.assertEqual(rate_limiter.reserve(self.request), 0)
+        self.assertEqual(rate_limiter.reserve(self.request), 10)
+
+    def test_expires_usage(self):
+        self.rate_limiter.update(self.request, {
+            'X-App-Usage': json.dumps({'call_count': 75}),
+            'X-Business-Use-Case-Usage': json.dumps({
+                '1234': [{'type': 'pages', 'call_count': 80}],
+            }),
+        })
+        self.rate_limiter.reserve(self.request)
+
+        self.clock.now += 3600
+        self.assertEqual(self.rate_limiter.reserve(self.request), 0)
+
+        self.assertEqual(self.rate_limiter.usage(SCOPE_APP, 'app_id'), 0)
+        self.assertEqual(self.rate_limiter.usage(SCOPE_BUSINESS, '1234'), 0)
+        self.assertEqual(self.rate_limiter._businesses, {})
+        self.assertEqual(len(self.rate_limiter._last_slot), 2)
+
+    def test_update_batch(self):
+        client = FakeBatchRateLimitedClient(rate_limiter=self.rate_limiter)
+        batch_request = FacebookBatchRequest(
+            app=FacebookApp('app_id', 'secret'),
+            requests=[self.request, FacebookRequest(endpoint='/me', method='GET', access_token='other_token')],
+            access_token='batch_token',
+        )
+
+        client.send_batch_request(batch_request)
+
+        self.assertEqual(self.rate_limiter.usage(SCOPE_TOKEN, 'page_token'), 90)
+        self.assertEqual(self.rate_limiter.usage(SCOPE_TOKEN, 'other_token'), 0)
+        self.assertEqual(self.rate_limiter.usage(SCOPE_BUSINESS, '1234'), 60)
+
+    def test_client_paces_requests(self):
+        client = FakeRateLimitedClient(rate_limiter=self.rate_limiter)
+
+        client.send_request(self.request)
+        client.send_request(self.request)
+        client.send_request(self.request)
+
+        self.assertEqual(self.rate_limiter.usage(SCOPE_APP, 'app_id'), 100)
+        self.assertEqual(self.clock.sleeps, [10, 20])
+
+
+class FakeRateLimitedClient(FacebookClient):
+    def send(self, **kwargs):
+        return FakeResponse(
+            status_code=200,
+            content='{"id": "me"}',
+            headers={'X-App-Usage': json.dumps({'call_count': 100})},
+        )
+
+
+class FakeBatchRateLimitedClient(FacebookClient):
+    def send(self, **kwargs):
+        return FakeResponse(
+            status_code=200,
+            content=json.dumps([
+                {
+                    'code': 200,
+                    'body': '{"id": "me"}',
+                    'headers': [
+                        {'name': 'X-Page-Usage', 'value': json.dumps({'call_count': 90})},
+                        {'name': 'X-Business-Use-Case-Usage', 'value': json.dumps({
+                            '1234': [{'type': 'pages', 'call_count': 60}],
+                        })},
+                    ],
+                },
+                {'code': 200, 'body': '{"id": "other"}'},
+            ]),
+            headers={},
+        )
@@ -0,0 +1,120 @@
+import datetime
+import threading
+from unittest import TestCase
+
+from facebook_sdk.authentication import AccessToken
+from facebook_sdk.exceptions import FacebookSDKException
+from facebook_sdk.tokens import (
+    MemoryTokenStore,
+    TokenManager,
+)
+
+
+NOW = datetime.datetime(2018, 1, 1)
+
+
+class FakeRefresher(object):
+    """ Exchange the tokens for new ones expiring in 60 days, blocking until released if asked to."""
+
+    def __init__(self, block=False, error=None):
+        self.calls = []
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self, access_token):
+        self.calls.append(str(access_token))
+        self.started.set()
+        self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return AccessToken(
+            access_token='{token}-refreshed'.format(token=access_token),
+            expires_at=NOW + datetime.timedelta(days=60),
+        )
+
+
+class TestTokenManager(TestCase):
+    def build_manager(self, refresher):
+        return TokenManager(refresher=refresher, clock=lambda: NOW)
+
+    def test_fresh_token_is_not_refreshed(self):
+        refresher = FakeRefresher()
+        manager = self.build_manager(refresher)
+        manager.add('page', AccessToken('foo', expires_at=NOW + datetime.timedelta(days=30)))
+        manager.add('app', '123|secret')
+
+        self.assertEqual(str(manager.get('page')), 'foo')
+        self.assertEqual(str(manager.get('app')), '123|secret')
+        self.assertEqual(refresher.calls, [])
+
+    def test_expiring_token_is_refreshed_and_stored(self):
+        store = MemoryTokenStore()
+        manager = TokenManager(refresher=FakeRefresher(), store=store, clock=lambda: NOW)
+        manager.add('page', AccessToken('foo', expires_at=NOW + datetime.timedelta(hours=2)))
+
+        self.assertEqual(str(manager.get('page')), 'foo-refreshed')
+        self.assertEqual(str(store.get('page')), 'foo-refreshed')
+
+    def test_failed_refresh_of_valid_token(self):
+        error = FacebookSDKException('Invalid token')
+        manager = self.build_manager(FakeRefresher(error=error))
+        manager.add('page', AccessToken('foo', expires_at=NOW + datetime.timedelta(hours=2)))
+        manager.add('user', AccessToken('bar', expires_at=NOW - datetime.timedelta(hours=2)))
+
+        self.assertEqual(str(manager.get('page')), 'foo')
+        self.assertIs(manager.failures['page'], error)
+        with self.assertRaises(FacebookSDKException):
+            manager.get('user')
+
+    def test_concurrent_refreshes_are_coalesced(self):
+        refresher = FakeRefresher(block=True)
+        manager = self.build_manager(refresher)
+        manager.add('page', AccessToken('foo', expires_at=NOW))
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(manager.refresh('page'))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        refresher.started.wait()
+        refresher.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(refresher.calls, ['foo'])
+        self.assertEqual([str(result) for result in results], ['foo-refreshed'] * 5)
+
+    def test_refresh_after_a_completed_refresh(self):
+        refresher = FakeRefresher()
+        manager = self.build_manager(refresher)
+        manager.add('page', AccessToken('foo', expires_at=NOW))
+
+        # The second caller read the expiring token before the first refresh completed.
+        self.assertTrue(manager.needs_refresh(manager.store.get('page')))
+        self.assertEqual(str(manager.get('page')), 'foo-refreshed')
+        self.assertEqual(str(manager.refresh('page', force=False)), 'foo-refreshed')
+        self.assertEqual(refresher.calls, ['foo'])
+
+        self.assertEqual(str(manager.refresh('page')), 'foo-refreshed-refreshed')
+
+    def test_refresh_expiring(self):
+        refresher = FakeRefresher()
+        manager = self.build_manager(refresher)
+        manager.add('soon', AccessToken('foo', expires_at=NOW + datetime.timedelta(hours=1)))
+        manager.add('later', AccessToken('bar', expires_at=NOW + datetime.timedelta(days=30)))
+
+        manager.start()
+        manager.close()
+
+        self.assertEqual(refresher.calls, ['foo'])
+        self.assertEqual(str(manager.store.get('later')), 'bar')
+
+    def test_unknown_token(self):
+        with self.assertRaises(FacebookSDKException):
+            self.build_manager(FakeRefresher()).get('foo')
+
+    def test_requires_a_refresher(self):
+        with self.assertRaises(FacebookSDKException):
+            TokenManager()
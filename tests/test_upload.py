@@ -0,0 +1,187 @@
+import json
+import os
+from unittest import TestCase
+
+import requests
+from six.moves.urllib.parse import parse_qsl
+
+from facebook_sdk.client import FacebookClient
+from facebook_sdk.exceptions import FacebookResumableUploadException
+from facebook_sdk.facebook import Facebook
+from facebook_sdk.facebook_file import FacebookFile
+from facebook_sdk.retry import RetryPolicy
+from facebook_sdk.upload import (
+    FacebookResumableUploader,
+    FacebookTransferChunk,
+)
+from tests import FakeResponse
+
+
+def graph_response(body, status_code=200):
+    return FakeResponse(status_code=status_code, content=json.dumps(body), headers={})
+
+
+def resumable_error(start_offset=None, end_offset=None):
+    error = {'code': 6000, 'error_subcode': 1363037, 'message': 'There was a problem uploading your video.'}
+    if start_offset is not None:
+        error['error_data'] = {'start_offset': start_offset, 'end_offset': end_offset}
+    return graph_response({'error': error}, status_code=500)
+
+
+def sent_params(kwargs):
+    data = kwargs['data']
+    return data if isinstance(data, dict) else dict(parse_qsl(data))
+
+
+class ScriptedFacebookClient(FacebookClient):
+    """ Answer the requests with the scripted responses, raising the scripted exceptions."""
+
+    def __init__(self, script, **kwargs):
+        super(ScriptedFacebookClient, self).__init__(**kwargs)
+        self.script = list(script)
+        self.sent = []
+
+    def send(self, **kwargs):
+        self.sent.append(kwargs)
+        result = self.script.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class TestFacebookResumableUploader(TestCase):
+    def setUp(self):
+        super(TestFacebookResumableUploader, self).setUp()
+        self.file_path = '{base_path}/foo.txt'.format(
+            base_path=os.path.dirname(os.path.abspath(__file__)),
+        )
+        self.file = FacebookFile(path=self.file_path)
+        with open(self.file_path, mode='rb') as f:
+            self.content = f.read()
+        self.sleeps = []
+
+    def build_uploader(self, script):
+        return FacebookResumableUploader(
+            app=None,
+            client=ScriptedFacebookClient(script),
+            access_token='fake_token',
+            retry_policy=RetryPolicy(backoff_factor=1, jitter=False, sleep=self.sleeps.append),
+        )
+
+    def transferred(self, uploader):
+        return [
+            (kwargs['data']['start_offset'], kwargs['files'][0][1][1].read())
+            for kwargs in uploader.client.sent
+            if sent_params(kwargs)['upload_phase'] == 'transfer'
+        ]
+
+    def test_upload(self):
+        uploader = self.build_uploader([
+            graph_response({'video_id': '42', 'upload_session_id': '7', 'start_offset': '0', 'end_offset': '20'}),
+            graph_response({'start_offset': '20', 'end_offset': '50'}),
+            graph_response({'start_offset': '50', 'end_offset': '50'}),
+            graph_response({'success': True}),
+        ])
+
+        result = uploader.upload('/me/videos', self.file, metadata={'title': 'foo'})
+
+        self.assertEqual(result, {'video_id': '42', 'success': True})
+        self.assertEqual(sent_params(uploader.client.sent[0]), {'upload_phase': 'start', 'file_size': '50'})
+        self.assertEqual(self.transferred(uploader), [(0, self.content[:20]), (20, self.content[20:])])
+        self.assertEqual(
+            sent_params(uploader.client.sent[-1]),
+            {'upload_phase': 'finish', 'upload_session_id': '7', 'title': 'foo'},
+        )
+
+    def test_upload_resumes_after_failures(self):
+        uploader = self.build_uploader([
+            graph_response({'video_id': '42', 'upload_session_id': '7', 'start_offset': '0', 'end_offset': '30'}),
+            requests.exceptions.ConnectionError(),
+            resumable_error(start_offset='10', end_offset='30'),
+            graph_response({'start_offset': '30', 'end_offset': '50'}),
+            graph_response({'start_offset': '50', 'end_offset': '50'}),
+            graph_response({'success': True}),
+        ])
+
+        result = uploader.upload('/me/videos', self.file)
+
+        self.assertEqual(result, {'video_id': '42', 'success': True})
+        self.assertEqual(
+            self.transferred(uploader),
+            [(0, self.content[:30]), (0, self.content[:30]), (10, self.content[10:30]), (30, self.content[30:])],
+        )
+        self.assertEqual(self.sleeps, [1, 0])
+
+    def test_upload_backs_off_after_network_failures(self):
+        uploader = self.build_uploader([
+            graph_response({'video_id': '42', 'upload_session_id': '7', 'start_offset': '0', 'end_offset': '50'}),
+            requests.exceptions.ConnectionError(),
+            requests.exceptions.ReadTimeout(),
+            graph_response({'start_offset': '50', 'end_offset': '50'}),
+            graph_response({'success': True}),
+        ])
+
+        uploader.upload('/me/videos', self.file)
+
+        self.assertEqual(self.sleeps, [1, 2])
+
+    def test_upload_gives_up_after_max_transfer_tries(self):
+        uploader = self.build_uploader([
+            graph_response({'video_id': '42', 'upload_session_id': '7', 'start_offset': '0', 'end_offset': '30'}),
+            graph_response({'start_offset': '30', 'end_offset': '50'}),
+            resumable_error(),
+            resumable_error(),
+        ])
+
+        with self.assertRaises(FacebookResumableUploadException):
+            uploader.upload('/me/videos', self.file, max_transfer_tries=1)
+
+        self.assertEqual(uploader.last_chunk.start_offset, 30)
+
+    def test_upload_resumed_from_last_chunk(self):
+        uploader = self.build_uploader([
+            graph_response({'start_offset': '50', 'end_offset': '50'}),
+            graph_response({'success': True}),
+        ])
+        chunk = FacebookTransferChunk(
+            file=self.file,
+            upload_session_id='7',
+            video_id='42',
+            start_offset=30,
+            end_offset=50,
+        )
+
+        result = uploader.upload('/me/videos', self.file, chunk=chunk)
+
+        self.assertEqual(result, {'video_id': '42', 'success': True})
+        self.assertEqual(self.transferred(uploader), [(30, self.content[30:])])
+
+    def test_transfer_returns_the_same_chunk_to_retry(self):
+        uploader = self.build_uploader([resumable_error()])
+        chunk = FacebookTransferChunk(
+            file=self.file,
+            upload_session_id='7',
+            video_id='42',
+            start_offset=0,
+            end_offset=50,
+        )
+
+        self.assertIs(uploader.transfer('/me/videos', chunk), chunk)
+
+
+class TestFacebookUploadVideo(TestCase):
+    def test_upload_video(self):
+        facebook = Facebook(app_id='123', app_secret='foo_secret', default_access_token='fake_token')
+        facebook.client = ScriptedFacebookClient([
+            graph_response({'video_id': '42', 'upload_session_id': '7', 'start_offset': '0', 'end_offset': '50'}),
+            graph_response({'start_offset': '50', 'end_offset': '50'}),
+            graph_response({'success': True}),
+        ])
+        file_path = '{base_path}/foo.txt'.format(
+            base_path=os.path.dirname(os.path.abspath(__file__)),
+        )
+
+        result = facebook.upload_video(target='me', path=file_path)
+
+        self.assertEqual(result, {'video_id': '42', 'success': True})
+        self.assertEqual(facebook.client.sent[0]['url'], 'https://graph.facebook.com/v2.12/me/videos')
@@ -2,7 +2,11 @@
 
 from unittest import TestCase
 
-from facebook_sdk.utils import smart_text
+from facebook_sdk.utils import (
+    remove_params_from_url,
+    smart_text,
+    split_endpoint_access_token,
+)
 
 
 class TestFacebookFile(TestCase):
@@ -15,3 +19,17 @@ class TestFacebookFile(TestCase):
         )
         for value, expected in test_scenarios:
             self.assertEqual(smart_text(value), expected)
+
+    def test_split_endpoint_access_token(self):
+        test_scenarios = (
+            ('/me/feed', ('/me/feed', None)),
+            ('/me?fields=id,name', ('/me?fields=id%2Cname', None)),
+            ('/me?fields=id&access_token=foo&appsecret_proof=bar', ('/me?fields=id', 'foo')),
+            ('/me?access_token=', ('/me', '')),
+        )
+        for endpoint, expected in test_scenarios:
+            self.assertEqual(split_endpoint_access_token(endpoint), expected)
+            self.assertEqual(
+                split_endpoint_access_token(endpoint)[0],
+                remove_params_from_url(endpoint, params_to_remove=['access_token', 'appsecret_proof']),
+            )